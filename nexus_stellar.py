@@ -24,127 +24,973 @@ from pathlib import Path
 import hashlib
 import time
 import json
-from typing import List, Dict, Any, Callable, Optional, Union
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
 import warnings
+import threading
+import weakref
+import logging
+import contextlib
+import functools
+import operator
+from collections import deque
+import itertools
+import asyncio
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 
 # ============================================================
 # SOURCES RUST
 # ============================================================
 
-# Version Rust SANS Rayon (pour fallback rustc)
-RUST_SOURCE_SIMPLE = """
+# Gabarits: le type réel `Real` est déclaré par _rust_source (f32 ou f64)
+# Fonctions communes aux deux versions (helpers + variance)
+RUST_SOURCE_COMMON = """
 use std::slice;
+use std::cmp::Ordering;
+use std::collections::{BinaryHeap, VecDeque};
+
+// Indice de l'attracteur le plus proche (positions triées, non vides): O(log K)
+#[inline]
+fn nearest_attractor(positions: &[Real], s: Real) -> usize {
+    let idx = positions.partition_point(|&p| p < s);
+    if idx == 0 {
+        0
+    } else if idx == positions.len() {
+        idx - 1
+    } else if s - positions[idx - 1] <= positions[idx] - s {
+        idx - 1
+    } else {
+        idx
+    }
+}
+
+// Force de l'attracteur le plus proche
+#[inline]
+fn attractor_force(positions: &[Real], strengths: &[Real], s: Real) -> Real {
+    if positions.is_empty() {
+        return 0.0;
+    }
+    let k = nearest_attractor(positions, s);
+    (positions[k] - s) * strengths[k]
+}
+
+unsafe fn slice_or_empty<'a, T>(ptr: *const T, len: usize) -> &'a [T] {
+    if len == 0 { &[] } else { slice::from_raw_parts(ptr, len) }
+}
+
+// Tableau optionnel: pointeur nul -> tranche vide (ex: graphe non pondéré)
+unsafe fn optional_slice<'a, T>(ptr: *const T, len: usize) -> &'a [T] {
+    if ptr.is_null() { &[] } else { slice_or_empty(ptr, len) }
+}
+
+// Force de consensus sur l'entité i: Σ w_ij·(s_j - s_i)·strength / degré
+// (w_ij = 1 sans poids; weights vide ou aligné sur neighbors)
+#[inline]
+fn neighbor_force(
+    states: &[Real],
+    neighbors: &[i32],
+    weights: &[Real],
+    a: usize,
+    b: usize,
+    n: usize,
+    stride: usize,
+    si: Real,
+    strength: Real
+) -> Real {
+    let mut force: Real = 0.0;
+    if weights.is_empty() {
+        for &j in &neighbors[a..b] {
+            let j = j as usize;
+            if j < n {
+                force += (states[j * stride] - si) * strength;
+            }
+        }
+    } else {
+        for k in a..b {
+            let j = neighbors[k] as usize;
+            if j < n {
+                force += weights[k] * (states[j * stride] - si) * strength;
+            }
+        }
+    }
+    if b > a {
+        force /= (b - a) as Real;
+    }
+    force
+}
+
+// Offsets CSR (n+1) à partir des comptes de voisins: O(N)
+fn csr_offsets(counts: &[i32]) -> Vec<i64> {
+    let mut offsets = Vec::with_capacity(counts.len() + 1);
+    let mut acc = 0i64;
+    offsets.push(0);
+    for &c in counts {
+        acc += c as i64;
+        offsets.push(acc);
+    }
+    offsets
+}
+
+// Un step synchrone (Jacobi) sur un bloc de n entités: forces calculées sur
+// les états du step précédent, puis appliquées. Indices de voisins locaux.
+fn step_block(
+    states: &mut [Real],
+    velocities: &mut [Real],
+    frozen: &[u8],
+    neighbors: &[i32],
+    weights: &[Real],
+    edge_offsets: &[i64],
+    n: usize,
+    stride: usize,
+    momentum: Real,
+    strength: Real,
+    att_pos: &[Real],
+    att_str: &[Real]
+) {
+    let mut forces = vec![0.0 as Real; n];
+    for i in 0..n {
+        if frozen[i] == 1 {
+            continue;
+        }
+        let a = edge_offsets[i] as usize;
+        let b = edge_offsets[i + 1] as usize;
+        let si = states[i * stride];
+        let force = neighbor_force(states, neighbors, weights, a, b, n, stride, si, strength);
+        forces[i] = force + attractor_force(att_pos, att_str, si);
+    }
+    for i in 0..n {
+        if frozen[i] == 0 {
+            let v = momentum * velocities[i * stride] + (1.0 - momentum) * forces[i];
+            velocities[i * stride] = v;
+            states[i * stride] += v;
+        }
+    }
+}
+
+// Nombre d'entités non gelées (mises à jour effectuées par un step)
+fn active_count(frozen: &[u8]) -> u64 {
+    frozen.iter().filter(|&&f| f == 0).count() as u64
+}
+
+// Résidu local (Gauss-Seidel): déplacement de s_i qui annule sa force, les
+// voisins étant fixés. La force est affine en s_i: F(s_i) / pente.
+fn local_residual(
+    states: &[Real],
+    neighbors: &[i32],
+    weights: &[Real],
+    offsets: &[i64],
+    i: usize,
+    n: usize,
+    stride: usize,
+    strength: Real,
+    att_pos: &[Real],
+    att_str: &[Real]
+) -> Real {
+    let a = offsets[i] as usize;
+    let b = offsets[i + 1] as usize;
+    let si = states[i * stride];
+    let force = neighbor_force(states, neighbors, weights, a, b, n, stride, si, strength)
+        + attractor_force(att_pos, att_str, si);
+    let mut slope: Real = 0.0;
+    if b > a {
+        let mut total: Real = 0.0;
+        for k in a..b {
+            if (neighbors[k] as usize) < n {
+                total += if weights.is_empty() { 1.0 } else { weights[k] };
+            }
+        }
+        slope += strength * total / (b - a) as Real;
+    }
+    if !att_pos.is_empty() {
+        slope += att_str[nearest_attractor(att_pos, si)];
+    }
+    if slope > 0.0 { force / slope } else { 0.0 }
+}
+
+// Entrée de la file de priorité: (résidu, entité), ordre total sur le résidu
+#[derive(PartialEq, PartialOrd)]
+struct Pending(Real, usize);
+
+impl Eq for Pending {}
+
+impl Ord for Pending {
+    fn cmp(&self, other: &Self) -> Ordering {
+        self.partial_cmp(other).unwrap_or(Ordering::Equal)
+    }
+}
 
+// Relaxation asynchrone pilotée par les résidus: une entité à la fois,
+// par résidu décroissant (mode 0, file de priorité) ou en liste de travail
+// FIFO des résidus > tol (mode 1). Après chaque mise à jour, seules les
+// entités qui dépendent de l'entité modifiée (CSR transposé) sont
+// réévaluées. Retourne le nombre de mises à jour; max_residual reçoit le
+// plus grand résidu restant.
 #[no_mangle]
-pub extern "C" fn nexus_step(
-    states: *mut f32,
-    velocities: *mut f32,
-    frozen: *mut u8,
+pub extern "C" fn nexus_relax(
+    states: *mut Real,
+    velocities: *mut Real,
+    frozen: *const u8,
     neighbors: *const i32,
     neighbor_counts: *const i32,
+    edge_weights: *const Real,
+    dependents: *const i32,
+    dependent_counts: *const i32,
     n_entities: usize,
-    momentum: f32,
-    force_strength: f32
-) {
-    let states = unsafe { slice::from_raw_parts_mut(states, n_entities) };
-    let velocities = unsafe { slice::from_raw_parts_mut(velocities, n_entities) };
-    let frozen = unsafe { slice::from_raw_parts_mut(frozen, n_entities) };
+    stride: usize,
+    force_strength: Real,
+    attractor_positions: *const Real,
+    attractor_strengths: *const Real,
+    n_attractors: usize,
+    tol: Real,
+    max_updates: u64,
+    mode: u8,
+    max_residual: *mut Real
+) -> u64 {
+    let n = n_entities;
+    let states = unsafe { slice::from_raw_parts_mut(states, n * stride) };
+    let velocities = unsafe { slice::from_raw_parts_mut(velocities, n * stride) };
+    let frozen = unsafe { slice_or_empty(frozen, n) };
+    let counts = unsafe { slice_or_empty(neighbor_counts, n) };
+    let dep_counts = unsafe { slice_or_empty(dependent_counts, n) };
+    let att_pos = unsafe { slice_or_empty(attractor_positions, n_attractors) };
+    let att_str = unsafe { slice_or_empty(attractor_strengths, n_attractors) };
     
-    let mut offset = 0;
-    for i in 0..n_entities {
-        if frozen[i] == 1 {
-            offset += unsafe { *neighbor_counts.add(i) as usize };
+    let offsets = csr_offsets(counts);
+    let dep_offsets = csr_offsets(dep_counts);
+    let neighbors = unsafe { slice_or_empty(neighbors, offsets[n] as usize) };
+    let weights = unsafe { optional_slice(edge_weights, offsets[n] as usize) };
+    let dependents = unsafe { slice_or_empty(dependents, dep_offsets[n] as usize) };
+    
+    let mut residual = vec![0.0 as Real; n];
+    let mut heap = BinaryHeap::new();
+    let mut queue = VecDeque::new();
+    let mut queued = vec![false; n];
+    
+    for i in 0..n {
+        if frozen[i] != 0 {
+            continue;
+        }
+        let r = local_residual(states, neighbors, weights, &offsets, i, n, stride,
+                               force_strength, att_pos, att_str).abs();
+        residual[i] = r;
+        if r > tol {
+            if mode == 0 { heap.push(Pending(r, i)); } else { queue.push_back(i); queued[i] = true; }
+        }
+    }
+    
+    let mut updates = 0u64;
+    while updates < max_updates {
+        let i = if mode == 0 {
+            match heap.pop() {
+                // Entrée périmée: le résidu a changé depuis l'insertion
+                Some(Pending(r, i)) => { if r != residual[i] { continue; } i }
+                None => break,
+            }
+        } else {
+            match queue.pop_front() {
+                Some(i) => { queued[i] = false; i }
+                None => break,
+            }
+        };
+        if residual[i] <= tol {
             continue;
         }
         
-        let n_neigh = unsafe { *neighbor_counts.add(i) as usize };
-        let neigh_slice = unsafe { slice::from_raw_parts(neighbors.add(offset), n_neigh) };
+        let delta = local_residual(states, neighbors, weights, &offsets, i, n, stride,
+                                   force_strength, att_pos, att_str);
+        states[i * stride] += delta;
+        velocities[i * stride] = 0.0;
+        // Résidu nul après la mise à jour, sauf changement d'attracteur le plus proche
+        residual[i] = if att_pos.is_empty() { 0.0 } else {
+            local_residual(states, neighbors, weights, &offsets, i, n, stride,
+                           force_strength, att_pos, att_str).abs()
+        };
+        updates += 1;
         
-        let mut force = 0.0f32;
-        for &j in neigh_slice {
-            let j = j as usize;
-            if j < n_entities {
-                force += (states[j] - states[i]) * force_strength;
+        let touched = std::iter::once(i).chain(
+            dependents[dep_offsets[i] as usize..dep_offsets[i + 1] as usize]
+                .iter().map(|&j| j as usize));
+        for j in touched {
+            if j >= n || frozen[j] != 0 {
+                continue;
+            }
+            if j != i {
+                residual[j] = local_residual(states, neighbors, weights, &offsets, j, n, stride,
+                                             force_strength, att_pos, att_str).abs();
+            }
+            let r = residual[j];
+            if r > tol {
+                if mode == 0 {
+                    heap.push(Pending(r, j));
+                } else if !queued[j] {
+                    queue.push_back(j);
+                    queued[j] = true;
+                }
             }
         }
-        
-        if n_neigh > 0 {
-            force /= n_neigh as f32;
+    }
+    
+    if !max_residual.is_null() {
+        unsafe { *max_residual = residual.iter().cloned().fold(0.0, Real::max); }
+    }
+    updates
+}
+
+// Gel (identique à _freeze_pass côté Python): |v0| < threshold pendant
+// freeze_steps steps consécutifs -> entité gelée, vitesse remise à zéro
+fn freeze_block(
+    velocities: &mut [Real],
+    frozen: &mut [u8],
+    stability: &mut [i32],
+    n: usize,
+    stride: usize,
+    threshold: Real,
+    freeze_steps: i32
+) {
+    for i in 0..n {
+        if frozen[i] != 0 {
+            continue;
+        }
+        if velocities[i * stride].abs() < threshold {
+            stability[i] += 1;
+            if stability[i] >= freeze_steps {
+                frozen[i] = 1;
+                for v in &mut velocities[i * stride..(i + 1) * stride] {
+                    *v = 0.0;
+                }
+            }
+        } else {
+            stability[i] = 0;
+        }
+    }
+}
+
+// Arguments du mode batch: S systèmes concaténés, bloc s = [so[s], so[s+1])
+struct Batch<'a> {
+    system_offsets: &'a [i64],
+    neighbors: &'a [i32],
+    weights: &'a [Real],
+    edge_offsets: &'a [i64],
+    momentums: &'a [Real],
+    strengths: &'a [Real],
+    att_offsets: &'a [i64],
+    att_pos: &'a [Real],
+    att_str: &'a [Real],
+    active: &'a [u8],
+    stride: usize,
+}
+
+impl<'a> Batch<'a> {
+    unsafe fn new(
+        system_offsets: *const i64, neighbors: *const i32, weights: *const Real,
+        edge_offsets: *const i64,
+        momentums: *const Real, strengths: *const Real, att_offsets: *const i64,
+        att_positions: *const Real, att_strengths: *const Real, active: *const u8,
+        n_systems: usize, stride: usize
+    ) -> Batch<'a> {
+        let system_offsets = slice::from_raw_parts(system_offsets, n_systems + 1);
+        let n_total = system_offsets[n_systems] as usize;
+        let edge_offsets = slice::from_raw_parts(edge_offsets, n_total + 1);
+        let att_offsets = slice::from_raw_parts(att_offsets, n_systems + 1);
+        Batch {
+            system_offsets,
+            neighbors: slice_or_empty(neighbors, edge_offsets[n_total] as usize),
+            weights: optional_slice(weights, edge_offsets[n_total] as usize),
+            edge_offsets,
+            momentums: slice::from_raw_parts(momentums, n_systems),
+            strengths: slice::from_raw_parts(strengths, n_systems),
+            att_offsets,
+            att_pos: slice_or_empty(att_positions, att_offsets[n_systems] as usize),
+            att_str: slice_or_empty(att_strengths, att_offsets[n_systems] as usize),
+            active: slice::from_raw_parts(active, n_systems),
+            stride,
+        }
+    }
+    
+    fn n_total(&self) -> usize {
+        self.system_offsets[self.system_offsets.len() - 1] as usize
+    }
+    
+    fn step_system(&self, s: usize, states: &mut [Real], velocities: &mut [Real], frozen: &[u8]) {
+        if self.active[s] == 0 {
+            return;
+        }
+        let a = self.system_offsets[s] as usize;
+        let b = self.system_offsets[s + 1] as usize;
+        let (ka, kb) = (self.att_offsets[s] as usize, self.att_offsets[s + 1] as usize);
+        step_block(
+            states, velocities, frozen, self.neighbors, self.weights, &self.edge_offsets[a..b + 1],
+            b - a, self.stride, self.momentums[s], self.strengths[s],
+            &self.att_pos[ka..kb], &self.att_str[ka..kb]
+        );
+    }
+}
+
+// ------------------------------------------------------------
+// Barnes-Hut (gravité, 1 à 3 dimensions): arbre 2^D, critère θ
+// ------------------------------------------------------------
+const BH_LEAF: usize = 8;
+const BH_MAX_DEPTH: usize = 40;
+const BH_MIN_DIST: f64 = 0.01;  // même borne que Force.gravity
+
+struct BhNode {
+    center: [f64; 3],
+    half: f64,
+    mass: f64,
+    com: [f64; 3],
+    first_child: usize,  // enfants contigus; n_children == 0 -> feuille
+    n_children: usize,
+    start: usize,
+    end: usize,
+}
+
+struct BhTree {
+    nodes: Vec<BhNode>,
+    order: Vec<usize>,
+    pos: Vec<[f64; 3]>,
+    mass: Vec<f64>,
+    dim: usize,
+}
+
+fn bh_tree(positions: &[Real], masses: &[Real], n: usize, dim: usize, stride: usize) -> BhTree {
+    let mut pos = vec![[0.0f64; 3]; n];
+    let mut lo = [f64::INFINITY; 3];
+    let mut hi = [f64::NEG_INFINITY; 3];
+    for i in 0..n {
+        for d in 0..dim {
+            let x = positions[i * stride + d] as f64;
+            pos[i][d] = x;
+            lo[d] = lo[d].min(x);
+            hi[d] = hi[d].max(x);
+        }
+    }
+    let mut center = [0.0f64; 3];
+    let mut half = 0.0f64;
+    for d in 0..dim {
+        if n > 0 {
+            center[d] = 0.5 * (lo[d] + hi[d]);
+            half = half.max(0.5 * (hi[d] - lo[d]));
+        }
+    }
+    let root = BhNode {
+        center, half: half * (1.0 + 1e-6) + 1e-12, mass: 0.0, com: [0.0; 3],
+        first_child: 0, n_children: 0, start: 0, end: n,
+    };
+    let mut tree = BhTree {
+        nodes: vec![root],
+        order: (0..n).collect(),
+        pos,
+        mass: masses.iter().map(|&m| m as f64).collect(),
+        dim,
+    };
+    bh_build(&mut tree, 0, 0);
+    tree
+}
+
+fn bh_octant(p: &[f64; 3], center: &[f64; 3], dim: usize) -> usize {
+    let mut o = 0;
+    for d in 0..dim {
+        if p[d] >= center[d] {
+            o |= 1 << d;
+        }
+    }
+    o
+}
+
+fn bh_build(tree: &mut BhTree, node: usize, depth: usize) {
+    let (start, end) = (tree.nodes[node].start, tree.nodes[node].end);
+    let mut m = 0.0f64;
+    let mut c = [0.0f64; 3];
+    for &i in &tree.order[start..end] {
+        m += tree.mass[i];
+        for d in 0..3 {
+            c[d] += tree.mass[i] * tree.pos[i][d];
+        }
+    }
+    if m != 0.0 {
+        for d in 0..3 {
+            c[d] /= m;
+        }
+    } else {
+        c = tree.nodes[node].center;
+    }
+    tree.nodes[node].mass = m;
+    tree.nodes[node].com = c;
+    if end - start <= BH_LEAF || depth >= BH_MAX_DEPTH {
+        return;
+    }
+    
+    // Répartition par octant (tri par comptage, stable)
+    let dim = tree.dim;
+    let k = 1usize << dim;
+    let center = tree.nodes[node].center;
+    let half = tree.nodes[node].half;
+    let octs: Vec<usize> = tree.order[start..end].iter()
+        .map(|&i| bh_octant(&tree.pos[i], &center, dim)).collect();
+    let mut offs = vec![0usize; k + 1];
+    for &o in &octs {
+        offs[o + 1] += 1;
+    }
+    for o in 0..k {
+        offs[o + 1] += offs[o];
+    }
+    let mut fill = offs.clone();
+    let mut sorted = vec![0usize; end - start];
+    for (t, &i) in tree.order[start..end].iter().enumerate() {
+        sorted[fill[octs[t]]] = i;
+        fill[octs[t]] += 1;
+    }
+    tree.order[start..end].copy_from_slice(&sorted);
+    
+    let first = tree.nodes.len();
+    for o in 0..k {
+        if offs[o + 1] == offs[o] {
+            continue;
+        }
+        let mut cc = center;
+        for d in 0..dim {
+            cc[d] += if (o >> d) & 1 == 1 { 0.5 * half } else { -0.5 * half };
+        }
+        tree.nodes.push(BhNode {
+            center: cc, half: 0.5 * half, mass: 0.0, com: [0.0; 3],
+            first_child: 0, n_children: 0, start: start + offs[o], end: start + offs[o + 1],
+        });
+    }
+    let n_children = tree.nodes.len() - first;
+    tree.nodes[node].first_child = first;
+    tree.nodes[node].n_children = n_children;
+    for child in first..first + n_children {
+        bh_build(tree, child, depth + 1);
+    }
+}
+
+fn bh_pair(acc: &mut [f64; 3], p: &[f64; 3], q: &[f64; 3], m: f64, g: f64, dim: usize) {
+    let mut diff = [0.0f64; 3];
+    let mut d2 = 0.0f64;
+    for d in 0..dim {
+        diff[d] = q[d] - p[d];
+        d2 += diff[d] * diff[d];
+    }
+    let dist = d2.sqrt().max(BH_MIN_DIST);
+    let s = g * m / (dist * dist * dist);
+    for d in 0..dim {
+        acc[d] += s * diff[d];
+    }
+}
+
+// Accélération de l'entité i; theta = 0 -> somme exacte sur toutes les paires
+fn bh_accel(tree: &BhTree, i: usize, g: f64, theta: f64, stack: &mut Vec<usize>) -> [f64; 3] {
+    let p = tree.pos[i];
+    let dim = tree.dim;
+    let mut acc = [0.0f64; 3];
+    stack.clear();
+    stack.push(0);
+    while let Some(id) = stack.pop() {
+        let node = &tree.nodes[id];
+        if node.n_children == 0 {
+            for &j in &tree.order[node.start..node.end] {
+                if j != i {
+                    bh_pair(&mut acc, &p, &tree.pos[j], tree.mass[j], g, dim);
+                }
+            }
+            continue;
+        }
+        let mut d2 = 0.0f64;
+        let mut inside = true;
+        for d in 0..dim {
+            let x = node.com[d] - p[d];
+            d2 += x * x;
+            if (p[d] - node.center[d]).abs() > node.half {
+                inside = false;
+            }
+        }
+        let size = 2.0 * node.half;
+        // Un nœud contenant l'entité n'est jamais approximé (pas d'auto-force)
+        if !inside && size * size < theta * theta * d2 {
+            bh_pair(&mut acc, &p, &node.com, node.mass, g, dim);
+        } else {
+            for c in node.first_child..node.first_child + node.n_children {
+                stack.push(c);
+            }
         }
-        
-        velocities[i] = momentum * velocities[i] + (1.0 - momentum) * force;
-        states[i] += velocities[i];
-        
-        offset += n_neigh;
     }
+    acc
 }
 
 #[no_mangle]
-pub extern "C" fn nexus_variance(states: *const f32, n: usize) -> f32 {
-    let states = unsafe { slice::from_raw_parts(states, n) };
-    let mean: f32 = states.iter().sum::<f32>() / n as f32;
-    states.iter().map(|s| (s - mean).powi(2)).sum::<f32>() / n as f32
+pub extern "C" fn nexus_variance(states: *const Real, n: usize, stride: usize) -> Real {
+    let states = unsafe { slice::from_raw_parts(states, n * stride) };
+    let mean: Real = (0..n).map(|i| states[i * stride]).sum::<Real>() / n as Real;
+    (0..n).map(|i| (states[i * stride] - mean).powi(2)).sum::<Real>() / n as Real
 }
-"""
 
-# Version Rust AVEC Rayon (pour Cargo)
-RUST_SOURCE_RAYON = """
-use std::slice;
-use rayon::prelude::*;
+// Contexte natif d'un System: arguments de nexus_run liés une fois aux
+// tampons persistants; chaque step est un appel avec ce seul pointeur
+#[repr(C)]
+pub struct NexusContext {
+    states: *mut Real,
+    velocities: *mut Real,
+    frozen: *mut u8,
+    stability: *mut i32,
+    neighbors: *const i32,
+    neighbor_counts: *const i32,
+    edge_weights: *const Real,
+    n_entities: usize,
+    stride: usize,
+    momentum: Real,
+    force_strength: Real,
+    attractor_positions: *const Real,
+    attractor_strengths: *const Real,
+    n_attractors: usize,
+    freeze_enabled: u8,
+    freeze_threshold: Real,
+    freeze_steps: i32,
+    steps: usize,
+}
+
+#[no_mangle]
+pub extern "C" fn nexus_run_context(ctx: *const NexusContext) -> u64 {
+    let c = unsafe { &*ctx };
+    nexus_run(c.states, c.velocities, c.frozen, c.stability, c.neighbors, c.neighbor_counts,
+              c.edge_weights, c.n_entities, c.stride, c.momentum, c.force_strength,
+              c.attractor_positions, c.attractor_strengths, c.n_attractors,
+              c.freeze_enabled, c.freeze_threshold, c.freeze_steps, c.steps)
+}
+"""
 
+# Version Rust SANS Rayon (pour fallback rustc)
+RUST_SOURCE_SIMPLE = RUST_SOURCE_COMMON + """
+// states/velocities: tableaux N×stride, seule la dimension 0 évolue
 #[no_mangle]
 pub extern "C" fn nexus_step(
-    states: *mut f32,
-    velocities: *mut f32,
+    states: *mut Real,
+    velocities: *mut Real,
     frozen: *mut u8,
     neighbors: *const i32,
     neighbor_counts: *const i32,
+    edge_weights: *const Real,
     n_entities: usize,
-    momentum: f32,
-    force_strength: f32
+    stride: usize,
+    momentum: Real,
+    force_strength: Real,
+    attractor_positions: *const Real,
+    attractor_strengths: *const Real,
+    n_attractors: usize
 ) {
-    let states = unsafe { slice::from_raw_parts_mut(states, n_entities) };
-    let velocities = unsafe { slice::from_raw_parts_mut(velocities, n_entities) };
+    let states = unsafe { slice::from_raw_parts_mut(states, n_entities * stride) };
+    let velocities = unsafe { slice::from_raw_parts_mut(velocities, n_entities * stride) };
+    let frozen = unsafe { slice::from_raw_parts(frozen, n_entities) };
+    let counts = unsafe { slice::from_raw_parts(neighbor_counts, n_entities) };
+    let att_pos = unsafe { slice_or_empty(attractor_positions, n_attractors) };
+    let att_str = unsafe { slice_or_empty(attractor_strengths, n_attractors) };
+    
+    let offsets = csr_offsets(counts);
+    let neighbors = unsafe { slice_or_empty(neighbors, offsets[n_entities] as usize) };
+    let weights = unsafe { optional_slice(edge_weights, offsets[n_entities] as usize) };
+    
+    step_block(states, velocities, frozen, neighbors, weights, &offsets, n_entities, stride,
+               momentum, force_strength, att_pos, att_str);
+}
+
+// Boucle complète (step + gel) sur `steps` steps, sans repasser par Python
+#[no_mangle]
+pub extern "C" fn nexus_run(
+    states: *mut Real,
+    velocities: *mut Real,
+    frozen: *mut u8,
+    stability: *mut i32,
+    neighbors: *const i32,
+    neighbor_counts: *const i32,
+    edge_weights: *const Real,
+    n_entities: usize,
+    stride: usize,
+    momentum: Real,
+    force_strength: Real,
+    attractor_positions: *const Real,
+    attractor_strengths: *const Real,
+    n_attractors: usize,
+    freeze_enabled: u8,
+    freeze_threshold: Real,
+    freeze_steps: i32,
+    steps: usize
+) -> u64 {
+    let states = unsafe { slice::from_raw_parts_mut(states, n_entities * stride) };
+    let velocities = unsafe { slice::from_raw_parts_mut(velocities, n_entities * stride) };
     let frozen = unsafe { slice::from_raw_parts_mut(frozen, n_entities) };
+    let stability = unsafe { slice::from_raw_parts_mut(stability, n_entities) };
+    let counts = unsafe { slice::from_raw_parts(neighbor_counts, n_entities) };
+    let att_pos = unsafe { slice_or_empty(attractor_positions, n_attractors) };
+    let att_str = unsafe { slice_or_empty(attractor_strengths, n_attractors) };
+    
+    let offsets = csr_offsets(counts);
+    let neighbors = unsafe { slice_or_empty(neighbors, offsets[n_entities] as usize) };
+    let weights = unsafe { optional_slice(edge_weights, offsets[n_entities] as usize) };
+    
+    let mut updates = 0u64;
+    for _ in 0..steps {
+        updates += active_count(frozen);
+        step_block(states, velocities, frozen, neighbors, weights, &offsets, n_entities, stride,
+                   momentum, force_strength, att_pos, att_str);
+        if freeze_enabled != 0 {
+            freeze_block(velocities, frozen, stability, n_entities, stride,
+                         freeze_threshold, freeze_steps);
+        }
+    }
+    updates
+}
+
+// Mode batch: S systèmes indépendants, traités l'un après l'autre
+#[no_mangle]
+pub extern "C" fn nexus_step_batch(
+    states: *mut Real,
+    velocities: *mut Real,
+    frozen: *const u8,
+    neighbors: *const i32,
+    edge_weights: *const Real,
+    edge_offsets: *const i64,
+    system_offsets: *const i64,
+    momentums: *const Real,
+    strengths: *const Real,
+    att_offsets: *const i64,
+    att_positions: *const Real,
+    att_strengths: *const Real,
+    active: *const u8,
+    n_systems: usize,
+    stride: usize
+) {
+    let batch = unsafe { Batch::new(system_offsets, neighbors, edge_weights, edge_offsets,
+                                    momentums, strengths, att_offsets, att_positions,
+                                    att_strengths, active, n_systems, stride) };
+    let n_total = batch.n_total();
+    let states = unsafe { slice::from_raw_parts_mut(states, n_total * stride) };
+    let velocities = unsafe { slice::from_raw_parts_mut(velocities, n_total * stride) };
+    let frozen = unsafe { slice::from_raw_parts(frozen, n_total) };
     
-    // Calcul parallèle avec Rayon
-    let forces: Vec<f32> = (0..n_entities).into_par_iter().map(|i| {
+    for s in 0..n_systems {
+        let a = batch.system_offsets[s] as usize;
+        let b = batch.system_offsets[s + 1] as usize;
+        batch.step_system(s, &mut states[a * stride..b * stride],
+                          &mut velocities[a * stride..b * stride], &frozen[a..b]);
+    }
+}
+
+// Champ de gravité Barnes-Hut: out = accélérations N×dim
+#[no_mangle]
+pub extern "C" fn nexus_gravity(
+    positions: *const Real,
+    masses: *const Real,
+    n: usize,
+    dim: usize,
+    stride: usize,
+    g: Real,
+    theta: Real,
+    out: *mut Real
+) {
+    let positions = unsafe { slice_or_empty(positions, n * stride) };
+    let masses = unsafe { slice_or_empty(masses, n) };
+    let out = unsafe { slice::from_raw_parts_mut(out, n * dim) };
+    let tree = bh_tree(positions, masses, n, dim, stride);
+    let mut stack = Vec::with_capacity(64);
+    for i in 0..n {
+        let acc = bh_accel(&tree, i, g as f64, theta as f64, &mut stack);
+        for d in 0..dim {
+            out[i * dim + d] = acc[d] as Real;
+        }
+    }
+}
+"""
+
+# Version Rust AVEC Rayon (pour Cargo)
+RUST_SOURCE_RAYON = RUST_SOURCE_COMMON + """
+use rayon::prelude::*;
+
+// Un step synchrone: forces calculées en parallèle (Rayon), puis appliquées
+fn par_step(
+    states: &mut [Real],
+    velocities: &mut [Real],
+    frozen: &[u8],
+    neighbors: &[i32],
+    weights: &[Real],
+    offsets: &[i64],
+    n_entities: usize,
+    stride: usize,
+    momentum: Real,
+    force_strength: Real,
+    att_pos: &[Real],
+    att_str: &[Real]
+) {
+    let states_ro: &[Real] = states;
+    let forces: Vec<Real> = (0..n_entities).into_par_iter().map(|i| {
         if frozen[i] == 1 {
             return 0.0;
         }
         
-        let offset: usize = (0..i).map(|j| unsafe { *neighbor_counts.add(j) as usize }).sum();
-        let n_neigh = unsafe { *neighbor_counts.add(i) as usize };
-        let neigh_slice = unsafe { slice::from_raw_parts(neighbors.add(offset), n_neigh) };
-        
-        let mut force = 0.0f32;
-        for &j in neigh_slice {
-            let j = j as usize;
-            if j < n_entities {
-                force += (states[j] - states[i]) * force_strength;
-            }
-        }
+        let a = offsets[i] as usize;
+        let b = offsets[i + 1] as usize;
         
-        if n_neigh > 0 {
-            force / n_neigh as f32
-        } else {
-            0.0
-        }
+        let si = states_ro[i * stride];
+        let force = neighbor_force(states_ro, neighbors, weights, a, b, n_entities, stride,
+                                   si, force_strength);
+        force + attractor_force(att_pos, att_str, si)
     }).collect();
     
     for i in 0..n_entities {
         if frozen[i] == 0 {
-            velocities[i] = momentum * velocities[i] + (1.0 - momentum) * forces[i];
-            states[i] += velocities[i];
+            let v = momentum * velocities[i * stride] + (1.0 - momentum) * forces[i];
+            velocities[i * stride] = v;
+            states[i * stride] += v;
         }
     }
 }
 
+// states/velocities: tableaux N×stride, seule la dimension 0 évolue
 #[no_mangle]
-pub extern "C" fn nexus_variance(states: *const f32, n: usize) -> f32 {
-    let states = unsafe { slice::from_raw_parts(states, n) };
-    let mean: f32 = states.iter().sum::<f32>() / n as f32;
-    states.iter().map(|s| (s - mean).powi(2)).sum::<f32>() / n as f32
+pub extern "C" fn nexus_step(
+    states: *mut Real,
+    velocities: *mut Real,
+    frozen: *mut u8,
+    neighbors: *const i32,
+    neighbor_counts: *const i32,
+    edge_weights: *const Real,
+    n_entities: usize,
+    stride: usize,
+    momentum: Real,
+    force_strength: Real,
+    attractor_positions: *const Real,
+    attractor_strengths: *const Real,
+    n_attractors: usize
+) {
+    let states = unsafe { slice::from_raw_parts_mut(states, n_entities * stride) };
+    let velocities = unsafe { slice::from_raw_parts_mut(velocities, n_entities * stride) };
+    let frozen = unsafe { slice::from_raw_parts(frozen, n_entities) };
+    let counts = unsafe { slice::from_raw_parts(neighbor_counts, n_entities) };
+    let att_pos = unsafe { slice_or_empty(attractor_positions, n_attractors) };
+    let att_str = unsafe { slice_or_empty(attractor_strengths, n_attractors) };
+    
+    // Offsets CSR (préfixe des comptes) calculés une fois: O(N)
+    let offsets = csr_offsets(counts);
+    let neighbors = unsafe { slice_or_empty(neighbors, offsets[n_entities] as usize) };
+    let weights = unsafe { optional_slice(edge_weights, offsets[n_entities] as usize) };
+    
+    par_step(states, velocities, frozen, neighbors, weights, &offsets, n_entities, stride,
+             momentum, force_strength, att_pos, att_str);
+}
+
+// Boucle complète (step + gel) sur `steps` steps, sans repasser par Python
+#[no_mangle]
+pub extern "C" fn nexus_run(
+    states: *mut Real,
+    velocities: *mut Real,
+    frozen: *mut u8,
+    stability: *mut i32,
+    neighbors: *const i32,
+    neighbor_counts: *const i32,
+    edge_weights: *const Real,
+    n_entities: usize,
+    stride: usize,
+    momentum: Real,
+    force_strength: Real,
+    attractor_positions: *const Real,
+    attractor_strengths: *const Real,
+    n_attractors: usize,
+    freeze_enabled: u8,
+    freeze_threshold: Real,
+    freeze_steps: i32,
+    steps: usize
+) -> u64 {
+    let states = unsafe { slice::from_raw_parts_mut(states, n_entities * stride) };
+    let velocities = unsafe { slice::from_raw_parts_mut(velocities, n_entities * stride) };
+    let frozen = unsafe { slice::from_raw_parts_mut(frozen, n_entities) };
+    let stability = unsafe { slice::from_raw_parts_mut(stability, n_entities) };
+    let counts = unsafe { slice::from_raw_parts(neighbor_counts, n_entities) };
+    let att_pos = unsafe { slice_or_empty(attractor_positions, n_attractors) };
+    let att_str = unsafe { slice_or_empty(attractor_strengths, n_attractors) };
+    
+    let offsets = csr_offsets(counts);
+    let neighbors = unsafe { slice_or_empty(neighbors, offsets[n_entities] as usize) };
+    let weights = unsafe { optional_slice(edge_weights, offsets[n_entities] as usize) };
+    
+    let mut updates = 0u64;
+    for _ in 0..steps {
+        updates += active_count(frozen);
+        par_step(states, velocities, frozen, neighbors, weights, &offsets, n_entities, stride,
+                 momentum, force_strength, att_pos, att_str);
+        if freeze_enabled != 0 {
+            freeze_block(velocities, frozen, stability, n_entities, stride,
+                         freeze_threshold, freeze_steps);
+        }
+    }
+    updates
+}
+
+// Mode batch: S systèmes indépendants, un système par tâche Rayon
+#[no_mangle]
+pub extern "C" fn nexus_step_batch(
+    states: *mut Real,
+    velocities: *mut Real,
+    frozen: *const u8,
+    neighbors: *const i32,
+    edge_weights: *const Real,
+    edge_offsets: *const i64,
+    system_offsets: *const i64,
+    momentums: *const Real,
+    strengths: *const Real,
+    att_offsets: *const i64,
+    att_positions: *const Real,
+    att_strengths: *const Real,
+    active: *const u8,
+    n_systems: usize,
+    stride: usize
+) {
+    let batch = unsafe { Batch::new(system_offsets, neighbors, edge_weights, edge_offsets,
+                                    momentums, strengths, att_offsets, att_positions,
+                                    att_strengths, active, n_systems, stride) };
+    let n_total = batch.n_total();
+    let mut states = unsafe { slice::from_raw_parts_mut(states, n_total * stride) };
+    let mut velocities = unsafe { slice::from_raw_parts_mut(velocities, n_total * stride) };
+    let frozen = unsafe { slice::from_raw_parts(frozen, n_total) };
+    
+    // Découpage en blocs disjoints (un par système)
+    let mut blocks = Vec::with_capacity(n_systems);
+    for s in 0..n_systems {
+        let a = batch.system_offsets[s] as usize;
+        let b = batch.system_offsets[s + 1] as usize;
+        let (st, st_rest) = std::mem::take(&mut states).split_at_mut((b - a) * stride);
+        let (ve, ve_rest) = std::mem::take(&mut velocities).split_at_mut((b - a) * stride);
+        states = st_rest;
+        velocities = ve_rest;
+        blocks.push((s, st, ve, &frozen[a..b]));
+    }
+    
+    blocks.into_par_iter().for_each(|(s, st, ve, fr)| {
+        batch.step_system(s, st, ve, fr);
+    });
+}
+
+// Champ de gravité Barnes-Hut: out = accélérations N×dim (une tâche par entité)
+#[no_mangle]
+pub extern "C" fn nexus_gravity(
+    positions: *const Real,
+    masses: *const Real,
+    n: usize,
+    dim: usize,
+    stride: usize,
+    g: Real,
+    theta: Real,
+    out: *mut Real
+) {
+    let positions = unsafe { slice_or_empty(positions, n * stride) };
+    let masses = unsafe { slice_or_empty(masses, n) };
+    let out = unsafe { slice::from_raw_parts_mut(out, n * dim) };
+    let tree = bh_tree(positions, masses, n, dim, stride);
+    let accs: Vec<[f64; 3]> = (0..n).into_par_iter().map(|i| {
+        let mut stack = Vec::with_capacity(64);
+        bh_accel(&tree, i, g as f64, theta as f64, &mut stack)
+    }).collect();
+    for i in 0..n {
+        for d in 0..dim {
+            out[i * dim + d] = accs[i][d] as Real;
+        }
+    }
 }
 """
 
@@ -152,6 +998,7 @@ pub extern "C" fn nexus_variance(states: *const f32, n: usize) -> f32 {
 # SOURCES C++
 # ============================================================
 
+# Gabarit: le type `real` est déclaré par _cpp_source (float ou double)
 CPP_SOURCE = """
 #include <cmath>
 #include <vector>
@@ -160,20 +1007,20 @@ CPP_SOURCE = """
 extern "C" {
 
 struct FusionNode {
-    float* state;
+    real* state;
     int dim;
-    float mass;
+    real mass;
     int id;
     bool absorbed;
 };
 
 void fusion_compress(
-    float* states,
+    real* states,
     int* ids,
-    float* masses,
+    real* masses,
     int* n_nodes,
     int dim,
-    float threshold
+    real threshold
 ) {
     std::vector<FusionNode> nodes;
     
@@ -200,15 +1047,15 @@ void fusion_compress(
             for (size_t j = i + 1; j < nodes.size(); j++) {
                 if (nodes[j].absorbed) continue;
                 
-                float dist_sq = 0.0f;
+                real dist_sq = 0.0f;
                 
                 for (int k = 0; k < dim; k++) {
-                    float diff = nodes[i].state[k] - nodes[j].state[k];
+                    real diff = nodes[i].state[k] - nodes[j].state[k];
                     dist_sq += diff * diff;
                 }
                 
                 if (std::sqrt(dist_sq) < threshold) {
-                    float total_mass = nodes[i].mass + nodes[j].mass;
+                    real total_mass = nodes[i].mass + nodes[j].mass;
                     
                     for (int k = 0; k < dim; k++) {
                         nodes[i].state[k] = (
@@ -243,6 +1090,20 @@ void fusion_compress(
     *n_nodes = write_idx;
 }
 
+// Contexte lié une fois aux tampons de travail du FusionEngine
+struct FusionContext {
+    real* states;
+    int* ids;
+    real* masses;
+    int n_nodes;
+    int dim;
+    real threshold;
+};
+
+void fusion_compress_context(FusionContext* ctx) {
+    fusion_compress(ctx->states, ctx->ids, ctx->masses, &ctx->n_nodes, ctx->dim, ctx->threshold);
+}
+
 }
 """
 
@@ -251,6 +1112,9 @@ void fusion_compress(
 # ============================================================
 
 class CompilerManager:
+    # Bibliothèques déjà chargées dans le processus: (lib_name, hash) -> CDLL
+    _loaded: Dict[tuple, ctypes.CDLL] = {}
+    
     def __init__(self):
         self.cache_dir = Path.home() / ".nexus_stellar_cache"
         self.cache_dir.mkdir(exist_ok=True)
@@ -271,7 +1135,22 @@ class CompilerManager:
         stored_hash = hash_file.read_text()
         return current_hash != stored_hash
     
-    def compile_rust(self, source: str, lib_name: str = "nexus_rust"):
+    def compile_rust(self, source: str, lib_name: str = "nexus_rust",
+                     rayon_source: str = None):
+        """
+        Compile `source` (rustc) ou `rayon_source` (Cargo + Rayon, par défaut
+        RUST_SOURCE_RAYON en f32); le cache est indexé par le hash de `source`.
+        """
+        key = (lib_name, self._hash_source(source))
+        if key in CompilerManager._loaded:
+            self.rust_lib = CompilerManager._loaded[key]
+            return self.rust_lib
+        
+        self.rust_lib = CompilerManager._loaded[key] = self._compile_rust(
+            source, lib_name, rayon_source or _rust_source(RUST_SOURCE_RAYON))
+        return self.rust_lib
+    
+    def _compile_rust(self, source: str, lib_name: str, rayon_source: str):
         if not self._needs_recompile(source, lib_name):
             print(f"♻️  Cache Rust ({lib_name})")
             self.rust_lib = ctypes.CDLL(str(self.cache_dir / f"{lib_name}.so"))
@@ -282,12 +1161,12 @@ class CompilerManager:
         # Tentative 1: Cargo avec Rayon
         try:
             rs_file = self.cache_dir / f"{lib_name}.rs"
-            rs_file.write_text(RUST_SOURCE_RAYON)
+            rs_file.write_text(rayon_source)
             
             cargo_toml = self.cache_dir / "Cargo.toml"
-            cargo_toml.write_text("""
+            cargo_toml.write_text(f"""
 [package]
-name = "nexus_rust"
+name = "{lib_name}"
 version = "0.1.0"
 edition = "2021"
 
@@ -296,7 +1175,7 @@ rayon = "1.8"
 
 [lib]
 crate-type = ["cdylib"]
-path = "nexus_rust.rs"
+path = "{lib_name}.rs"
 """)
             
             result = subprocess.run([
@@ -320,7 +1199,7 @@ path = "nexus_rust.rs"
             print("⚠️  Cargo indisponible, fallback rustc sans Rayon...")
             
             rs_file = self.cache_dir / f"{lib_name}.rs"
-            rs_file.write_text(RUST_SOURCE_SIMPLE)
+            rs_file.write_text(source)
             
             result = subprocess.run([
                 "rustc", "--crate-type=cdylib", "-C", "opt-level=3",
@@ -339,6 +1218,15 @@ path = "nexus_rust.rs"
         return self.rust_lib
     
     def compile_cpp(self, source: str, lib_name: str = "nexus_cpp"):
+        key = (lib_name, self._hash_source(source))
+        if key in CompilerManager._loaded:
+            self.cpp_lib = CompilerManager._loaded[key]
+            return self.cpp_lib
+        
+        self.cpp_lib = CompilerManager._loaded[key] = self._compile_cpp(source, lib_name)
+        return self.cpp_lib
+    
+    def _compile_cpp(self, source: str, lib_name: str):
         if not self._needs_recompile(source, lib_name):
             print(f"♻️  Cache C++ ({lib_name})")
             self.cpp_lib = ctypes.CDLL(str(self.cache_dir / f"{lib_name}.so"))
@@ -364,12 +1252,158 @@ path = "nexus_rust.rs"
         print("✅ C++ OK")
         return self.cpp_lib
 
-# ============================================================
-# ENTITY
-# ============================================================
+# Précision: dtype de stockage -> dtype de calcul (float16 calculé en float32)
+_COMPUTE_DTYPES = {
+    np.dtype(np.float32): np.dtype(np.float32),
+    np.dtype(np.float64): np.dtype(np.float64),
+    np.dtype(np.float16): np.dtype(np.float32),
+}
 
-class Entity:
-    _id_counter = 0
+def _compute_dtype(dtype) -> np.dtype:
+    try:
+        return _COMPUTE_DTYPES[np.dtype(dtype)]
+    except (KeyError, TypeError):
+        raise ValueError(f"dtype non supporté: {dtype} (float32, float64 ou float16)") from None
+
+# Type réel des gabarits natifs, par dtype de calcul
+_NATIVE_REALS = {
+    np.dtype(np.float32): ('f32', 'float'),
+    np.dtype(np.float64): ('f64', 'double'),
+}
+
+def _rust_source(template: str, dtype=np.float32) -> str:
+    """Source Rust concrète: gabarit précédé de `type Real = f32|f64;`."""
+    return f"type Real = {_NATIVE_REALS[_compute_dtype(dtype)][0]};\n" + template
+
+def _cpp_source(template: str, dtype=np.float32) -> str:
+    """Source C++ concrète: gabarit précédé de `typedef float|double real;`."""
+    return f"typedef {_NATIVE_REALS[_compute_dtype(dtype)][1]} real;\n" + template
+
+def _float_ptr(arr: Optional[np.ndarray]):
+    """Pointeur float*/double* selon le dtype (None -> pointeur nul, ex: graphe non pondéré)."""
+    if arr is None:
+        return None
+    real = ctypes.c_double if arr.dtype == np.float64 else ctypes.c_float
+    return arr.ctypes.data_as(ctypes.POINTER(real))
+
+# Une classe par (contexte, précision): les bibliothèques sont partagées par
+# processus, leurs argtypes doivent désigner la même classe
+_CONTEXT_STRUCTS = {}
+
+def _fusion_context_struct(c_real) -> type:
+    """Miroir ctypes de FusionContext (C++)."""
+    key = ('FusionContext', c_real)
+    if key not in _CONTEXT_STRUCTS:
+        _CONTEXT_STRUCTS[key] = type('FusionContext', (ctypes.Structure,), {'_fields_': [
+            ('states', ctypes.POINTER(c_real)), ('ids', ctypes.POINTER(ctypes.c_int32)),
+            ('masses', ctypes.POINTER(c_real)), ('n_nodes', ctypes.c_int),
+            ('dim', ctypes.c_int), ('threshold', c_real),
+        ]})
+    return _CONTEXT_STRUCTS[key]
+
+def _context_struct(c_real) -> type:
+    """Miroir ctypes de NexusContext (champs réels en c_float ou c_double)."""
+    key = ('NexusContext', c_real)
+    if key not in _CONTEXT_STRUCTS:
+        real_p = ctypes.POINTER(c_real)
+        _CONTEXT_STRUCTS[key] = type('NexusContext', (ctypes.Structure,), {'_fields_': [
+            ('states', real_p), ('velocities', real_p),
+            ('frozen', ctypes.POINTER(ctypes.c_uint8)), ('stability', ctypes.POINTER(ctypes.c_int32)),
+            ('neighbors', ctypes.POINTER(ctypes.c_int32)),
+            ('neighbor_counts', ctypes.POINTER(ctypes.c_int32)), ('edge_weights', real_p),
+            ('n_entities', ctypes.c_size_t), ('stride', ctypes.c_size_t),
+            ('momentum', c_real), ('force_strength', c_real),
+            ('attractor_positions', real_p), ('attractor_strengths', real_p),
+            ('n_attractors', ctypes.c_size_t),
+            ('freeze_enabled', ctypes.c_uint8), ('freeze_threshold', c_real),
+            ('freeze_steps', ctypes.c_int32), ('steps', ctypes.c_size_t),
+        ]})
+    return _CONTEXT_STRUCTS[key]
+
+def _load_rust_kernels(compiler: CompilerManager = None, dtype=np.float32) -> ctypes.CDLL:
+    """
+    Compile/charge la bibliothèque Rust et déclare les signatures des noyaux.
+    dtype=float64: variante f64 des mêmes sources (bibliothèque nexus_rust_f64).
+    """
+    compiler = compiler or CompilerManager()
+    f64 = np.dtype(dtype) == np.float64
+    rust_lib = compiler.compile_rust(_rust_source(RUST_SOURCE_SIMPLE, dtype),
+                                     "nexus_rust_f64" if f64 else "nexus_rust",
+                                     rayon_source=_rust_source(RUST_SOURCE_RAYON, dtype))
+    c_real = ctypes.c_double if f64 else ctypes.c_float
+    
+    rust_lib.nexus_step.argtypes = [
+        ctypes.POINTER(c_real), ctypes.POINTER(c_real),
+        ctypes.POINTER(ctypes.c_uint8), ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(c_real),
+        ctypes.c_size_t, ctypes.c_size_t, c_real, c_real,
+        ctypes.POINTER(c_real), ctypes.POINTER(c_real), ctypes.c_size_t
+    ]
+    
+    rust_lib.nexus_run.argtypes = [
+        ctypes.POINTER(c_real), ctypes.POINTER(c_real),
+        ctypes.POINTER(ctypes.c_uint8), ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(c_real),
+        ctypes.c_size_t, ctypes.c_size_t, c_real, c_real,
+        ctypes.POINTER(c_real), ctypes.POINTER(c_real), ctypes.c_size_t,
+        ctypes.c_uint8, c_real, ctypes.c_int32, ctypes.c_size_t
+    ]
+    rust_lib.nexus_run.restype = ctypes.c_uint64
+    
+    rust_lib.nexus_run_context.argtypes = [ctypes.POINTER(_context_struct(c_real))]
+    rust_lib.nexus_run_context.restype = ctypes.c_uint64
+    
+    rust_lib.nexus_relax.argtypes = [
+        ctypes.POINTER(c_real), ctypes.POINTER(c_real),
+        ctypes.POINTER(ctypes.c_uint8), ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(c_real),
+        ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32),
+        ctypes.c_size_t, ctypes.c_size_t, c_real,
+        ctypes.POINTER(c_real), ctypes.POINTER(c_real), ctypes.c_size_t,
+        c_real, ctypes.c_uint64, ctypes.c_uint8, ctypes.POINTER(c_real)
+    ]
+    rust_lib.nexus_relax.restype = ctypes.c_uint64
+    
+    rust_lib.nexus_gravity.argtypes = [
+        ctypes.POINTER(c_real), ctypes.POINTER(c_real),
+        ctypes.c_size_t, ctypes.c_size_t, ctypes.c_size_t,
+        c_real, c_real, ctypes.POINTER(c_real)
+    ]
+    
+    rust_lib.nexus_step_batch.argtypes = [
+        ctypes.POINTER(c_real), ctypes.POINTER(c_real),
+        ctypes.POINTER(ctypes.c_uint8), ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(c_real),
+        ctypes.POINTER(ctypes.c_int64), ctypes.POINTER(ctypes.c_int64),
+        ctypes.POINTER(c_real), ctypes.POINTER(c_real),
+        ctypes.POINTER(ctypes.c_int64), ctypes.POINTER(c_real),
+        ctypes.POINTER(c_real), ctypes.POINTER(ctypes.c_uint8),
+        ctypes.c_size_t, ctypes.c_size_t
+    ]
+    
+    rust_lib.nexus_variance.argtypes = [
+        ctypes.POINTER(c_real), ctypes.c_size_t, ctypes.c_size_t
+    ]
+    rust_lib.nexus_variance.restype = c_real
+    
+    return rust_lib
+
+# ============================================================
+# ENTITY
+# ============================================================
+
+class Entity:
+    """
+    Entité du système. Une entité isolée porte ses propres données; une fois
+    intégrée à un System, elle devient une vue sur une ligne du stockage SoA
+    (`_EntityStore`) et ses attributs lisent/écrivent directement les tableaux.
+    """
+    
+    __slots__ = ('id', '_state', '_velocity', '_mass', '_charge', '_is_frozen',
+                 '_stability_counter', '_properties', '_store', '_index')
+    
+    _id_counter = 0
     
     def __init__(self, state: Union[float, List[float]], 
                  mass: float = 1.0, charge: float = 0.0,
@@ -378,13 +1412,140 @@ class Entity:
         self.id = Entity._id_counter
         Entity._id_counter += 1
         
-        self.state = np.array([state] if isinstance(state, (int, float)) else state, dtype=np.float32)
-        self.mass = float(mass)
-        self.charge = float(charge)
-        self.velocity = np.zeros_like(self.state) if velocity is None else np.array(velocity, dtype=np.float32)
-        self.is_frozen = False
-        self.properties = properties or {}
-        self.stability_counter = 0
+        self._store = None
+        self._index = -1
+        self._state = np.array([state] if isinstance(state, (int, float)) else state, dtype=np.float32)
+        self._mass = float(mass)
+        self._charge = float(charge)
+        self._velocity = np.zeros_like(self._state) if velocity is None else np.array(velocity, dtype=np.float32)
+        self._is_frozen = False
+        self._properties = properties or None
+        self._stability_counter = 0
+    
+    @classmethod
+    def _view(cls, store: '_EntityStore', index: int) -> 'Entity':
+        """Vue légère sur la ligne `index` du stockage (aucune copie)."""
+        e = cls.__new__(cls)
+        e.id = int(store.ids[index])
+        e._bind(store, index)
+        return e
+    
+    def _detach(self):
+        """Recopie la ligne du stockage dans l'entité et rompt le lien."""
+        store, i = self._store, self._index
+        properties = store.properties[i] if store.properties is not None else None
+        self._state = store.states[i].copy()
+        self._velocity = store.velocities[i].copy()
+        self._mass = float(store.masses[i])
+        self._charge = float(store.charges[i])
+        self._is_frozen = bool(store.frozen[i])
+        self._stability_counter = int(store.stability[i])
+        self._properties = properties
+        self._store = None
+        self._index = -1
+    
+    def _bind(self, store: '_EntityStore', index: int):
+        self._store = store
+        self._index = index
+        self._state = self._velocity = None
+        self._mass = self._charge = None
+        self._is_frozen = self._stability_counter = None
+        self._properties = None
+    
+    @property
+    def state(self) -> np.ndarray:
+        if self._store is not None:
+            # Ligne modifiable: `e.state[0] = x` écrit dans le stockage (copie si forké)
+            return self._store.writable('states')[self._index]
+        return self._state
+    
+    @state.setter
+    def state(self, value):
+        if self._store is not None:
+            self._store.writable('states')[self._index] = value
+        else:
+            self._state = value
+    
+    @property
+    def velocity(self) -> np.ndarray:
+        if self._store is not None:
+            return self._store.writable('velocities')[self._index]
+        return self._velocity
+    
+    @velocity.setter
+    def velocity(self, value):
+        if self._store is not None:
+            self._store.writable('velocities')[self._index] = value
+        else:
+            self._velocity = value
+    
+    @property
+    def mass(self) -> float:
+        if self._store is not None:
+            return float(self._store.masses[self._index])
+        return self._mass
+    
+    @mass.setter
+    def mass(self, value: float):
+        if self._store is not None:
+            self._store.writable('masses')[self._index] = value
+        else:
+            self._mass = float(value)
+    
+    @property
+    def charge(self) -> float:
+        if self._store is not None:
+            return float(self._store.charges[self._index])
+        return self._charge
+    
+    @charge.setter
+    def charge(self, value: float):
+        if self._store is not None:
+            self._store.writable('charges')[self._index] = value
+        else:
+            self._charge = float(value)
+    
+    @property
+    def is_frozen(self) -> bool:
+        if self._store is not None:
+            return bool(self._store.frozen[self._index])
+        return self._is_frozen
+    
+    @is_frozen.setter
+    def is_frozen(self, value: bool):
+        if self._store is not None:
+            self._store.writable('frozen')[self._index] = 1 if value else 0
+        else:
+            self._is_frozen = bool(value)
+    
+    @property
+    def stability_counter(self) -> int:
+        if self._store is not None:
+            return int(self._store.stability[self._index])
+        return self._stability_counter
+    
+    @stability_counter.setter
+    def stability_counter(self, value: int):
+        if self._store is not None:
+            self._store.writable('stability')[self._index] = value
+        else:
+            self._stability_counter = int(value)
+    
+    @property
+    def properties(self) -> Dict:
+        # Dict matérialisé à la demande (la plupart des entités n'en ont pas)
+        if self._store is not None:
+            return self._store.get_properties(self._index)
+        if self._properties is None:
+            self._properties = {}
+        return self._properties
+    
+    @properties.setter
+    def properties(self, value: Dict):
+        if self._store is not None:
+            self._store.set_properties(self._index, value)
+        else:
+            self._properties = value
     
     def freeze(self):
         self.is_frozen = True
@@ -403,19 +1564,385 @@ class Entity:
         e.is_frozen = self.is_frozen
         return e
 
+# ============================================================
+# ENTITY STORE (SoA)
+# ============================================================
+
+class _EntityStore:
+    """
+    Stockage SoA (structure of arrays) des entités d'un System:
+    states/velocities (N×D, float32 par défaut; float64 ou float16 selon le
+    dtype du System), masses, charges, frozen, stability, ids.
+    Les objets Entity ne sont créés qu'à l'accès (`entity(i)`).
+    
+    Chaque champ est une vue `[:n]` sur un buffer de capacité >= n, agrandi
+    par doublement (ajouts en O(1) amorti).
+    
+    Copy-on-write (`fork()`): des stockages peuvent partager des buffers en
+    lecture seule; toute écriture passe par `own()` / `writable()`, qui copie
+    le buffer tant qu'il est partagé. Un champ dont une vue modifiable a été
+    remise par `writable()` n'est pas partagé au fork suivant (copié pour le
+    fork): la vue écrirait sinon dans la mémoire commune.
+    """
+    
+    FIELDS = ('states', 'velocities', 'masses', 'charges', 'frozen', 'stability', 'ids')
+    
+    def __init__(self, states: np.ndarray, velocities: np.ndarray,
+                 masses: np.ndarray, charges: np.ndarray,
+                 frozen: np.ndarray, stability: np.ndarray, ids: np.ndarray,
+                 properties: Optional[List[Optional[Dict]]] = None,
+                 objects: Optional[Dict[int, Entity]] = None):
+        self._buffers = {
+            'states': states, 'velocities': velocities, 'masses': masses,
+            'charges': charges, 'frozen': frozen, 'stability': stability, 'ids': ids,
+        }
+        # Nombre de stockages partageant chaque buffer ([k] commun aux k stockages)
+        self._owners = {name: [1] for name in self._buffers}
+        # Champs dont une vue modifiable a pu sortir (writable), copiés au fork
+        self._exposed = set()
+        self._finalizer = None
+        self._adopted = False
+        self._n = len(states)
+        self._refresh_views()
+        self.properties = properties
+        # Objets Entity matérialisés, par indice (creux: la plupart restent None)
+        self.objects = objects if objects is not None else {}
+    
+    def _refresh_views(self):
+        for name, buf in self._buffers.items():
+            setattr(self, name, buf[:self._n])
+    
+    @property
+    def n(self) -> int:
+        return self._n
+    
+    @property
+    def dim(self) -> int:
+        return self.states.shape[1]
+    
+    @property
+    def dtype(self) -> np.dtype:
+        return self.states.dtype
+    
+    @property
+    def capacity(self) -> int:
+        return len(self._buffers['states'])
+    
+    def reserve(self, capacity: int):
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, 2 * self.capacity, 16)
+        for name, buf in list(self._buffers.items()):
+            grown = np.zeros((capacity,) + buf.shape[1:], dtype=buf.dtype)
+            grown[:self._n] = buf[:self._n]
+            self._replace(name, grown)
+        self._refresh_views()
+    
+    def adopt(self, buffers: Dict[str, np.ndarray]):
+        """Remplace les buffers par des vues externes (ex: SystemBatch), capacité = n."""
+        for name in self.FIELDS:
+            view = buffers[name]
+            if len(view) != self._n:
+                raise ValueError(f"adopt: {name} a {len(view)} lignes, {self._n} attendues")
+            self._replace(name, view)
+        self._adopted = True
+        self._refresh_views()
+    
+    # --------------------------------------------------------
+    # Copy-on-write
+    # --------------------------------------------------------
+    
+    def _replace(self, name: str, buf: np.ndarray):
+        # Quitte le buffer courant (éventuellement partagé) pour `buf`, non partagé
+        self._owners[name][0] -= 1
+        self._owners[name] = [1]
+        self._buffers[name] = buf
+        self._exposed.discard(name)
+    
+    @staticmethod
+    def _release(owners: Dict[str, list]):
+        for count in owners.values():
+            count[0] -= 1
+    
+    def own(self, *names: str):
+        """
+        Rend les champs `names` (tous par défaut) modifiables: un buffer encore
+        partagé avec un fork est d'abord copié. À appeler avant toute écriture.
+        """
+        for name in names or self.FIELDS:
+            buf = self._buffers[name]
+            if self._owners[name][0] > 1:
+                self._replace(name, buf.copy())
+            elif not buf.flags.writeable:
+                # Dernier détenteur: la vue en lecture seule redevient modifiable
+                try:
+                    buf.flags.writeable = True
+                except ValueError:
+                    self._replace(name, buf.copy())
+            else:
+                continue
+            setattr(self, name, self._buffers[name][:self._n])
+    
+    def writable(self, name: str) -> np.ndarray:
+        """Vue `[:n]` modifiable du champ `name` (voir own)."""
+        self.own(name)
+        self._exposed.add(name)
+        return getattr(self, name)
+    
+    def fork(self) -> '_EntityStore':
+        """
+        Copie paresseuse: les deux stockages partagent des vues en lecture seule
+        des buffers; chacun copie un champ à sa première écriture. Les champs
+        exposés par writable() sont copiés tout de suite pour le fork (les vues
+        déjà remises restent liées à l'original). Les objets Entity ne sont pas
+        partagés (rematérialisés à la demande).
+        """
+        properties = (None if self.properties is None else
+                      [dict(p) if p else None for p in self.properties])
+        if self._adopted:
+            # Buffers écrits de l'extérieur (SystemBatch): copie immédiate
+            return _EntityStore(**{name: getattr(self, name).copy() for name in self.FIELDS},
+                                properties=properties)
+        
+        child = _EntityStore.__new__(_EntityStore)
+        child._buffers = {}
+        child._owners = {}
+        for name, buf in self._buffers.items():
+            if name in self._exposed:
+                child._buffers[name] = buf[:self._n].copy()
+                child._owners[name] = [1]
+                continue
+            if buf.flags.writeable:
+                buf = buf.view()
+                buf.flags.writeable = False
+                self._buffers[name] = buf
+            self._owners[name][0] += 1
+            child._buffers[name] = buf
+            child._owners[name] = self._owners[name]  # même compteur
+        child._exposed = set()
+        child._adopted = False
+        child._n = self._n
+        child.properties = properties
+        child.objects = {}
+        self._refresh_views()
+        child._refresh_views()
+        
+        # Un stockage détruit libère ses buffers partagés (pas de copie inutile)
+        if self._finalizer is None:
+            self._finalizer = weakref.finalize(self, _EntityStore._release, self._owners)
+        child._finalizer = weakref.finalize(child, _EntityStore._release, child._owners)
+        return child
+    
+    def append(self, other: '_EntityStore'):
+        """Ajoute les entités de `other` en fin de stockage (les objets sont rebindés)."""
+        if other.n and other.dim != self.dim:
+            raise ValueError(f"Dimension {other.dim} incompatible avec le système (D={self.dim})")
+        start, k = self._n, other.n
+        self.reserve(start + k)
+        self.own()
+        for name in self.FIELDS:
+            self._buffers[name][start:start + k] = getattr(other, name)
+        self._n = start + k
+        self._refresh_views()
+        
+        if self.properties is not None or other.properties is not None:
+            if self.properties is None:
+                self.properties = [None] * start
+            self.properties.extend(other.properties or [None] * k)
+        for i, e in other.objects.items():
+            self.objects[start + i] = e
+            e._bind(self, start + i)
+    
+    def swap_remove(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Supprime les entités `indices` en comblant les trous avec les
+        dernières lignes. Retourne remap: ancien indice -> nouvel indice (-1
+        si supprimé). Les objets Entity supprimés redeviennent autonomes.
+        """
+        n = self._n
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        if indices.size and (indices[0] < 0 or indices[-1] >= n):
+            raise IndexError("index d'entité hors limites")
+        new_n = n - indices.size
+        
+        removed = np.zeros(n, dtype=bool)
+        removed[indices] = True
+        holes = indices[indices < new_n]
+        sources = np.nonzero(~removed[new_n:])[0] + new_n
+        
+        for i in indices.tolist():
+            e = self.objects.pop(i, None)
+            if e is not None:
+                e._detach()
+        
+        self.own()
+        for buf in self._buffers.values():
+            buf[holes] = buf[sources]
+        for h, src in zip(holes.tolist(), sources.tolist()):
+            e = self.objects.pop(src, None)
+            if e is not None:
+                self.objects[h] = e
+                e._index = h
+            if self.properties is not None:
+                self.properties[h] = self.properties[src]
+        if self.properties is not None:
+            del self.properties[new_n:]
+        
+        self._n = new_n
+        self._refresh_views()
+        
+        remap = np.arange(n, dtype=np.int64)
+        remap[indices] = -1
+        remap[sources] = holes
+        return remap
+    
+    def permute(self, perm: np.ndarray):
+        """Réordonne le stockage: la ligne k reçoit l'ancienne ligne perm[k]."""
+        n = self._n
+        self.own()
+        for name, buf in self._buffers.items():
+            buf[:n] = buf[:n][perm]
+        inverse = np.empty(n, dtype=np.int64)
+        inverse[perm] = np.arange(n)
+        self.objects = {int(inverse[i]): e for i, e in self.objects.items()}
+        for k, e in self.objects.items():
+            e._index = k
+        if self.properties is not None:
+            self.properties = [self.properties[i] for i in perm.tolist()]
+        self._refresh_views()
+    
+    @staticmethod
+    def _allocate_ids(n: int) -> np.ndarray:
+        # Un seul incrément du compteur global pour tout le bloc
+        start = Entity._id_counter
+        Entity._id_counter += n
+        return np.arange(start, start + n, dtype=np.int64)
+    
+    @classmethod
+    def from_arrays(cls, states, masses=None, charges=None, velocities=None,
+                    frozen=None, stability=None, ids=None, properties=None,
+                    copy: bool = True, dtype=np.float32) -> '_EntityStore':
+        def as_array(a, dtype, shape):
+            a = np.array(a, dtype=dtype, copy=True) if copy else np.asarray(a, dtype=dtype)
+            if a.shape != shape:
+                a = a.reshape(shape)
+            return np.ascontiguousarray(a)
+        
+        states = np.asarray(states)
+        if states.ndim == 1:
+            states = states.reshape(-1, 1)
+        if states.ndim != 2:
+            raise ValueError(f"states doit être (N,) ou (N, D), reçu {states.shape}")
+        n, dim = states.shape
+        
+        return cls(
+            states=as_array(states, dtype, (n, dim)),
+            velocities=(np.zeros((n, dim), dtype=dtype) if velocities is None
+                        else as_array(velocities, dtype, (n, dim))),
+            masses=(np.ones(n, dtype=np.float32) if masses is None
+                    else as_array(masses, np.float32, (n,))),
+            charges=(np.zeros(n, dtype=np.float32) if charges is None
+                     else as_array(charges, np.float32, (n,))),
+            frozen=(np.zeros(n, dtype=np.uint8) if frozen is None
+                    else as_array(frozen, np.uint8, (n,))),
+            stability=(np.zeros(n, dtype=np.int32) if stability is None
+                       else as_array(stability, np.int32, (n,))),
+            ids=cls._allocate_ids(n) if ids is None else as_array(ids, np.int64, (n,)),
+            properties=properties,
+        )
+    
+    @classmethod
+    def from_entities(cls, entities: List[Entity], dtype=np.float32) -> '_EntityStore':
+        n = len(entities)
+        try:
+            # Aucune entité: stockage vide de dimension 1
+            states = np.array([e.state for e in entities], dtype=dtype).reshape(n, -1 if n else 1)
+            velocities = np.array([e.velocity for e in entities], dtype=dtype).reshape(states.shape)
+        except ValueError:
+            raise ValueError("Toutes les entités d'un System doivent avoir la même dimension")
+        
+        properties = [e.properties or None for e in entities]
+        store = cls(
+            states=states,
+            velocities=velocities,
+            masses=np.fromiter((e.mass for e in entities), dtype=np.float32, count=n),
+            charges=np.fromiter((e.charge for e in entities), dtype=np.float32, count=n),
+            frozen=np.fromiter((e.is_frozen for e in entities), dtype=np.uint8, count=n),
+            stability=np.fromiter((e.stability_counter for e in entities), dtype=np.int32, count=n),
+            ids=np.fromiter((e.id for e in entities), dtype=np.int64, count=n),
+            properties=properties if any(properties) else None,
+            objects=dict(enumerate(entities)),
+        )
+        for i, e in enumerate(entities):
+            e._bind(store, i)
+        return store
+    
+    def entity(self, index: int) -> Entity:
+        e = self.objects.get(index)
+        if e is None:
+            e = Entity._view(self, index)
+            self.objects[index] = e
+        return e
+    
+    def get_properties(self, index: int) -> Dict:
+        if self.properties is None:
+            self.properties = [None] * self.n
+        props = self.properties[index]
+        if props is None:
+            props = self.properties[index] = {}
+        return props
+    
+    def set_properties(self, index: int, value: Dict):
+        if self.properties is None:
+            self.properties = [None] * self.n
+        self.properties[index] = value
+
+
+class _EntityList:
+    """
+    Séquence paresseuse d'Entity au-dessus d'un _EntityStore. `rows`
+    optionnel: ligne du stockage de chaque position (vue permutée).
+    """
+    
+    def __init__(self, store: _EntityStore, rows: np.ndarray = None):
+        self._store = store
+        self._rows = rows
+    
+    def __len__(self) -> int:
+        return self._store.n
+    
+    def _entity(self, index: int) -> Entity:
+        return self._store.entity(index if self._rows is None else int(self._rows[index]))
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entity(i) for i in range(*index.indices(self._store.n))]
+        if index < 0:
+            index += self._store.n
+        if not 0 <= index < self._store.n:
+            raise IndexError("index d'entité hors limites")
+        return self._entity(index)
+    
+    def __iter__(self):
+        for i in range(self._store.n):
+            yield self._entity(i)
+
 # ============================================================
 # FORCE
 # ============================================================
 
 class Force:
-    def __init__(self, func: Callable):
+    def __init__(self, func: Callable, kind: str = 'custom', params: Dict = None):
         self.func = func
+        # kind/params: lus par les noyaux natifs (la func reste la référence Python)
+        self.kind = kind
+        self.params = params or {}
     
     @staticmethod
     def attraction(strength: float = 0.5):
         def f(e1, e2):
             return (e2.state - e1.state) * strength
-        return Force(f)
+        return Force(f, 'attraction', {'strength': strength})
     
     @staticmethod
     def repulsion(strength: float = 0.3):
@@ -425,10 +1952,14 @@ class Force:
             if dist < 0.01:
                 dist = 0.01
             return -diff * strength / dist
-        return Force(f)
+        return Force(f, 'repulsion', {'strength': strength})
     
     @staticmethod
-    def gravity(G: float = 1.0):
+    def gravity(G: float = 1.0, theta: float = 0.5):
+        """
+        Gravité G·m1·m2/r². Avec Topology.full(), le System calcule le champ
+        par Barnes-Hut (O(N log N)); theta = 0 donne la somme exacte O(N²).
+        """
         def f(e1, e2):
             diff = e2.state - e1.state
             dist = np.linalg.norm(diff)
@@ -436,7 +1967,7 @@ class Force:
                 dist = 0.01
             force_mag = G * e1.mass * e2.mass / (dist ** 2)
             return diff / dist * force_mag
-        return Force(f)
+        return Force(f, 'gravity', {'G': G, 'theta': theta})
     
     @staticmethod
     def spring(k: float = 0.8, rest_length: float = 0.0):
@@ -445,7 +1976,7 @@ class Force:
             dist = np.linalg.norm(diff)
             displacement = dist - rest_length
             return diff / dist * k * displacement if dist > 0 else 0
-        return Force(f)
+        return Force(f, 'spring', {'k': k, 'rest_length': rest_length})
     
     @staticmethod
     def custom(func: Callable):
@@ -453,50 +1984,97 @@ class Force:
     
     def compute(self, e1: Entity, e2: Entity):
         return self.func(e1, e2)
+    
+    def kernel_strength(self) -> float:
+        """Intensité passée au noyau de consensus (0.5 hors attraction)."""
+        if self.kind == 'attraction':
+            return float(self.params['strength'])
+        return 0.5
 
 # ============================================================
 # TOPOLOGY
 # ============================================================
 
 class Topology:
-    def __init__(self, func: Callable):
+    """
+    Générateur de graphe de voisinage, en espace d'indices locaux: `func(i,
+    entities)` renvoie les indices (0..N-1) des voisins de l'entité i dans
+    le System, indépendamment de `Entity.id`.
+    
+    `builder(states) -> (neighbors, counts[, weights])` optionnel construit tout
+    le graphe en une passe vectorisée (utilisé par les topologies intégrées).
+    
+    Arêtes pondérées: `weight(states, rows, cols) -> poids float32` (vectorisé,
+    une valeur par arête) ou poids renvoyés par le builder. Le noyau applique
+    Σ w_ij·(s_j - s_i)·strength / degré (w = 1 sans poids).
+    
+    `incremental`: les voisins d'une entité existante ne dépendent pas de N
+    (hors arêtes vers les entités ajoutées), add_entities complète alors le
+    graphe en cache; sinon (bouclage du ring, grille) il est reconstruit.
+    """
+    
+    def __init__(self, func: Callable, dynamic: bool = False,
+                 builder: Callable = None, kind: str = 'custom',
+                 weight: Callable = None, incremental: bool = True):
         self.func = func
+        self.kind = kind  # lu par le System pour choisir un chemin natif (ex: 'full')
+        # Statique: graphe construit une fois puis mis en cache par le System.
+        # Dynamique: reconstruit à chaque step (voisinage dépendant des états).
+        self.dynamic = dynamic
+        self.builder = builder
+        self.weight = weight
+        self.incremental = incremental
     
     @staticmethod
-    def small_world(shortcuts: int = 2, k: int = 2):
-        def f(entity_id, entities):
+    def small_world(shortcuts: int = 2, k: int = 2, dynamic: bool = False):
+        """
+        Anneau + `shortcuts` raccourcis aléatoires par entité. Les raccourcis
+        sont tirés à la construction du graphe puis figés avec lui (cache du
+        System); dynamic=True les retire à chaque step.
+        """
+        def f(index, entities):
             n = len(entities)
-            neighbors = [(entity_id - 1) % n, (entity_id + 1) % n]
+            neighbors = [(index - 1) % n, (index + 1) % n]
             
             import random
             for _ in range(shortcuts):
                 j = random.randint(0, n - 1)
-                if j != entity_id and j not in neighbors:
+                if j != index and j not in neighbors:
                     neighbors.append(j)
             
             return neighbors
-        return Topology(f)
+        return Topology(f, dynamic=dynamic, kind='small_world', incremental=False)
     
     @staticmethod
     def ring():
-        def f(entity_id, entities):
+        def f(index, entities):
             n = len(entities)
-            return [(entity_id - 1) % n, (entity_id + 1) % n]
-        return Topology(f)
+            return [(index - 1) % n, (index + 1) % n]
+        
+        def build(states):
+            idx = np.arange(len(states), dtype=np.int64)
+            neighbors = np.stack([(idx - 1) % len(states), (idx + 1) % len(states)], axis=1)
+            return neighbors.ravel(), np.full(len(states), 2)
+        return Topology(f, builder=build, kind='ring', incremental=False)
     
     @staticmethod
     def full():
-        def f(entity_id, entities):
-            return [e.id for e in entities if e.id != entity_id]
-        return Topology(f)
+        def f(index, entities):
+            return [j for j in range(len(entities)) if j != index]
+        
+        def build(states):
+            n = len(states)
+            neighbors = np.tile(np.arange(n, dtype=np.int32), n).reshape(n, n)
+            return neighbors[~np.eye(n, dtype=bool)], np.full(n, max(n - 1, 0))
+        return Topology(f, builder=build, kind='full')
     
     @staticmethod
     def grid_2d(width: int, height: int = None):
         if height is None:
             height = width
         
-        def f(entity_id, entities):
-            row, col = entity_id // width, entity_id % width
+        def f(index, entities):
+            row, col = index // width, index % width
             neighbors = []
             
             if row > 0:
@@ -508,15 +2086,534 @@ class Topology:
             if col < width - 1:
                 neighbors.append(row * width + col + 1)
             
-            return neighbors
-        return Topology(f)
+            return [j for j in neighbors if j < len(entities)]
+        
+        def build(states):
+            n = len(states)
+            idx = np.arange(n, dtype=np.int64)
+            row, col = idx // width, idx % width
+            # Candidats haut, bas, gauche, droite (même ordre que f)
+            cand = np.stack([idx - width, idx + width, idx - 1, idx + 1], axis=1)
+            valid = np.stack([row > 0, row < height - 1, col > 0, col < width - 1], axis=1)
+            valid &= cand < n
+            return cand[valid], valid.sum(axis=1)
+        return Topology(f, builder=build, kind='grid_2d', incremental=False)
     
     @staticmethod
-    def custom(func: Callable):
-        return Topology(func)
+    def radius(r: float, skin: float = None):
+        """
+        Voisins à distance euclidienne <= r (cell lists + liste de Verlet).
+        Les candidats à distance <= r + skin ne sont recalculés que lorsqu'une
+        entité s'est déplacée de plus de skin/2; à chaque step on ne filtre
+        que ces candidats: O(N) par step.
+        """
+        if r <= 0:
+            raise ValueError("r doit être > 0")
+        verlet = _VerletRadius(r, 0.2 * r if skin is None else skin)
+        
+        def f(index, entities):
+            points = np.array([np.atleast_1d(e.state) for e in entities], dtype=np.float64)
+            dist = np.linalg.norm(points - points[index], axis=1)
+            return [j for j in np.flatnonzero(dist <= r).tolist() if j != index]
+        return Topology(f, dynamic=True, builder=verlet, kind='radius')
+    
+    @staticmethod
+    def knn(k: int, skin: float = None):
+        """
+        Les k plus proches voisins (distance euclidienne), avec liste de
+        Verlet: candidats à distance <= d_k + skin, recalculés lorsqu'une
+        entité s'est déplacée de plus de skin/4.
+        """
+        if k < 1:
+            raise ValueError("k doit être >= 1")
+        verlet = _VerletKNN(k, skin)
+        
+        def f(index, entities):
+            points = np.array([np.atleast_1d(e.state) for e in entities], dtype=np.float64)
+            dist = np.linalg.norm(points - points[index], axis=1)
+            dist[index] = np.inf
+            order = np.argsort(dist, kind='stable')[:min(k, len(entities) - 1)]
+            return order.tolist()
+        return Topology(f, dynamic=True, builder=verlet, kind='knn')
     
-    def get_neighbors(self, entity_id: int, entities: List[Entity]) -> List[int]:
-        return self.func(entity_id, entities)
+    @staticmethod
+    def custom(func: Callable, dynamic: bool = False):
+        return Topology(func, dynamic=dynamic)
+    
+    @staticmethod
+    def from_graph(neighbors, counts, weights=None):
+        """
+        Topologie figée à partir d'un graphe (voisins concaténés + comptes),
+        avec poids par arête optionnels (alignés sur `neighbors`). Les
+        entités ajoutées au-delà du graphe sont isolées.
+        """
+        neighbors = np.asarray(neighbors, dtype=np.int32)
+        counts = np.asarray(counts, dtype=np.int32)
+        offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float32)
+        
+        def f(index, entities):
+            if index >= len(counts):
+                return []
+            return neighbors[offsets[index]:offsets[index + 1]].tolist()
+        
+        def build(states):
+            extra = len(states) - len(counts)
+            padded = np.concatenate((counts, np.zeros(extra, dtype=np.int32))) if extra > 0 else counts
+            if weights is None:
+                return neighbors, padded
+            return neighbors, padded, weights
+        return Topology(f, builder=build, kind='graph')
+    
+    def with_weights(self, weight: Callable) -> 'Topology':
+        """
+        Même voisinage, arêtes pondérées par `weight(states, rows, cols)`
+        (vectorisé: tableaux d'indices des extrémités, une valeur par arête).
+        """
+        return Topology(self.func, dynamic=self.dynamic, builder=self.builder,
+                        kind=self.kind, weight=weight, incremental=self.incremental)
+    
+    def get_neighbors(self, index: int, entities: List[Entity]) -> List[int]:
+        return self.func(index, entities)
+    
+    def build(self, states: np.ndarray, entities: List[Entity] = None,
+              with_weights: bool = False):
+        """
+        Construit le graphe complet (neighbors int32, counts int32) pour les
+        N entités de `states`. Lève ValueError si un voisin est hors [0, N).
+        Avec `with_weights`, renvoie aussi les poids float32 (None si la
+        topologie n'est pas pondérée).
+        """
+        n = len(states)
+        weights = None
+        if self.builder is not None:
+            built = self.builder(states)
+            neighbors, counts = built[0], built[1]
+            if len(built) > 2:
+                weights = built[2]
+        else:
+            all_neighbors = []
+            counts = np.empty(n, dtype=np.int32)
+            for i in range(n):
+                neighbors = self.func(i, entities)
+                all_neighbors.extend(neighbors)
+                counts[i] = len(neighbors)
+            neighbors = all_neighbors
+        
+        neighbors = np.ascontiguousarray(neighbors, dtype=np.int32)
+        counts = np.ascontiguousarray(counts, dtype=np.int32)
+        if neighbors.size and (neighbors.min() < 0 or neighbors.max() >= n):
+            raise ValueError(f"Topologie: indice de voisin hors de [0, {n}) "
+                             f"(les topologies travaillent en indices locaux, pas en Entity.id)")
+        if not with_weights:
+            return neighbors, counts
+        
+        if weights is None and self.weight is not None:
+            weights = self.weight(states, np.repeat(np.arange(n), counts), neighbors)
+        if weights is not None:
+            weights = np.ascontiguousarray(weights, dtype=np.float32)
+            if weights.shape != neighbors.shape:
+                raise ValueError(f"Topologie: {weights.size} poids pour {neighbors.size} arêtes")
+        return neighbors, counts, weights
+
+# ============================================================
+# SPATIAL SEARCH (cell lists + listes de Verlet)
+# ============================================================
+
+_GRID_MAX_DIMS = 3  # au-delà, grille sur les 3 premières dimensions (sur-ensemble)
+
+def _grid_pairs(points: np.ndarray, h: float):
+    """
+    Paires candidates (rows, cols) i != j: toutes les paires à distance <= h
+    y figurent (cellules de côté h, 3^D cellules voisines). Groupées par row.
+    """
+    n = len(points)
+    if n == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    grid = points[:, :_GRID_MAX_DIMS]
+    coords = np.floor((grid - grid.min(axis=0)) / h).astype(np.int64)
+    dims = coords.max(axis=0) + 1
+    # Clés de cellule sur int64: on abandonne des dimensions si nécessaire
+    while len(dims) > 1 and np.prod(dims.astype(object)) >= 2**62:
+        coords, dims = coords[:, :-1], dims[:-1]
+    keys = np.ravel_multi_index(coords.T, dims)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    
+    offsets = np.array(list(itertools.product((-1, 0, 1), repeat=len(dims))), dtype=np.int64)
+    lo = np.zeros((n, len(offsets)), dtype=np.int64)
+    cnt = np.zeros((n, len(offsets)), dtype=np.int64)
+    for o, offset in enumerate(offsets):
+        shifted = coords + offset
+        valid = np.flatnonzero(np.all((shifted >= 0) & (shifted < dims), axis=1))
+        target = np.ravel_multi_index(shifted[valid].T, dims)
+        lo[valid, o] = np.searchsorted(sorted_keys, target, 'left')
+        cnt[valid, o] = np.searchsorted(sorted_keys, target, 'right') - lo[valid, o]
+    
+    # Sortie directement groupée par ligne (sans tri): la ligne i reçoit ses
+    # segments [lo, lo + cnt) dans l'ordre des cellules voisines
+    lo, cnt = lo.ravel(), cnt.ravel()
+    total = int(cnt.sum())
+    starts = np.repeat(lo - np.cumsum(cnt) + cnt, cnt)
+    rows = np.repeat(np.arange(n, dtype=np.int64), cnt.reshape(n, -1).sum(axis=1))
+    cols = order[starts + np.arange(total)]
+    keep = rows != cols
+    return rows[keep], cols[keep]
+
+def _pair_distances(points: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # Colonne par colonne: évite les copies N×D des indexations 2D
+    sq = np.zeros(len(rows))
+    for column in points.T:
+        column = np.ascontiguousarray(column)
+        sq += np.square(column[rows] - column[cols])
+    return np.sqrt(sq)
+
+def _grouped_csr(rows: np.ndarray, cols: np.ndarray, n: int):
+    """(neighbors, counts) int32 pour des arêtes déjà groupées par ligne."""
+    return (np.ascontiguousarray(cols, dtype=np.int32),
+            np.bincount(rows, minlength=n).astype(np.int32))
+
+def _as_points(states: np.ndarray) -> np.ndarray:
+    return np.asarray(states, dtype=np.float64).reshape(len(states), -1)
+
+class _VerletList:
+    """Liste de candidats + positions de référence; rafraîchie au-delà de `limit`."""
+    
+    def __init__(self):
+        self.reference = None
+        self.rows = self.cols = None
+    
+    def _stale(self, points: np.ndarray, limit: float) -> bool:
+        if self.reference is None or self.reference.shape != points.shape:
+            return True
+        moved = np.square(points - self.reference).sum(axis=1).max(initial=0.0)
+        return moved > limit * limit
+
+class _VerletRadius(_VerletList):
+    def __init__(self, r: float, skin: float):
+        super().__init__()
+        self.r, self.skin = r, skin
+    
+    def __call__(self, states: np.ndarray):
+        points = _as_points(states)
+        n = len(points)
+        if self._stale(points, self.skin / 2):
+            cutoff = self.r + self.skin
+            rows, cols = _grid_pairs(points, cutoff)
+            keep = _pair_distances(points, rows, cols) <= cutoff
+            self.rows, self.cols = rows[keep].astype(np.int32), cols[keep].astype(np.int32)
+            self.reference = points.copy()
+        
+        keep = _pair_distances(points, self.rows, self.cols) <= self.r
+        return _grouped_csr(self.rows[keep], self.cols[keep], n)
+
+class _VerletKNN(_VerletList):
+    def __init__(self, k: int, skin: float = None):
+        super().__init__()
+        self.k, self.skin = k, skin
+        self.limit = 0.0
+    
+    def _refresh(self, points: np.ndarray):
+        n, k = len(points), self.k
+        # Cellule dimensionnée pour ~k entités: la plupart des k-voisinages
+        # tiennent dans les 3^D cellules voisines
+        grid = points[:, :_GRID_MAX_DIMS]
+        span = grid.max(axis=0) - grid.min(axis=0)
+        span = span[span > 0]
+        h = (np.prod(span) * (k + 1) / n) ** (1.0 / len(span)) if len(span) else 1.0
+        
+        rows, cols = _grid_pairs(points, h)
+        dist = _pair_distances(points, rows, cols)
+        counts = np.bincount(rows, minlength=n)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        
+        # d_k par ligne (k-ième plus petite distance parmi les candidats)
+        order = np.lexsort((dist, rows))
+        rank = np.arange(len(rows)) - offsets[rows[order]]
+        dk = np.full(n, np.inf)
+        kth = rank == k - 1
+        dk[rows[order][kth]] = dist[order][kth]
+        
+        skin = self.skin if self.skin is not None else 0.5 * float(np.median(dk[np.isfinite(dk)])
+                                                                 if np.isfinite(dk).any() else h)
+        radius = dk + skin
+        # Garantie seulement si le rayon tient dans une cellule: sinon force brute
+        exact = radius <= h
+        keep = exact[rows] & (dist <= radius[rows])
+        rows, cols = [rows[keep]], [cols[keep]]
+        
+        for chunk in np.array_split(np.flatnonzero(~exact), max(1, (~exact).sum() // 256)):
+            if len(chunk) == 0:
+                continue
+            d = pairwise_distances(points[chunk], points)
+            d[np.arange(len(chunk)), chunk] = np.inf
+            kk = min(k, n - 1)
+            if kk == 0:
+                continue
+            dk_chunk = np.partition(d, kk - 1, axis=1)[:, kk - 1]
+            r_idx, c_idx = np.nonzero(d <= (dk_chunk + skin)[:, None])
+            rows.append(chunk[r_idx])
+            cols.append(c_idx)
+        
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        order = np.argsort(rows, kind='stable')
+        self.rows, self.cols = rows[order].astype(np.int32), cols[order].astype(np.int32)
+        self.reference = points.copy()
+        self.limit = skin / 4
+    
+    def __call__(self, states: np.ndarray):
+        points = _as_points(states)
+        n = len(points)
+        if self._stale(points, self.limit):
+            self._refresh(points)
+        
+        rows, cols = self.rows, self.cols
+        dist = _pair_distances(points, rows, cols)
+        # k plus proches parmi les candidats, par ligne (ordre: distance croissante)
+        order = np.lexsort((dist, rows))
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))))
+        rank = np.arange(len(rows)) - offsets[rows[order]]
+        keep = order[rank < self.k]
+        return _grouped_csr(rows[keep], cols[keep], n)
+
+# ============================================================
+# DISTANCES (produit matriciel BLAS, tuiles bornées)
+# ============================================================
+
+DISTANCE_TILE_BYTES = 32 << 20  # mémoire d'une tuile de distances (float64)
+_DISTANCE_TILE_COLS = 4096
+
+def _distance_operands(points, queries=None):
+    """
+    (queries, points) en float64 2D, centrés sur la moyenne des points:
+    ‖a‖²+‖b‖²−2a·b est invariant par translation et la compensation
+    numérique est bien moindre près de l'origine.
+    """
+    points = _as_points(points)
+    queries = points if queries is None else _as_points(queries)
+    if queries.shape[1] != points.shape[1]:
+        raise ValueError(f"dimensions incompatibles: {queries.shape[1]} != {points.shape[1]}")
+    center = points.mean(axis=0) if len(points) else 0.0
+    same = queries is points
+    points = points - center
+    return (points if same else queries - center), points
+
+def _tiles(n_queries: int, n_points: int, tile_bytes: int, min_cols: int = 1):
+    """Tailles (lignes, colonnes) d'une tuile de tile_bytes octets au plus."""
+    cols = max(1, min(n_points, max(_DISTANCE_TILE_COLS, min_cols)))
+    rows = max(1, min(n_queries, tile_bytes // (8 * cols)))
+    return rows, cols
+
+def _augmented(queries: np.ndarray, points: np.ndarray):
+    """
+    Opérandes augmentés [−2q, 1] et [p, ‖p‖²]: un seul GEMM par tuile donne
+    ‖p‖²−2q·p, soit ‖q−p‖² à ‖q‖² près (constant par ligne: même classement).
+    """
+    q_aug = np.empty((len(queries), queries.shape[1] + 1))
+    q_aug[:, :-1] = queries
+    q_aug[:, :-1] *= -2.0
+    q_aug[:, -1] = 1.0
+    p_aug = np.empty((len(points), points.shape[1] + 1))
+    p_aug[:, :-1] = points
+    p_aug[:, -1] = np.einsum('ij,ij->i', points, points)
+    return q_aug, p_aug, np.einsum('ij,ij->i', queries, queries)
+
+def _exclude_self(d: np.ndarray, q0: int, q1: int, p0: int, p1: int):
+    # Exclusion de soi par indice (la distance calculée n'est pas exactement 0)
+    own = np.arange(max(q0, p0), min(q1, p1))
+    d[own - q0, own - p0] = np.inf
+
+def pairwise_distances(a, b=None, squared: bool = False,
+                       tile_bytes: int = DISTANCE_TILE_BYTES) -> np.ndarray:
+    """
+    Matrice des distances euclidiennes (len(a) × len(b), float64) entre les
+    lignes de a et de b (b=None: a contre a, diagonale nulle). Calcul par
+    blocs de lignes via ‖a‖²+‖b‖²−2a·b: un produit matriciel BLAS par bloc
+    au lieu d'un `distance_to` par paire.
+    """
+    queries, points = _distance_operands(a if b is None else b, None if b is None else a)
+    q_aug, p_aug, q_sq = _augmented(queries, points)
+    out = np.empty((len(queries), len(points)))
+    rows = max(1, tile_bytes // (8 * max(1, len(points))))
+    for start in range(0, len(queries), rows):
+        stop = min(start + rows, len(queries))
+        block = np.matmul(q_aug[start:stop], p_aug.T, out=out[start:stop])
+        block += q_sq[start:stop, None]
+        np.maximum(block, 0.0, out=block)  # arrondis: jamais négatif
+    if b is None:
+        np.fill_diagonal(out, 0.0)
+    return out if squared else np.sqrt(out, out=out)
+
+def knn_query(points, k: int, queries=None,
+              tile_bytes: int = DISTANCE_TILE_BYTES):
+    """
+    Les k plus proches points de chaque requête (queries=None: chaque point,
+    lui-même exclu). Retourne (indices, distances), Q×k triés par distance
+    croissante (k borné au nombre de candidats). Mémoire bornée: tuiles
+    requêtes × points de tile_bytes au plus; au-delà de la première tuile,
+    seuls les candidats sous la k-ième distance courante sont fusionnés.
+    """
+    if k < 1:
+        raise ValueError("k doit être >= 1")
+    self_query = queries is None
+    queries, points = _distance_operands(points, queries)
+    n_q, n_p = len(queries), len(points)
+    k = min(k, n_p - 1 if self_query else n_p)
+    indices = np.empty((n_q, max(k, 0)), dtype=np.int64)
+    distances = np.empty((n_q, max(k, 0)))
+    if k <= 0 or n_q == 0:
+        return indices, distances
+    
+    q_aug, p_aug, q_sq = _augmented(queries, points)
+    rows, cols = _tiles(n_q, n_p, tile_bytes, min_cols=k + 1)
+    for q0 in range(0, n_q, rows):
+        q1 = min(q0 + rows, n_q)
+        slots = np.repeat(np.arange(q1 - q0), k)
+        for p0 in range(0, n_p, cols):
+            p1 = min(p0 + cols, n_p)
+            d = q_aug[q0:q1] @ p_aug[p0:p1].T
+            if self_query:
+                _exclude_self(d, q0, q1, p0, p1)
+            if p0 == 0:
+                # Première tuile (>= k+1 colonnes): top-k initial par sélection
+                best_i = np.argpartition(d, k - 1, axis=1)[:, :k]
+                best_d = np.take_along_axis(d, best_i, axis=1)
+                continue
+            r_idx, c_idx = np.nonzero(d < best_d.max(axis=1)[:, None])
+            if len(r_idx) == 0:
+                continue
+            # Fusion: k meilleurs de (top-k courant ∪ candidats), par ligne
+            cand_r = np.concatenate((slots, r_idx))
+            cand_d = np.concatenate((best_d.ravel(), d[r_idx, c_idx]))
+            cand_i = np.concatenate((best_i.ravel(), c_idx + p0))
+            order = np.lexsort((cand_d, cand_r))
+            offsets = np.concatenate(([0], np.cumsum(np.bincount(cand_r, minlength=q1 - q0))))
+            keep = order[(offsets[:-1, None] + np.arange(k)).ravel()]
+            best_d = cand_d[keep].reshape(-1, k)
+            best_i = cand_i[keep].reshape(-1, k)
+        order = np.argsort(best_d, axis=1, kind='stable')
+        indices[q0:q1] = np.take_along_axis(best_i, order, axis=1)
+        best_d = np.take_along_axis(best_d, order, axis=1) + q_sq[q0:q1, None]
+        distances[q0:q1] = np.sqrt(np.maximum(best_d, 0.0))
+    return indices, distances
+
+def radius_query(points, r: float, queries=None, return_distances: bool = False,
+                 tile_bytes: int = DISTANCE_TILE_BYTES):
+    """
+    Points à distance <= r de chaque requête (queries=None: chaque point,
+    lui-même exclu), au format CSR de `Topology.build`: (neighbors, counts)
+    int32, voisins d'une requête par indice croissant, plus les distances si
+    return_distances. Mémoire bornée par tuiles de tile_bytes au plus.
+    """
+    if r < 0:
+        raise ValueError("r doit être >= 0")
+    self_query = queries is None
+    queries, points = _distance_operands(points, queries)
+    n_q, n_p = len(queries), len(points)
+    q_aug, p_aug, q_sq = _augmented(queries, points)
+    rows, cols = _tiles(n_q, n_p, tile_bytes)
+    # ‖q−p‖² <= r²  <=>  ‖p‖²−2q·p <= r²−‖q‖²
+    limit = float(r) * float(r) - q_sq
+    
+    row_parts, col_parts, dist_parts = [], [], []
+    for q0 in range(0, n_q, rows):
+        q1 = min(q0 + rows, n_q)
+        block_rows, block_cols, block_dist = [], [], []
+        for p0 in range(0, n_p, cols):
+            p1 = min(p0 + cols, n_p)
+            d = q_aug[q0:q1] @ p_aug[p0:p1].T
+            if self_query:
+                _exclude_self(d, q0, q1, p0, p1)
+            r_idx, c_idx = np.nonzero(d <= limit[q0:q1, None])
+            block_rows.append(r_idx + q0)
+            block_cols.append(c_idx + p0)
+            block_dist.append(d[r_idx, c_idx] + q_sq[r_idx + q0])
+        # Tuiles de colonnes parcourues dans l'ordre: tri stable par ligne
+        block_rows = np.concatenate(block_rows)
+        order = np.argsort(block_rows, kind='stable')
+        row_parts.append(block_rows[order])
+        col_parts.append(np.concatenate(block_cols)[order])
+        dist_parts.append(np.concatenate(block_dist)[order])
+    
+    neighbors, counts = _grouped_csr(np.concatenate(row_parts), np.concatenate(col_parts), n_q)
+    if return_distances:
+        return neighbors, counts, np.sqrt(np.maximum(np.concatenate(dist_parts), 0.0))
+    return neighbors, counts
+
+def _euclidean_mst(points) -> tuple:
+    """
+    Arbre couvrant minimal euclidien exact (Prim sur le graphe complet):
+    N-1 itérations d'un produit matrice-vecteur O(N·D), mémoire O(N).
+    Retourne (parents, enfants, longueurs) des N-1 arêtes.
+    """
+    points, _ = _distance_operands(points)
+    n = len(points)
+    sq = np.einsum('ij,ij->i', points, points)
+    best = np.full(n, np.inf)
+    parent = np.zeros(n, dtype=np.int64)
+    blocked = np.zeros(n)  # +inf pour les points déjà dans l'arbre
+    rows = np.empty(max(n - 1, 0), dtype=np.int64)
+    cols = np.empty(max(n - 1, 0), dtype=np.int64)
+    lengths = np.empty(max(n - 1, 0))
+    current = 0
+    for step in range(n - 1):
+        blocked[current] = np.inf
+        d = points @ (-2.0 * points[current])
+        d += sq
+        d += sq[current] + blocked
+        closer = d < best
+        best[closer] = d[closer]
+        parent[closer] = current
+        best[current] = np.inf
+        current = int(np.argmin(best))
+        rows[step], cols[step], lengths[step] = parent[current], current, best[current]
+    return rows, cols, np.sqrt(np.maximum(lengths, 0.0))
+
+def _bounded_mst(points, max_distance: float) -> tuple:
+    """
+    Forêt couvrante minimale des arêtes < max_distance (Kruskal sur les
+    paires candidates: cell lists en dimension <= 3, radius_query au-delà).
+    Ses arêtes sont celles de l'arbre exact plus courtes que max_distance;
+    les composantes restantes sont reliées par des arêtes de longueur inf.
+    Retourne (parents, enfants, longueurs) des N-1 arêtes.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    if points.shape[1] <= _GRID_MAX_DIMS:
+        rows, cols = _grid_pairs(points, max_distance)
+        lengths = _pair_distances(points, rows, cols)
+    else:
+        cols, counts, lengths = radius_query(points, max_distance, return_distances=True)
+        rows = np.repeat(np.arange(n, dtype=np.int64), counts)
+    keep = (rows < cols) & (lengths < max_distance)
+    rows, cols, lengths = rows[keep], cols[keep].astype(np.int64), lengths[keep]
+    
+    root = np.arange(n)
+    size = np.ones(n, dtype=np.int64)
+    
+    def find(i):
+        while root[i] != i:
+            root[i] = root[root[i]]
+            i = root[i]
+        return i
+    
+    tree = []
+    for e in np.argsort(lengths, kind='stable').tolist():
+        a, b = find(rows[e]), find(cols[e])
+        if a != b:
+            if size[a] < size[b]:
+                a, b = b, a
+            root[b] = a
+            size[a] += size[b]
+            tree.append(e)
+    tree = np.asarray(tree, dtype=np.int64)
+    
+    # Une arête inf entre représentants de composantes consécutives
+    roots = np.unique(_connected_components(n, rows[tree], cols[tree]))
+    return (np.concatenate((rows[tree], roots[:-1])),
+            np.concatenate((cols[tree], roots[1:])),
+            np.concatenate((lengths[tree], np.full(max(len(roots) - 1, 0), np.inf))))
 
 # ============================================================
 # SYSTEM
@@ -529,87 +2626,628 @@ class System:
                  momentum: float = 0.8,
                  freeze_enabled: bool = True,
                  freeze_threshold: float = 0.01,
-                 freeze_stability_steps: int = 5):
+                 freeze_stability_steps: int = 5,
+                 dtype=np.float32):
         
-        self.entities = entities
+        _compute_dtype(dtype)
+        self._init(_EntityStore.from_entities(entities, dtype), force, topology, momentum,
+                   freeze_enabled, freeze_threshold, freeze_stability_steps)
+    
+    @classmethod
+    def from_arrays(cls, states, masses=None, charges=None, velocities=None,
+                    force: Force = None,
+                    topology: Topology = None,
+                    momentum: float = 0.8,
+                    freeze_enabled: bool = True,
+                    freeze_threshold: float = 0.01,
+                    freeze_stability_steps: int = 5,
+                    copy: bool = True,
+                    dtype=np.float32) -> 'System':
+        """
+        Construit un System directement depuis des tableaux NumPy, sans créer
+        d'objet Entity (matérialisés à la demande via `system.entities[i]`).
+        
+        states: (N,) ou (N, D). masses/charges: (N,). velocities: comme states.
+        Avec copy=False, les tableaux déjà contigus dans `dtype` sont partagés.
+        """
+        _compute_dtype(dtype)
+        system = cls.__new__(cls)
+        store = _EntityStore.from_arrays(states, masses, charges, velocities, copy=copy,
+                                         dtype=dtype)
+        system._init(store, force, topology, momentum,
+                     freeze_enabled, freeze_threshold, freeze_stability_steps)
+        return system
+    
+    def _init(self, store: _EntityStore, force, topology, momentum,
+              freeze_enabled, freeze_threshold, freeze_stability_steps):
+        self._store = store
+        # Précision: stockage (float32/float64/float16) et calcul (float16 -> float32)
+        self.dtype = store.dtype
+        self._real = _compute_dtype(store.dtype)
         self.force = force or Force.attraction(0.5)
         self.topology = topology or Topology.small_world()
+        if self.force.kind == 'gravity' and self.topology.kind != 'full':
+            warnings.warn("Force.gravity sans Topology.full(): noyau de consensus "
+                          "(champ Barnes-Hut réservé à Topology.full())")
         self.momentum = momentum
         self.freeze_enabled = freeze_enabled
         self.freeze_threshold = freeze_threshold
         self.freeze_stability_steps = freeze_stability_steps
         self.attractors = []
+        # Champ d'attracteurs: positions triées (recherche binaire dans le noyau)
+        self._attractor_positions = np.empty(0, dtype=self._real)
+        self._attractor_strengths = np.empty(0, dtype=self._real)
         self.observers = []
         self.step_count = 0
+        self.update_count = 0  # mises à jour d'entités (steps synchrones + relax)
+        self._graph = None  # (neighbors, counts) en cache si topologie statique
+        self._dependents = (None, None)  # (graphe, CSR transposé) pour relax()
+        self._weights = None  # poids float32 alignés sur neighbors (None: non pondéré)
+        self._weights_real = (None, None)  # (poids, copie dans le dtype de calcul)
+        self._order = None  # après reorder(): rang d'origine de chaque ligne du stockage
+        self._id_index = None  # Entity.id -> indice local, construit à la demande
+        self._run_lock = threading.Lock()  # sérialise les run_async concurrents
+        self.profiler = None  # StepProfiler optionnel (None: aucune mesure)
+        self._context = None  # NexusContext lié aux tampons courants (voir _bind_context)
+        self._shadow = None  # stockage float16: copies states/velocities en float32 (_widened)
         
         # Compilation
         self.compiler = CompilerManager()
         self._bootstrap()
     
+    @property
+    def entities(self) -> '_EntityList':
+        return _EntityList(self._store)
+    
+    def fork(self) -> 'System':
+        """
+        Copie indépendante quasi gratuite (scénarios "what-if"): topologie,
+        graphe de voisinage, force et bibliothèques natives sont partagés; les
+        tableaux d'état sont copy-on-write, copiés champ par champ à la première
+        écriture (par le fork comme par l'original). Observers et profiler ne
+        sont pas repris.
+        
+        `entity.state[0] = x` reste valide des deux côtés (copie du champ à
+        l'écriture); une vue prise avant le fork reste liée à l'original.
+        """
+        with self._run_lock:
+            fork = System.__new__(System)
+            fork.__dict__.update(self.__dict__)
+            fork._store = self._store.fork()
+        fork.attractors = list(self.attractors)
+        fork.observers = []
+        fork.profiler = None
+        fork._id_index = None
+        fork._run_lock = threading.Lock()
+        fork._context = None
+        fork._shadow = None
+        return fork
+    
+    def index_of(self, entity_id: int) -> int:
+        """Indice local (position dans le stockage) d'une entité par son id."""
+        if self._id_index is None:
+            self._id_index = {int(eid): i for i, eid in enumerate(self._store.ids.tolist())}
+        try:
+            return self._id_index[entity_id]
+        except KeyError:
+            raise KeyError(f"Entité {entity_id} absente du système") from None
+    
     def _bootstrap(self):
-        rust_lib = self.compiler.compile_rust(RUST_SOURCE_SIMPLE)
+        self.rust = _load_rust_kernels(self.compiler, self._real)
+    
+    def step(self):
+        prof = self.profiler
+        if prof is None:
+            self._advance(1)
+            for obs in self.observers:
+                obs._record(self)
+            return
         
-        rust_lib.nexus_step.argtypes = [
-            ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_float),
-            ctypes.POINTER(ctypes.c_uint8), ctypes.POINTER(ctypes.c_int32),
-            ctypes.POINTER(ctypes.c_int32), ctypes.c_size_t,
-            ctypes.c_float, ctypes.c_float
-        ]
+        prof._begin(self.step_count)
+        self._advance(1)
+        t0 = time.perf_counter_ns()
+        for obs in self.observers:
+            obs._record(self)
+        prof._add('observers', time.perf_counter_ns() - t0)
+        prof._end()
+    
+    @contextlib.contextmanager
+    def profile(self, history: int = 1000, callback: Callable[[Dict], None] = None):
+        """
+        Active un StepProfiler le temps du bloc `with`:
+
+            with system.profile() as prof:
+                system.run(100)
+            prof.to_dict()
+        """
+        previous = self.profiler
+        self.profiler = StepProfiler(history=history, callback=callback)
+        try:
+            yield self.profiler
+        finally:
+            self.profiler = previous
+    
+    def _advance(self, steps: int):
+        """
+        Avance de `steps` steps (noyau + gel) en un seul appel natif.
+        ctypes relâche le GIL pendant l'appel: plusieurs Systems peuvent
+        avancer en parallèle depuis des threads différents.
+        """
+        prof = self.profiler
+        if self._uses_gravity():
+            for _ in range(steps):
+                self._gravity_step(prof)
+            self.step_count += steps
+            return
+        
+        store = self._store
+        store.own('states', 'velocities', 'frozen', 'stability')
+        if prof is not None:
+            t0 = time.perf_counter_ns()
+            graph = self._graph
+        neighbors_arr, counts_arr = self._neighbor_graph()
+        if prof is not None:
+            t1 = time.perf_counter_ns()
+            prof._add('neighbors', t1 - t0)
+            if self._graph is not graph:
+                prof._allocated(neighbors_arr.nbytes + counts_arr.nbytes +
+                                (self._weights.nbytes if self._weights is not None else 0))
+            active = store.frozen == 0
+            # Estimation au début de l'appel (le gel évolue pendant un run natif)
+            prof._processed(steps, int(np.count_nonzero(active)), int(counts_arr[active].sum()))
+            t1 = time.perf_counter_ns()  # comptage exclu du marshalling
         
-        rust_lib.nexus_variance.argtypes = [ctypes.POINTER(ctypes.c_float), ctypes.c_size_t]
-        rust_lib.nexus_variance.restype = ctypes.c_float
+        # Le noyau travaille en place sur la dimension 0 (stride = D);
+        # stockage float16: calcul sur des copies float32, réécrites après l'appel
+        widen = store.dtype != self._real
+        states, velocities = self._widened() if widen else (store.states, store.velocities)
+        run = self._bind_context(states, velocities, neighbors_arr, counts_arr, steps)
+        if prof is None:
+            self.update_count += run()
+        else:
+            t2 = time.perf_counter_ns()
+            prof._add('marshal', t2 - t1)
+            self.update_count += run()
+            t1 = time.perf_counter_ns()
+            prof._add('kernel', t1 - t2)
+        if widen:
+            np.copyto(store.states, states)
+            np.copyto(store.velocities, velocities)
+            if prof is not None:
+                prof._add('marshal', time.perf_counter_ns() - t1)
         
-        self.rust = rust_lib
+        self.step_count += steps
     
-    def step(self):
-        n = len(self.entities)
-        
-        states = np.array([e.state[0] if len(e.state) == 1 else e.state[0] 
-                          for e in self.entities], dtype=np.float32)
-        velocities = np.array([e.velocity[0] if len(e.velocity) == 1 else e.velocity[0]
-                              for e in self.entities], dtype=np.float32)
-        frozen = np.array([1 if e.is_frozen else 0 for e in self.entities], dtype=np.uint8)
-        
-        all_neighbors = []
-        neighbor_counts = []
-        
-        for e in self.entities:
-            neighbors = self.topology.get_neighbors(e.id, self.entities)
-            all_neighbors.extend(neighbors)
-            neighbor_counts.append(len(neighbors))
-        
-        neighbors_arr = np.array(all_neighbors, dtype=np.int32)
-        counts_arr = np.array(neighbor_counts, dtype=np.int32)
-        
-        self.rust.nexus_step(
-            states.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
-            velocities.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
-            frozen.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),
-            neighbors_arr.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
-            counts_arr.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
-            n, self.momentum, 0.5
+    def _widened(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Copies float32 persistantes de states/velocities (stockage float16),
+        rafraîchies par np.copyto: ni allocation ni nouveau NexusContext par
+        step. Réallouées seulement si le nombre d'entités change.
+        """
+        store = self._store
+        shadow = self._shadow
+        if shadow is None or shadow[0].shape != store.states.shape:
+            shadow = self._shadow = (np.empty(store.states.shape, dtype=self._real),
+                                     np.empty(store.velocities.shape, dtype=self._real))
+        np.copyto(shadow[0], store.states)
+        np.copyto(shadow[1], store.velocities)
+        return shadow
+    
+    def _bind_context(self, states: np.ndarray, velocities: np.ndarray,
+                      neighbors: np.ndarray, counts: np.ndarray, steps: int) -> Callable[[], int]:
+        """
+        Appel natif sans argument pour `steps` steps: le NexusContext (pointeurs
+        et tailles) n'est reconstruit que si un tampon a changé d'identité
+        (réallocation, copy-on-write, nouveau graphe, attracteurs) ou si un
+        paramètre a changé; sinon le step ne convertit aucun pointeur.
+        """
+        buffers = (states, velocities, self._store.frozen, self._store.stability,
+                   neighbors, counts, self._kernel_weights(),
+                   self._attractor_positions, self._attractor_strengths)
+        params = (self.momentum, self.force.kernel_strength(), bool(self.freeze_enabled),
+                  self.freeze_threshold, self.freeze_stability_steps)
+        bound = self._context
+        if (bound is None or bound[2] != params
+                or not all(map(operator.is_, buffers, bound[1]))):
+            real = ctypes.c_double if self._real == np.float64 else ctypes.c_float
+            ctx = _context_struct(real)(
+                _float_ptr(states), _float_ptr(velocities),
+                self._store.frozen.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),
+                self._store.stability.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+                neighbors.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+                counts.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+                _float_ptr(buffers[6]), len(states), states.shape[1],
+                params[0], params[1],
+                _float_ptr(self._attractor_positions), _float_ptr(self._attractor_strengths),
+                len(self._attractor_positions),
+                int(params[2]), params[3], params[4], steps
+            )
+            # Les tampons référencés par le contexte restent vivants avec lui
+            bound = self._context = (ctx, buffers, params,
+                                     functools.partial(self.rust.nexus_run_context,
+                                                       ctypes.pointer(ctx)))
+        elif bound[0].steps != steps:
+            bound[0].steps = steps
+        return bound[3]
+    
+    def _kernel_weights(self) -> Optional[np.ndarray]:
+        """Poids d'arêtes dans le dtype de calcul (convertis une fois par graphe)."""
+        weights = self._weights
+        if weights is None or weights.dtype == self._real:
+            return weights
+        if self._weights_real[0] is not weights:
+            self._weights_real = (weights, weights.astype(self._real))
+        return self._weights_real[1]
+    
+    def _uses_gravity(self) -> bool:
+        # Gravité tous-contre-tous: champ Barnes-Hut au lieu du noyau de consensus
+        return self.force.kind == 'gravity' and self.topology.kind == 'full'
+    
+    def gravity_field(self, theta: float = None) -> np.ndarray:
+        """
+        Accélérations gravitationnelles N×D (dtype de calcul), Barnes-Hut avec
+        l'angle d'ouverture `theta` (par défaut celui de Force.gravity;
+        0 = somme exacte sur toutes les paires). D <= 3.
+        """
+        store = self._store
+        if store.dim > 3:
+            raise ValueError("Barnes-Hut: états de dimension 1 à 3 uniquement")
+        if theta is None:
+            theta = self.force.params.get('theta', 0.5)
+        G = self.force.params.get('G', 1.0)
+        out = np.empty((store.n, store.dim), dtype=self._real)
+        self.rust.nexus_gravity(
+            _float_ptr(np.ascontiguousarray(store.states, dtype=self._real)),
+            _float_ptr(np.ascontiguousarray(store.masses, dtype=self._real)),
+            store.n, store.dim, store.dim, G, theta,
+            _float_ptr(out)
         )
+        return out
+    
+    def _gravity_step(self, prof: 'StepProfiler' = None):
+        """Même intégration que le noyau (momentum), sur toutes les dimensions."""
+        store = self._store
+        if prof is not None:
+            t0 = time.perf_counter_ns()
+        acc = self.gravity_field()
+        if prof is not None:
+            t1 = time.perf_counter_ns()
+            prof._add('kernel', t1 - t0)
+        store.own('states', 'velocities', 'frozen', 'stability')
+        active = store.frozen == 0
+        self.update_count += int(np.count_nonzero(active))
+        v = self.momentum * store.velocities[active] + (1.0 - self.momentum) * acc[active]
+        store.velocities[active] = v
+        store.states[active] += v
+        if self.freeze_enabled:
+            _freeze_pass(store.frozen, store.velocities, store.stability,
+                         self.freeze_threshold, self.freeze_stability_steps)
+        if prof is not None:
+            prof._add('freeze', time.perf_counter_ns() - t1)
+            n_active = int(np.count_nonzero(active))
+            prof._allocated(acc.nbytes + active.nbytes + 2 * v.nbytes)
+            # Barnes-Hut: interactions approchées, pas d'arêtes explicites
+            prof._processed(1, n_active, 0)
+    
+    def _topology_rows(self) -> Optional[np.ndarray]:
+        """
+        Après reorder(): ligne du stockage de chaque indice vu par la topologie
+        (ordre d'origine, inverse de _order). None sans renumérotation.
+        """
+        if self._order is None:
+            return None
+        rows = np.empty_like(self._order)
+        rows[self._order] = np.arange(len(self._order))
+        return rows
+    
+    def _build_graph(self):
+        rows_of = self._topology_rows()
+        if rows_of is None:
+            neighbors, counts, self._weights = self.topology.build(
+                self._store.states, self.entities, with_weights=True)
+            return neighbors, counts
         
-        for i, e in enumerate(self.entities):
-            if not e.is_frozen:
-                e.state[0] = states[i]
-                e.velocity[0] = velocities[i]
-                
-                if abs(velocities[i]) < self.freeze_threshold:
-                    e.stability_counter += 1
-                    if e.stability_counter >= self.freeze_stability_steps:
-                        e.freeze()
-                else:
-                    e.stability_counter = 0
+        # La topologie construit le graphe dans l'ordre d'origine, renuméroté
+        # ensuite vers les lignes du stockage
+        neighbors, counts, weights = self.topology.build(
+            self._store.states[rows_of], _EntityList(self._store, rows_of), with_weights=True)
+        graph = _csr_from_edges(rows_of[np.repeat(np.arange(len(counts)), counts)],
+                                rows_of[neighbors], len(counts), weights)
+        self._weights = graph[2] if weights is not None else None
+        return graph[:2]
+    
+    def _neighbor_graph(self):
+        if self._graph is None or self.topology.dynamic:
+            self._graph = self._build_graph()
+        return self._graph
+    
+    def rebuild_topology(self):
+        """Invalide le graphe en cache (reconstruit au prochain step)."""
+        self._graph = None
+    
+    def reorder(self, method: str = 'rcm') -> Dict[str, Any]:
+        """
+        Renumérote les entités pour la localité mémoire du noyau: 'rcm'
+        (Reverse Cuthill-McKee sur le graphe) ou 'morton' (courbe de Morton
+        sur les états, topologies spatiales). Stockage SoA et graphe CSR sont
+        permutés une fois; get_states() conserve l'ordre d'origine.
         
-        self.step_count += 1
+        La topologie est conservée: elle voit toujours les entités dans l'ordre
+        d'origine (reconstructions et add_entities renumérotés via _order).
+        Retourne la largeur de bande (max |i - j|) et l'écart moyen avant/après.
+        """
+        if self.topology.dynamic:
+            raise ValueError("reorder: topologie dynamique non supportée")
+        neighbors, counts = self._neighbor_graph()
+        if method == 'rcm':
+            perm = _rcm_order(neighbors, counts)
+        elif method == 'morton':
+            perm = _morton_order(self._store.states)
+        else:
+            raise ValueError(f"reorder: méthode inconnue '{method}' (rcm, morton)")
         
-        for obs in self.observers:
-            obs._record(self)
+        report = {'method': method}
+        report['bandwidth_before'], report['mean_span_before'] = _bandwidth(neighbors, counts)
+        
+        n = self._store.n
+        inverse = np.empty(n, dtype=np.int64)
+        inverse[perm] = np.arange(n)
+        rows = inverse[np.repeat(np.arange(n), counts)]
+        graph = _csr_from_edges(rows, inverse[neighbors], n, self._weights)
+        
+        self._store.permute(perm)
+        self._graph = graph[:2]
+        if self._weights is not None:
+            self._weights = graph[2]
+        order = np.arange(n, dtype=np.int64) if self._order is None else self._order
+        self._order = order[perm]
+        self._id_index = None
+        
+        report['bandwidth_after'], report['mean_span_after'] = _bandwidth(*self._graph)
+        return report
+    
+    # --------------------------------------------------------
+    # Ajout / retrait dynamique
+    # --------------------------------------------------------
+    
+    def add_entities(self, entities: List[Entity] = None, states=None,
+                     masses=None, charges=None, velocities=None) -> np.ndarray:
+        """
+        Ajoute des entités (objets Entity ou tableaux, comme from_arrays) en
+        fin de stockage. Le graphe en cache est complété: voisins des nouvelles
+        entités via la topologie, plus les arêtes retour vers elles. Pour les
+        topologies non incrémentales (ring, grid_2d, small_world), il est
+        reconstruit au prochain step.
+        
+        Retourne les indices locaux des entités ajoutées.
+        """
+        if entities is not None:
+            added = _EntityStore.from_entities(list(entities), self.dtype)
+        else:
+            added = _EntityStore.from_arrays(states, masses, charges, velocities, dtype=self.dtype)
+        
+        store = self._store
+        start = store.n
+        store.append(added)
+        new_indices = np.arange(start, store.n)
+        
+        if self._id_index is not None:
+            for i, eid in zip(new_indices.tolist(), added.ids.tolist()):
+                self._id_index[int(eid)] = i
+        
+        if self._order is not None:
+            self._order = np.concatenate((self._order, np.arange(start, store.n)))
+        if self._graph is not None and not self.topology.dynamic:
+            if self.topology.incremental:
+                self._patch_graph_add(start)
+            else:
+                self._graph = None  # arêtes existantes dépendantes de N: reconstruction
+        return new_indices
+    
+    def remove_entities(self, indices) -> np.ndarray:
+        """
+        Retire des entités (indices locaux ou objets Entity) par swap-remove:
+        les dernières entités prennent la place des trous, les arêtes vers
+        les entités retirées sont supprimées du graphe en cache.
+        
+        Retourne remap: ancien indice -> nouvel indice (-1 si retiré).
+        """
+        indices = [self.index_of(i.id) if isinstance(i, Entity) else int(i)
+                   for i in indices]
+        remap = self._store.swap_remove(indices)
+        self._id_index = None
+        if self._order is not None:
+            # Rangs d'origine des survivants, renumérotés 0..n-1
+            kept = np.empty(self._store.n, dtype=np.int64)
+            kept[remap[remap >= 0]] = self._order[remap >= 0]
+            self._order = np.argsort(np.argsort(kept, kind='stable'), kind='stable')
+        
+        if self._graph is not None and not self.topology.dynamic:
+            self._patch_graph_remove(remap)
+        else:
+            self._graph = None
+        return remap
+    
+    def update_states(self, indices, values, hops: int = 1,
+                      reset_velocity: bool = True) -> np.ndarray:
+        """
+        Injecte des mesures externes: écrit `values` dans les états des
+        entités `indices` (locaux), les dégèle et dégèle aussi les entités
+        situées à <= `hops` sauts qui en dépendent (celles qui les ont pour
+        voisin, via le graphe en cache). Les autres restent gelées: le
+        système ne reconverge que localement.
+        
+        values: (k,) -> dimension 0, ou (k, D). reset_velocity remet à zéro
+        la vitesse des entités écrites. Retourne les indices réactivés.
+        """
+        store = self._store
+        indices = np.asarray(indices, dtype=np.int64).ravel()
+        if indices.size and (indices.min() < 0 or indices.max() >= store.n):
+            raise IndexError("update_states: index d'entité hors limites")
+        values = np.asarray(values)
+        if values.ndim == 1 and store.dim > 1:
+            values = values[:, None]  # dimension 0 uniquement
+        
+        store.own('states', 'velocities', 'frozen', 'stability')
+        if values.ndim == 2 and values.shape[1] == 1:
+            store.states[indices, 0] = values[:, 0]
+        else:
+            store.states[indices] = values.reshape(len(indices), store.dim)
+        if reset_velocity:
+            store.velocities[indices] = 0.0
+        
+        touched = np.zeros(store.n, dtype=bool)
+        touched[indices] = True
+        if hops > 0 and not self._uses_gravity():
+            neighbors, counts = self._neighbor_graph()
+            rows = np.repeat(np.arange(store.n), counts)
+            frontier = touched.copy()
+            for _ in range(hops):
+                # Entités dont un voisin vient d'être touché
+                dependents = np.zeros(store.n, dtype=bool)
+                dependents[rows[frontier[neighbors]]] = True
+                frontier = dependents & ~touched
+                if not frontier.any():
+                    break
+                touched |= frontier
+        
+        reactivated = np.flatnonzero(touched)
+        store.frozen[reactivated] = 0
+        store.stability[reactivated] = 0
+        return reactivated
+    
+    def _patch_graph_add(self, start: int):
+        neighbors, counts = self._graph
+        n = self._store.n
+        # Ajouts en fin de stockage: indice de topologie = ligne pour eux
+        rows_of = self._topology_rows()
+        entities = self.entities if rows_of is None else _EntityList(self._store, rows_of)
+        
+        new_neighbors = []
+        new_counts = np.empty(n - start, dtype=np.int64)
+        for k, i in enumerate(range(start, n)):
+            row = self.topology.get_neighbors(i, entities)
+            new_neighbors.extend(row)
+            new_counts[k] = len(row)
+        new_neighbors = np.asarray(new_neighbors, dtype=np.int64)
+        if new_neighbors.size and (new_neighbors.min() < 0 or new_neighbors.max() >= n):
+            raise ValueError(f"Topologie: indice de voisin hors de [0, {n})")
+        if rows_of is not None:
+            new_neighbors = rows_of[new_neighbors]
+        new_rows = np.repeat(np.arange(start, n), new_counts)
+        
+        # Arêtes retour: chaque entité existante voisine d'un ajout le voit aussi
+        back = new_neighbors < start
+        rows = np.concatenate((np.repeat(np.arange(start), counts), new_rows, new_neighbors[back]))
+        cols = np.concatenate((neighbors, new_neighbors, new_rows[back]))
+        weights = None
+        if self._weights is not None and self.topology.weight is None:
+            # Poids fixes (builder): nouvelles arêtes à 1
+            weights = np.concatenate((self._weights, np.ones(len(rows) - len(neighbors),
+                                                             dtype=np.float32)))
+        self._set_patched_graph(rows, cols, weights)
+    
+    def _patch_graph_remove(self, remap: np.ndarray):
+        neighbors, counts = self._graph
+        rows = remap[np.repeat(np.arange(len(counts)), counts)]
+        cols = remap[neighbors]
+        keep = (rows >= 0) & (cols >= 0)
+        weights = None if self._weights is None else self._weights[keep]
+        self._set_patched_graph(rows[keep], cols[keep], weights)
+    
+    def _set_patched_graph(self, rows: np.ndarray, cols: np.ndarray, weights: np.ndarray):
+        graph = _csr_from_edges(rows, cols, self._store.n, weights)
+        self._graph = neighbors, counts = graph[:2]
+        weights = graph[2] if weights is not None else None
+        if self.topology.weight is not None:
+            weights = self.topology.weight(self._store.states,
+                                           np.repeat(np.arange(len(counts)), counts), neighbors)
+            weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self._weights = weights
     
     def run(self, steps: int = 100):
-        for _ in range(steps):
-            self.step()
+        # Sans observateur ni topologie dynamique, toute la boucle reste native
+        if self.observers or self.topology.dynamic:
+            for _ in range(steps):
+                self.step()
+        elif steps > 0:
+            prof = self.profiler
+            if prof is not None:
+                prof._begin(self.step_count)
+            self._advance(steps)
+            if prof is not None:
+                prof._end()
+    
+    def run_async(self, steps: int = 100, executor: Executor = None) -> Future:
+        """
+        Lance run(steps) dans un thread (pool partagé par défaut) et retourne
+        un concurrent.futures.Future. Le GIL est relâché pendant le calcul
+        natif; les runs d'un même System sont sérialisés.
+        """
+        def task():
+            self._run_locked(steps)
+            return self
+        return (executor or _thread_pool()).submit(task)
+    
+    def _run_locked(self, steps: int):
+        with self._run_lock:
+            self.run(steps)
+    
+    async def astep(self, executor: Executor = None):
+        """step() sans bloquer la boucle asyncio (exécuté dans un thread)."""
+        await self._offload(1, executor)
+    
+    async def astream(self, steps: int, every: int = 1, executor: Executor = None):
+        """
+        Générateur asynchrone: avance par blocs de `every` steps (dans un
+        thread) et produit après chaque bloc une vue N×D en lecture seule
+        des états, sans copie. La vue reflète l'état courant: la copier
+        pour la conserver au-delà de l'itération suivante.
+        """
+        if every < 1:
+            raise ValueError("every doit être >= 1")
+        done = 0
+        while done < steps:
+            chunk = min(every, steps - done)
+            await self._offload(chunk, executor)
+            done += chunk
+            yield self.states_view()
+    
+    async def _offload(self, steps: int, executor: Executor = None):
+        loop = asyncio.get_running_loop()
+        fut = loop.run_in_executor(executor or _thread_pool(), self._run_locked, steps)
+        try:
+            await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            # Le bloc en cours se termine avant de rendre la main: l'état
+            # n'est jamais modifié après l'annulation
+            await asyncio.wait([fut])
+            raise
+    
+    def states_view(self) -> np.ndarray:
+        """Vue N×D (dtype de stockage, lecture seule, sans copie) des états."""
+        view = self._store.states.view()
+        view.flags.writeable = False
+        return view
+    
+    def pairwise_distances(self, indices=None, squared: bool = False) -> np.ndarray:
+        """Distances entre les états (indices locaux, toutes les entités par défaut)."""
+        states = self._store.states
+        return pairwise_distances(states if indices is None else states[np.asarray(indices)],
+                                  squared=squared)
+    
+    def knn_query(self, k: int, queries=None):
+        """`knn_query` sur les états: (indices locaux, distances), Q×k."""
+        return knn_query(self._store.states, k, queries)
+    
+    def radius_query(self, r: float, queries=None, return_distances: bool = False):
+        """`radius_query` sur les états: CSR (neighbors, counts) en indices locaux."""
+        return radius_query(self._store.states, r, queries, return_distances)
+    
+    def run_sharded(self, steps: int = 100, workers: int = None):
+        """Exécute `steps` steps répartis sur `workers` processus (voir ShardedExecutor)."""
+        with ShardedExecutor(self, workers) as executor:
+            executor.run(steps)
     
     def run_until_stable(self, max_steps: int = 1000, threshold: float = 0.1):
         for _ in range(max_steps):
@@ -617,72 +3255,1219 @@ class System:
             if self.variance() < threshold:
                 break
     
+    def solve_consensus(self, tol: float = 1e-6, max_iter: int = 1000) -> Dict[str, Any]:
+        """
+        Calcule directement le point fixe du noyau de consensus (dimension 0)
+        sur le graphe en cache: système linéaire du Laplacien pondéré, les
+        entités gelées servant de conditions aux limites, résolu par gradient
+        conjugué préconditionné (graphe symétrique) ou BiCGSTAB (sinon).
+        
+        Attracteurs: l'attracteur le plus proche est figé, le système résolu,
+        puis les affectations recalculées jusqu'à stabilité. Une composante
+        sans entité gelée ni attracteur converge vers la valeur conservée par
+        la dynamique (graphe symétrique uniquement).
+        
+        Les entités libres prennent la valeur du point fixe (vitesse nulle).
+        Retourne {'method', 'iterations' (produits matrice-vecteur), 'residual'}.
+        """
+        if self.topology.dynamic:
+            raise ValueError("solve_consensus: topologie dynamique non supportée")
+        store = self._store
+        n = store.n
+        neighbors, counts = self._neighbor_graph()
+        rows = np.repeat(np.arange(n), counts)
+        cols = neighbors.astype(np.int64)
+        w = np.ones(len(cols)) if self._weights is None else self._weights.astype(np.float64)
+        strength = self.force.kernel_strength()
+        symmetric = _is_symmetric(rows, cols, w)
+        method = 'cg' if symmetric else 'bicgstab'
+        
+        x = store.states[:, 0].astype(np.float64)
+        fixed = store.frozen != 0
+        has_attractors = len(self._attractor_positions) > 0
+        # Échelle des lignes: cnt_i / strength (Laplacien symétrique si w l'est)
+        scale = np.where(counts > 0, counts / strength, 1.0)
+        wdeg = np.bincount(rows, w, minlength=n)
+        
+        # Composantes sans ancrage: valeur conservée Σ cnt·(x + m/(1-m)·v) / Σ cnt
+        if not has_attractors:
+            labels = _connected_components(n, rows, cols)
+            anchored = np.zeros(labels.max() + 1 if n else 0, dtype=bool)
+            anchored[labels[fixed]] = True
+            floating = ~anchored[labels] & (counts > 0)
+            if floating.any():
+                if not symmetric:
+                    raise ValueError("solve_consensus: composante sans entité gelée "
+                                     "ni attracteur sur un graphe non symétrique")
+                m = self.momentum
+                mass = counts[floating].astype(np.float64)
+                value = x[floating] + m / (1.0 - m) * store.velocities[floating, 0]
+                total = np.bincount(labels[floating], mass * value, minlength=len(anchored))
+                weight = np.bincount(labels[floating], mass, minlength=len(anchored))
+                x[floating] = total[labels[floating]] / weight[labels[floating]]
+                fixed = fixed | floating
+        
+        iterations, residual = 0, 0.0
+        assignment = None
+        for _ in range(50):
+            gamma = np.zeros(n)
+            target = np.zeros(n)
+            if has_attractors:
+                k = _nearest_attractor(self._attractor_positions, x)
+                if assignment is not None and np.array_equal(k, assignment):
+                    break
+                assignment = k
+                gamma = self._attractor_strengths[k].astype(np.float64) * scale
+                target = self._attractor_positions[k].astype(np.float64)
+            
+            # Entité libre sans voisin ni attracteur: immobile
+            unknown = np.flatnonzero(~fixed & ((counts > 0) | (gamma > 0)))
+            if len(unknown) == 0:
+                break
+            diag = wdeg + gamma
+            
+            def matvec(y):
+                full = np.zeros(n)
+                full[unknown] = y
+                return (diag * full - np.bincount(rows, w * full[cols], minlength=n))[unknown]
+            
+            known = x.copy()
+            known[unknown] = 0.0
+            b = (gamma * target + np.bincount(rows, w * known[cols], minlength=n))[unknown]
+            solver = _pcg if symmetric else _bicgstab
+            x[unknown], its, residual = solver(matvec, b, diag[unknown], x[unknown], tol, max_iter)
+            iterations += its
+            if not has_attractors:
+                break
+        
+        free = store.frozen == 0
+        store.own('states', 'velocities')
+        store.states[free, 0] = x[free]
+        store.velocities[free, 0] = 0.0
+        return {'method': method, 'iterations': iterations, 'residual': float(residual)}
+    
+    def relax(self, tol: float = 1e-3, max_updates: int = None,
+              schedule: str = 'priority') -> Dict[str, Any]:
+        """
+        Ordonnanceur asynchrone (Gauss-Seidel) piloté par les résidus, en
+        alternative aux steps synchrones: les entités non gelées sont mises à
+        jour une à une vers leur équilibre local (voisins fixés), et seules
+        celles qui dépendent d'une entité modifiée sont réévaluées.
+        
+        schedule: 'priority' (plus grand résidu d'abord) ou 'worklist' (FIFO
+        des résidus > tol). S'arrête quand tous les résidus sont <= tol ou
+        après max_updates mises à jour (défaut: 1000·N). Même point fixe que
+        le consensus synchrone (entités gelées fixes); dimension 0 uniquement.
+        
+        Retourne {'schedule', 'updates', 'residual', 'converged'};
+        `update_count` cumule les mises à jour des deux ordonnanceurs.
+        """
+        modes = {'priority': 0, 'worklist': 1}
+        if schedule not in modes:
+            raise ValueError(f"relax: ordonnancement inconnu '{schedule}' (priority, worklist)")
+        if self._uses_gravity():
+            raise ValueError("relax: non applicable à la gravité Barnes-Hut")
+        store = self._store
+        store.own('states', 'velocities')
+        neighbors, counts = self._neighbor_graph()
+        dependents, dependent_counts = self._dependent_graph()
+        
+        widen = store.dtype != self._real
+        states, velocities = self._widened() if widen else (store.states, store.velocities)
+        residual = np.zeros(1, dtype=self._real)
+        max_updates = 1000 * store.n if max_updates is None else max_updates
+        updates = self.rust.nexus_relax(
+            _float_ptr(states),
+            _float_ptr(velocities),
+            store.frozen.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),
+            neighbors.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+            counts.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+            _float_ptr(self._kernel_weights()),
+            dependents.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+            dependent_counts.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+            store.n, store.dim, self.force.kernel_strength(),
+            _float_ptr(self._attractor_positions),
+            _float_ptr(self._attractor_strengths),
+            len(self._attractor_positions),
+            tol, max_updates, modes[schedule], _float_ptr(residual)
+        )
+        if widen:
+            np.copyto(store.states, states)
+            np.copyto(store.velocities, velocities)
+        
+        self.update_count += updates
+        return {'schedule': schedule, 'updates': int(updates),
+                'residual': float(residual[0]), 'converged': bool(residual[0] <= tol)}
+    
+    def _dependent_graph(self):
+        """CSR transposé du graphe: pour chaque entité, celles qui l'ont pour voisin."""
+        graph = self._neighbor_graph()
+        if self._dependents[0] is not graph:
+            neighbors, counts = graph
+            rows = np.repeat(np.arange(len(counts)), counts)
+            self._dependents = (graph, _csr_from_edges(neighbors.astype(np.int64), rows,
+                                                       len(counts)))
+        return self._dependents[1]
+    
     def variance(self) -> float:
-        states = np.array([e.state[0] for e in self.entities], dtype=np.float32)
+        store = self._store
         return float(self.rust.nexus_variance(
-            states.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
-            len(states)
+            _float_ptr(np.ascontiguousarray(store.states, dtype=self._real)),
+            store.n, store.dim
         ))
     
     def frozen_ratio(self) -> float:
-        return sum(1 for e in self.entities if e.is_frozen) / len(self.entities)
+        return float(np.count_nonzero(self._store.frozen)) / self._store.n
     
     def get_states(self) -> List[float]:
-        return [float(e.state[0]) for e in self.entities]
-    
+        states = self._store.states[:, 0]
+        if self._order is not None:
+            # Ordre d'origine (avant reorder)
+            ordered = np.empty_like(states)
+            ordered[self._order] = states
+            states = ordered
+        return states.tolist()
+
+    def _arrays(self):
+        """Retourne (states N×D, velocities N×D, frozen N) dans le dtype de stockage/uint8 (vues)."""
+        store = self._store
+        return store.states, store.velocities, store.frozen
+
     def attach_observer(self, observer: 'Observer'):
         self.observers.append(observer)
+    
+    def add_attractor(self, attractor: 'Attractor'):
+        """Ajoute un attracteur: chaque entité est tirée vers le plus proche."""
+        self.attractors.append(attractor)
+        self._insert_attractors([attractor.position], [attractor.strength])
+    
+    def add_attractors(self, positions, strengths=0.3):
+        """Ajout en masse (tableaux), sans créer d'objet Attractor."""
+        positions = np.asarray(positions, dtype=self._real).ravel()
+        strengths = np.broadcast_to(np.asarray(strengths, dtype=self._real), positions.shape)
+        self._insert_attractors(positions, strengths)
+    
+    def clear_attractors(self):
+        self.attractors = []
+        self._attractor_positions = np.empty(0, dtype=self._real)
+        self._attractor_strengths = np.empty(0, dtype=self._real)
+    
+    def _insert_attractors(self, positions, strengths):
+        positions = np.concatenate((self._attractor_positions,
+                                    np.asarray(positions, dtype=self._real)))
+        strengths = np.concatenate((self._attractor_strengths,
+                                    np.asarray(strengths, dtype=self._real)))
+        order = np.argsort(positions, kind='stable')
+        self._attractor_positions = np.ascontiguousarray(positions[order])
+        self._attractor_strengths = np.ascontiguousarray(strengths[order])
+    
+    # --------------------------------------------------------
+    # Checkpoint
+    # --------------------------------------------------------
+    
+    def save_checkpoint(self, path: Union[str, Path]):
+        """
+        Sauvegarde l'état complet dans un fichier binaire:
+        magic + header JSON + tableaux bruts alignés (memory-mappables).
+        """
+        import random
+        
+        store = self._store
+        neighbors, counts = self._neighbor_graph()
+        py_rng = random.getstate()
+        np_rng = np.random.get_state()
+        
+        arrays = {
+            'states': store.states,
+            'velocities': store.velocities,
+            'frozen': store.frozen,
+            'stability': store.stability,
+            'masses': store.masses,
+            'charges': store.charges,
+            'neighbors': neighbors,
+            'counts': counts,
+            'weights': self._weights if self._weights is not None else np.empty(0, np.float32),
+            'order': self._order if self._order is not None else np.empty(0, np.int64),
+            'np_rng_key': np.asarray(np_rng[1], dtype=np.uint32),
+            'attractor_positions': self._attractor_positions,
+            'attractor_strengths': self._attractor_strengths,
+        }
+        properties = store.properties
+        
+        header = {
+            'version': CHECKPOINT_VERSION,
+            'step_count': self.step_count,
+            'momentum': self.momentum,
+            'freeze_enabled': self.freeze_enabled,
+            'freeze_threshold': self.freeze_threshold,
+            'freeze_stability_steps': self.freeze_stability_steps,
+            'py_rng': [py_rng[0], list(py_rng[1]), py_rng[2]],
+            'np_rng': [np_rng[0], int(np_rng[2]), int(np_rng[3]), float(np_rng[4])],
+            'properties': properties if properties and any(properties) else None,
+            # Objets Attractor de add_attractor(); le champ complet est dans les tableaux
+            'attractors': [[float(a.position), float(a.strength)] for a in self.attractors],
+            'arrays': {},
+        }
+        
+        # Offsets relatifs au début des données (aligné après le header)
+        offset = 0
+        for name, arr in arrays.items():
+            header['arrays'][name] = {'dtype': arr.dtype.str, 'shape': list(arr.shape),
+                                      'offset': offset}
+            offset += _align(arr.nbytes)
+        
+        header_bytes = json.dumps(header).encode()
+        data_start = _align(len(CHECKPOINT_MAGIC) + 8 + len(header_bytes))
+        
+        with open(path, 'wb') as f:
+            f.write(CHECKPOINT_MAGIC)
+            f.write(np.uint64(len(header_bytes)).tobytes())
+            f.write(header_bytes)
+            for name, arr in arrays.items():
+                f.seek(data_start + header['arrays'][name]['offset'])
+                f.write(np.ascontiguousarray(arr).tobytes())
+            f.truncate(data_start + offset)
+    
+    @classmethod
+    def load_checkpoint(cls, path: Union[str, Path], force: Force = None,
+                        topology: Topology = None, restore_rng: bool = True) -> 'System':
+        """
+        Restaure un System sauvegardé par save_checkpoint(). Les tableaux sont
+        memory-mappés (copy-on-write): le fichier n'est jamais modifié.
+        
+        Le graphe de voisinage sauvegardé est réutilisé tel quel; sans
+        `topology`, il devient la topologie du System restauré.
+        """
+        import random
+        
+        header, arrays = _read_checkpoint(path)
+        if header['version'] != CHECKPOINT_VERSION:
+            raise ValueError(f"Version de checkpoint non supportée: {header['version']}")
+        
+        # Aucun objet Entity: les tableaux memory-mappés deviennent le stockage
+        store = _EntityStore.from_arrays(
+            arrays['states'], arrays['masses'], arrays['charges'], arrays['velocities'],
+            frozen=arrays['frozen'], stability=arrays['stability'],
+            properties=header['properties'], copy=False, dtype=arrays['states'].dtype,
+        )
+        graph = (np.array(arrays['neighbors']), np.array(arrays['counts']))
+        # Tableau de poids vide: graphe non pondéré
+        weights = np.array(arrays['weights']) if len(arrays.get('weights', ())) else None
+        system = cls.__new__(cls)
+        system._init(
+            store,
+            force=force,
+            topology=topology or Topology.from_graph(*graph, weights=weights),
+            momentum=header['momentum'],
+            freeze_enabled=header['freeze_enabled'],
+            freeze_threshold=header['freeze_threshold'],
+            freeze_stability_steps=header['freeze_stability_steps'],
+        )
+        system.step_count = header['step_count']
+        system._graph = graph
+        system._weights = weights
+        if len(arrays.get('order', ())):
+            system._order = np.array(arrays['order'])
+        if 'attractor_positions' in arrays:
+            system._insert_attractors(arrays['attractor_positions'],
+                                      arrays['attractor_strengths'])
+        system.attractors = [Attractor(position, strength)
+                             for position, strength in header.get('attractors', ())]
+        
+        if restore_rng:
+            version, internal, gauss = header['py_rng']
+            random.setstate((version, tuple(internal), gauss))
+            name, pos, has_gauss, cached = header['np_rng']
+            np.random.set_state((name, np.array(arrays['np_rng_key']), pos, has_gauss, cached))
+        
+        return system
+
+_THREAD_POOL = None
+_THREAD_POOL_LOCK = threading.Lock()
+
+def _thread_pool() -> ThreadPoolExecutor:
+    """Pool de threads partagé par System.run_async (créé à la demande)."""
+    global _THREAD_POOL
+    with _THREAD_POOL_LOCK:
+        if _THREAD_POOL is None:
+            _THREAD_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                              thread_name_prefix='nexus-stellar')
+        return _THREAD_POOL
+
+def _freeze_pass(frozen: np.ndarray, velocities: np.ndarray, stability: np.ndarray,
+                 threshold, stability_steps, enabled: np.ndarray = None):
+    """
+    Gel vectorisé (en place): une entité active dont |v0| < threshold pendant
+    `stability_steps` steps consécutifs est gelée. threshold/stability_steps
+    peuvent être des scalaires ou des tableaux par entité.
+    """
+    active = frozen == 0
+    if enabled is not None:
+        active &= enabled
+    stable = active & (np.abs(velocities[:, 0]) < threshold)
+    
+    stability[stable] += 1
+    stability[active & ~stable] = 0
+    
+    to_freeze = stable & (stability >= stability_steps)
+    if to_freeze.any():
+        frozen[to_freeze] = 1
+        velocities[to_freeze] = 0.0
+
+def _is_symmetric(rows: np.ndarray, cols: np.ndarray, weights: np.ndarray) -> bool:
+    """Vrai si chaque arête (i, j, w) a sa réciproque (j, i, w)."""
+    forward = np.lexsort((weights, cols, rows))
+    backward = np.lexsort((weights, rows, cols))
+    return (np.array_equal(rows[forward], cols[backward])
+            and np.array_equal(cols[forward], rows[backward])
+            and np.array_equal(weights[forward], weights[backward]))
+
+def _connected_components(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Étiquettes de composantes faiblement connexes (accrochage + sauts de pointeurs)."""
+    labels = np.arange(n)
+    while True:
+        previous = labels.copy()
+        lr, lc = labels[rows], labels[cols]
+        np.minimum.at(labels, lr, lc)
+        np.minimum.at(labels, lc, lr)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, previous):
+            return labels
+
+def _nearest_attractor(positions: np.ndarray, states: np.ndarray) -> np.ndarray:
+    """Indice de l'attracteur le plus proche (même règle que le noyau natif)."""
+    idx = np.searchsorted(positions, states, side='left')
+    lower = np.clip(idx - 1, 0, len(positions) - 1)
+    upper = np.clip(idx, 0, len(positions) - 1)
+    take_lower = (idx == len(positions)) | (
+        (idx > 0) & (states - positions[lower] <= positions[upper] - states))
+    return np.where(take_lower, lower, upper)
+
+def _pcg(matvec: Callable, b: np.ndarray, diag: np.ndarray, x: np.ndarray,
+         tol: float, max_iter: int):
+    """Gradient conjugué préconditionné (Jacobi). Retourne (x, itérations, résidu relatif)."""
+    norm_b = np.linalg.norm(b) or 1.0
+    r = b - matvec(x)
+    z = r / diag
+    p = z.copy()
+    rz = r @ z
+    for it in range(1, max_iter + 1):
+        if np.linalg.norm(r) <= tol * norm_b:
+            return x, it - 1, np.linalg.norm(r) / norm_b
+        ap = matvec(p)
+        alpha = rz / (p @ ap)
+        x = x + alpha * p
+        r = r - alpha * ap
+        z = r / diag
+        rz, rz_old = r @ z, rz
+        p = z + (rz / rz_old) * p
+    return x, max_iter, np.linalg.norm(r) / norm_b
+
+def _bicgstab(matvec: Callable, b: np.ndarray, diag: np.ndarray, x: np.ndarray,
+              tol: float, max_iter: int):
+    """BiCGSTAB préconditionné (Jacobi) pour les graphes non symétriques."""
+    norm_b = np.linalg.norm(b) or 1.0
+    r = b - matvec(x)
+    r0 = r.copy()
+    rho = alpha = omega = 1.0
+    v = p = np.zeros_like(b)
+    for it in range(1, max_iter + 1):
+        if np.linalg.norm(r) <= tol * norm_b:
+            return x, it - 1, np.linalg.norm(r) / norm_b
+        rho, rho_old = r0 @ r, rho
+        if rho == 0.0:
+            break
+        p = r + (rho / rho_old) * (alpha / omega) * (p - omega * v)
+        ph = p / diag
+        v = matvec(ph)
+        alpha = rho / (r0 @ v)
+        s = r - alpha * v
+        sh = s / diag
+        t = matvec(sh)
+        omega = (t @ s) / (t @ t) if t @ t > 0 else 0.0
+        x = x + alpha * ph + omega * sh
+        r = s - omega * t
+        if omega == 0.0:
+            break
+    return x, max_iter, np.linalg.norm(r) / norm_b
+
+def _bandwidth(neighbors: np.ndarray, counts: np.ndarray):
+    """(max |i - j|, moyenne |i - j|) sur les arêtes du graphe."""
+    if len(neighbors) == 0:
+        return 0, 0.0
+    span = np.abs(np.repeat(np.arange(len(counts)), counts) - neighbors)
+    return int(span.max()), float(span.mean())
+
+def _rcm_order(neighbors: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Permutation Reverse Cuthill-McKee (perm[nouveau] = ancien). BFS par
+    niveaux vectorisé: chaque niveau reçoit les voisins non visités du
+    niveau précédent, dans l'ordre des parents puis par degré croissant.
+    Graphe symétrisé; chaque composante part d'un sommet de degré minimal.
+    """
+    n = len(counts)
+    rows = np.repeat(np.arange(n), counts)
+    rows, cols = np.concatenate((rows, neighbors)), np.concatenate((neighbors, rows))
+    keep = rows != cols
+    adj, deg = _csr_from_edges(rows[keep], cols[keep], n)
+    offsets = np.concatenate(([0], np.cumsum(deg, dtype=np.int64)))
+    
+    visited = np.zeros(n, dtype=bool)
+    order = []
+    isolated = np.flatnonzero(deg == 0)
+    visited[isolated] = True
+    by_degree = np.argsort(deg, kind='stable')
+    cursor = 0
+    while True:
+        while cursor < n and visited[by_degree[cursor]]:
+            cursor += 1
+        if cursor == n:
+            break
+        level = by_degree[cursor:cursor + 1]
+        visited[level] = True
+        while len(level):
+            order.append(level)
+            sizes = deg[level]
+            starts = np.repeat(offsets[level] - np.cumsum(sizes) + sizes, sizes)
+            children = adj[starts + np.arange(int(sizes.sum()))].astype(np.int64)
+            parent_rank = np.repeat(np.arange(len(level)), sizes)
+            children_sorted = children[np.lexsort((deg[children], parent_rank))]
+            children_sorted = children_sorted[~visited[children_sorted]]
+            _, first = np.unique(children_sorted, return_index=True)
+            level = children_sorted[np.sort(first)]
+            visited[level] = True
+    order.append(isolated)
+    return np.concatenate(order)[::-1].copy()
+
+def _morton_order(states: np.ndarray) -> np.ndarray:
+    """Permutation selon la courbe de Morton (Z-order) des 3 premières dimensions."""
+    grid = np.asarray(states, dtype=np.float64)[:, :3]
+    lo, span = grid.min(axis=0), np.ptp(grid, axis=0)
+    span[span == 0] = 1.0
+    bits = 63 // grid.shape[1]
+    cells = ((grid - lo) / span * ((1 << bits) - 1)).astype(np.uint64)
+    codes = np.zeros(len(grid), dtype=np.uint64)
+    for b in range(bits):
+        for d in range(grid.shape[1]):
+            bit = (cells[:, d] >> np.uint64(b)) & np.uint64(1)
+            codes |= bit << np.uint64(b * grid.shape[1] + d)
+    return np.argsort(codes, kind='stable')
+
+def _csr_from_edges(rows: np.ndarray, cols: np.ndarray, n: int, weights: np.ndarray = None):
+    """
+    (neighbors, counts) int32 [+ poids réordonnés] à partir d'arêtes; ordre
+    conservé par ligne.
+    """
+    order = np.argsort(rows, kind='stable')
+    graph = (np.ascontiguousarray(cols[order], dtype=np.int32),
+             np.bincount(rows, minlength=n).astype(np.int32))
+    if weights is None:
+        return graph
+    return graph + (np.ascontiguousarray(weights[order], dtype=np.float32),)
+
+# ============================================================
+# CHECKPOINT FORMAT
+# ============================================================
+
+CHECKPOINT_MAGIC = b"NEXUSCKP"
+CHECKPOINT_VERSION = 1
+CHECKPOINT_ALIGN = 64
+
+def _align(n: int) -> int:
+    return (n + CHECKPOINT_ALIGN - 1) // CHECKPOINT_ALIGN * CHECKPOINT_ALIGN
+
+def _read_checkpoint(path: Union[str, Path]):
+    """Lit le header et memory-mappe les tableaux (mode copy-on-write)."""
+    with open(path, 'rb') as f:
+        if f.read(len(CHECKPOINT_MAGIC)) != CHECKPOINT_MAGIC:
+            raise ValueError(f"{path} n'est pas un checkpoint Nexus-Stellar")
+        header_len = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(header_len))
+    
+    data_start = _align(len(CHECKPOINT_MAGIC) + 8 + header_len)
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        shape = tuple(spec['shape'])
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.empty(shape, dtype=spec['dtype'])
+            continue
+        arrays[name] = np.memmap(path, dtype=spec['dtype'], mode='c',
+                                 offset=data_start + spec['offset'], shape=shape)
+    return header, arrays
+
+# ============================================================
+# SYSTEM BATCH
+# ============================================================
+
+class SystemBatch:
+    """
+    Regroupe des Systems indépendants dans un seul stockage SoA concaténé et
+    les fait avancer en un appel natif par step (un bloc par système).
+    
+    Après construction, le stockage de chaque System est une vue sur le
+    stockage du batch: `system.get_states()` reste à jour sans copie. Les
+    topologies dynamiques et l'ajout/retrait d'entités ne sont pas supportés
+    pendant le batch. Les systèmes à gravité Barnes-Hut sont exclus de l'appel
+    natif et avancés par leur propre champ (System._gravity_step).
+    """
+    
+    def __init__(self, systems: List[System]):
+        if not systems:
+            raise ValueError("SystemBatch: au moins un System requis")
+        self.systems = list(systems)
+        stores = [system._store for system in self.systems]
+        
+        dims = {store.dim for store in stores}
+        if len(dims) != 1:
+            raise ValueError(f"SystemBatch: dimensions hétérogènes {sorted(dims)}")
+        if any(system.topology.dynamic for system in self.systems):
+            raise ValueError("SystemBatch: topologies dynamiques non supportées")
+        if any(system.dtype != np.float32 for system in self.systems):
+            raise ValueError("SystemBatch: systèmes float32 uniquement")
+        self.dim = dims.pop()
+        
+        sizes = np.array([store.n for store in stores], dtype=np.int64)
+        if (sizes == 0).any():
+            raise ValueError("SystemBatch: système vide")
+        self._system_offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+        self._sizes = sizes
+        
+        # Stockage concaténé; chaque System adopte sa tranche
+        self._fields = {}
+        for name in _EntityStore.FIELDS:
+            self._fields[name] = np.ascontiguousarray(
+                np.concatenate([getattr(store, name) for store in stores]))
+        for k, store in enumerate(stores):
+            a, b = self._system_offsets[k], self._system_offsets[k + 1]
+            store.adopt({name: arr[a:b] for name, arr in self._fields.items()})
+        
+        # Graphe CSR concaténé (indices de voisins locaux à chaque système);
+        # pas d'arêtes pour les systèmes à gravité (hors noyau de consensus)
+        self._gravity = np.array([system._uses_gravity() for system in self.systems], dtype=bool)
+        graphs = [(np.empty(0, dtype=np.int32), np.zeros(store.n, dtype=np.int32)) if gravity
+                  else system._neighbor_graph()
+                  for system, store, gravity in zip(self.systems, stores, self._gravity)]
+        self._neighbors = np.ascontiguousarray(
+            np.concatenate([g[0] for g in graphs]), dtype=np.int32)
+        counts = np.concatenate([g[1] for g in graphs]).astype(np.int64)
+        self._edge_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        # Poids: None si aucun système pondéré, sinon 1 pour les non pondérés
+        self._weights = None
+        weighted = [system._weights is not None and not gravity
+                    for system, gravity in zip(self.systems, self._gravity)]
+        if any(weighted):
+            self._weights = np.ascontiguousarray(np.concatenate([
+                system._weights if w else np.ones(len(g[0]), dtype=np.float32)
+                for system, g, w in zip(self.systems, graphs, weighted)]), dtype=np.float32)
+        
+        self._momentums = np.array([system.momentum for system in self.systems], dtype=np.float32)
+        self._strengths = np.array([system.force.kernel_strength() for system in self.systems],
+                                   dtype=np.float32)
+        
+        att_sizes = [len(system._attractor_positions) for system in self.systems]
+        self._att_offsets = np.concatenate(([0], np.cumsum(att_sizes))).astype(np.int64)
+        self._att_positions = np.ascontiguousarray(np.concatenate(
+            [system._attractor_positions for system in self.systems]), dtype=np.float32)
+        self._att_strengths = np.ascontiguousarray(np.concatenate(
+            [system._attractor_strengths for system in self.systems]), dtype=np.float32)
+        
+        # Paramètres de gel répétés par entité (pass vectorisée unique)
+        self._freeze_threshold = np.repeat(
+            [system.freeze_threshold for system in self.systems], sizes).astype(np.float32)
+        self._freeze_steps = np.repeat(
+            [system.freeze_stability_steps for system in self.systems], sizes)
+        self._freeze_enabled = np.repeat(
+            [system.freeze_enabled for system in self.systems], sizes)
+        
+        self.active = np.ones(len(self.systems), dtype=np.uint8)
+        self.converged_at = np.full(len(self.systems), -1, dtype=np.int64)
+        self.rust = self.systems[0].rust
+    
+    def __len__(self) -> int:
+        return len(self.systems)
+    
+    def step(self):
+        f = self._fields
+        consensus = self.active & ~self._gravity
+        self.rust.nexus_step_batch(
+            f['states'].ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+            f['velocities'].ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+            f['frozen'].ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),
+            self._neighbors.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+            _float_ptr(self._weights),
+            self._edge_offsets.ctypes.data_as(ctypes.POINTER(ctypes.c_int64)),
+            self._system_offsets.ctypes.data_as(ctypes.POINTER(ctypes.c_int64)),
+            self._momentums.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+            self._strengths.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+            self._att_offsets.ctypes.data_as(ctypes.POINTER(ctypes.c_int64)),
+            self._att_positions.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+            self._att_strengths.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+            consensus.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),
+            len(self.systems), self.dim
+        )
+        
+        self._update_freeze(consensus)
+        for k in np.flatnonzero(self.active & self._gravity).tolist():
+            self.systems[k]._gravity_step()
+        
+        for k in np.flatnonzero(self.active).tolist():
+            system = self.systems[k]
+            system.step_count += 1
+            for obs in system.observers:
+                obs._record(system)
+    
+    def _update_freeze(self, consensus: np.ndarray):
+        f = self._fields
+        enabled = self._freeze_enabled & np.repeat(consensus.astype(bool), self._sizes)
+        _freeze_pass(f['frozen'], f['velocities'], f['stability'],
+                     self._freeze_threshold, self._freeze_steps, enabled)
+    
+    def run(self, steps: int = 100):
+        for _ in range(steps):
+            self.step()
+    
+    def run_until_stable(self, max_steps: int = 1000, threshold: float = 0.1) -> np.ndarray:
+        """
+        Avance jusqu'à ce que chaque système passe sous `threshold` de variance;
+        un système convergé n'est plus calculé. Retourne converged_at (step de
+        convergence par système, -1 sinon).
+        """
+        for _ in range(max_steps):
+            if not self.active.any():
+                break
+            self.step()
+            done = (self.variances() < threshold) & (self.active == 1)
+            for k in np.flatnonzero(done).tolist():
+                self.converged_at[k] = self.systems[k].step_count
+            self.active[done] = 0
+        return self.converged_at
+    
+    def variances(self) -> np.ndarray:
+        """Variance (dimension 0) de chaque système, vectorisée."""
+        x = self._fields['states'][:, 0].astype(np.float64)
+        starts = self._system_offsets[:-1]
+        means = np.add.reduceat(x, starts) / self._sizes
+        return np.add.reduceat((x - np.repeat(means, self._sizes)) ** 2, starts) / self._sizes
+    
+    def frozen_ratios(self) -> np.ndarray:
+        return np.add.reduceat(self._fields['frozen'].astype(np.int64),
+                               self._system_offsets[:-1]) / self._sizes
+
+# ============================================================
+# SHARDED EXECUTION (multiprocessing + shared memory)
+# ============================================================
+
+def _shard_worker(spec: Dict, commands, results, barrier):
+    """
+    Processus worker: avance le shard [a, b) avec nexus_step sur un tableau
+    local (shard + halo gelé). Par step, seul le halo est lu dans la mémoire
+    partagée et seules les valeurs frontière y sont publiées. Chaque bloc
+    renvoie son nombre de mises à jour (entités actives à chaque step).
+    """
+    from multiprocessing import shared_memory
+    
+    shms = []
+    try:
+        shared = {}
+        for name, (shm_name, shape, dtype) in spec['shared'].items():
+            shm = shared_memory.SharedMemory(name=shm_name)
+            shms.append(shm)
+            shared[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        
+        a, b = spec['range']
+        n_own = b - a
+        halo = spec['halo']
+        boundary = spec['boundary']
+        neighbors, counts = spec['neighbors'], spec['counts']
+        att_pos, att_str = spec['attractor_positions'], spec['attractor_strengths']
+        n_local = n_own + len(halo)
+        dim = shared['states'].shape[1]
+        
+        states = np.zeros((n_local, dim), dtype=np.float32)
+        velocities = np.zeros((n_local, dim), dtype=np.float32)
+        frozen = np.ones(n_local, dtype=np.uint8)  # halo: lecture seule
+        
+        rust = _load_rust_kernels()
+        ptr = ctypes.POINTER
+        
+        while True:
+            cmd, steps = commands.get()
+            if cmd == 'stop':
+                break
+            
+            # (Re)chargement du shard depuis la mémoire partagée
+            states[:n_own] = shared['states'][a:b]
+            velocities[:n_own] = shared['velocities'][a:b]
+            frozen[:n_own] = shared['frozen'][a:b]
+            stability = shared['stability'][a:b].copy()
+            updates = 0
+            
+            for _ in range(steps):
+                states[n_own:, 0] = shared['states'][halo, 0]
+                barrier.wait()  # tous les halos lus avant publication
+                
+                updates += n_own - int(np.count_nonzero(frozen[:n_own]))
+                rust.nexus_step(
+                    states.ctypes.data_as(ptr(ctypes.c_float)),
+                    velocities.ctypes.data_as(ptr(ctypes.c_float)),
+                    frozen.ctypes.data_as(ptr(ctypes.c_uint8)),
+                    neighbors.ctypes.data_as(ptr(ctypes.c_int32)),
+                    counts.ctypes.data_as(ptr(ctypes.c_int32)),
+                    _float_ptr(spec['weights']),
+                    n_local, dim, spec['momentum'], spec['strength'],
+                    att_pos.ctypes.data_as(ptr(ctypes.c_float)),
+                    att_str.ctypes.data_as(ptr(ctypes.c_float)),
+                    len(att_pos)
+                )
+                if spec['freeze_enabled']:
+                    _freeze_pass(frozen[:n_own], velocities[:n_own], stability,
+                                 spec['freeze_threshold'], spec['freeze_stability_steps'])
+                
+                shared['states'][a + boundary, 0] = states[boundary, 0]
+                barrier.wait()  # toutes les frontières publiées
+            
+            shared['states'][a:b] = states[:n_own]
+            shared['velocities'][a:b] = velocities[:n_own]
+            shared['frozen'][a:b] = frozen[:n_own]
+            shared['stability'][a:b] = stability
+            results.put(('done', updates))
+    except Exception:
+        import traceback
+        barrier.abort()
+        results.put(('error', traceback.format_exc()))
+    finally:
+        for shm in shms:
+            shm.close()
+
+
+class ShardedExecutor:
+    """
+    Exécute un System sur plusieurs processus: les entités sont partagées en
+    plages d'indices contiguës, states/velocities/frozen/stability vivent dans
+    des buffers `multiprocessing.shared_memory`, et chaque step est synchronisé
+    par barrière. Résultats identiques à `System.run()` (observers non appelés
+    par step).
+    
+    Utilisation:
+        with ShardedExecutor(system, workers=4) as executor:
+            executor.run(1000)
+    """
+    
+    def __init__(self, system: System, workers: int = None):
+        import multiprocessing
+        from multiprocessing import shared_memory
+        
+        if system.topology.dynamic:
+            raise ValueError("ShardedExecutor: topologies dynamiques non supportées")
+        if system._uses_gravity():
+            raise ValueError("ShardedExecutor: gravité Barnes-Hut non supportée (utiliser System.run)")
+        if system.dtype != np.float32:
+            raise ValueError("ShardedExecutor: systèmes float32 uniquement")
+        
+        self.system = system
+        store = system._store
+        n = store.n
+        self.workers = max(1, min(workers or os.cpu_count() or 1, n))
+        
+        neighbors, counts = system._neighbor_graph()
+        offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+        bounds = np.linspace(0, n, self.workers + 1).astype(np.int64)
+        owner = np.repeat(np.arange(self.workers), np.diff(bounds))
+        
+        # Buffers partagés
+        self._shms = []
+        self._shared = {}
+        shared_spec = {}
+        for name in ('states', 'velocities', 'frozen', 'stability'):
+            src = getattr(store, name)
+            shm = shared_memory.SharedMemory(create=True, size=max(src.nbytes, 1))
+            self._shms.append(shm)
+            arr = np.ndarray(src.shape, dtype=src.dtype, buffer=shm.buf)
+            self._shared[name] = arr
+            shared_spec[name] = (shm.name, src.shape, src.dtype.str)
+        
+        # Graphe local, halo et frontière de chaque shard
+        specs = []
+        boundary_mask = np.zeros(n, dtype=bool)
+        for w in range(self.workers):
+            a, b = int(bounds[w]), int(bounds[w + 1])
+            cols = neighbors[offsets[a]:offsets[b]].astype(np.int64)
+            outside = (cols < a) | (cols >= b)
+            halo = np.unique(cols[outside])
+            boundary_mask[halo] = True
+            local = cols - a
+            local[outside] = (b - a) + np.searchsorted(halo, cols[outside])
+            specs.append({
+                'worker': w,
+                'range': (a, b),
+                'halo': halo,
+                'neighbors': np.ascontiguousarray(local, dtype=np.int32),
+                'weights': (None if system._weights is None
+                            else system._weights[offsets[a]:offsets[b]].copy()),
+                'counts': np.concatenate((counts[a:b], np.zeros(len(halo), dtype=np.int32))),
+            })
+        
+        ctx = multiprocessing.get_context()
+        self._barrier = ctx.Barrier(self.workers)
+        self._results = ctx.Queue()
+        self._commands = []
+        self._processes = []
+        for spec in specs:
+            a, b = spec['range']
+            spec.update({
+                'shared': shared_spec,
+                'boundary': np.flatnonzero(boundary_mask[a:b] & (owner[a:b] == spec['worker'])),
+                'momentum': system.momentum,
+                'strength': system.force.kernel_strength(),
+                'attractor_positions': system._attractor_positions,
+                'attractor_strengths': system._attractor_strengths,
+                'freeze_enabled': system.freeze_enabled,
+                'freeze_threshold': system.freeze_threshold,
+                'freeze_stability_steps': system.freeze_stability_steps,
+            })
+            commands = ctx.Queue()
+            process = ctx.Process(target=_shard_worker,
+                                  args=(spec, commands, self._results, self._barrier),
+                                  daemon=True)
+            process.start()
+            self._commands.append(commands)
+            self._processes.append(process)
+    
+    def run(self, steps: int = 100):
+        import queue
+        
+        store = self.system._store
+        for name, arr in self._shared.items():
+            arr[:] = getattr(store, name)
+        
+        for commands in self._commands:
+            commands.put(('run', steps))
+        
+        pending = self.workers
+        updates = 0
+        while pending:
+            try:
+                status, payload = self._results.get(timeout=1.0)
+            except queue.Empty:
+                if not all(p.is_alive() for p in self._processes):
+                    self.close()
+                    raise RuntimeError("ShardedExecutor: un worker s'est arrêté")
+                continue
+            if status == 'error':
+                self.close()
+                raise RuntimeError(f"ShardedExecutor: erreur worker\n{payload}")
+            updates += payload
+            pending -= 1
+        
+        for name, arr in self._shared.items():
+            store.writable(name)[:] = arr
+        self.system.step_count += steps
+        self.system.update_count += updates
+    
+    def close(self):
+        for commands, process in zip(self._commands, self._processes):
+            if process.is_alive():
+                commands.put(('stop', 0))
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._commands = []
+        self._shared = {}
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
+    
+    def __enter__(self) -> 'ShardedExecutor':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
 
 # ============================================================
 # FUSION ENGINE
 # ============================================================
 
 class FusionEngine:
-    def __init__(self, threshold: float = 1.0, method: str = 'euclidean'):
+    def __init__(self, threshold: float = 1.0, method: str = 'euclidean',
+                 dtype=np.float32):
         self.threshold = threshold
         self.method = method
+        # Même option de précision que System (float16: calcul en float32)
+        self.dtype = np.dtype(dtype)
+        self._real = _compute_dtype(dtype)
         self.compiler = CompilerManager()
+        self._lock = threading.Lock()  # tampons de travail partagés entre appels
+        self._context = None  # (FusionContext, tampons, appel lié), voir _bind_scratch
         self._bootstrap()
     
     def _bootstrap(self):
-        cpp_lib = self.compiler.compile_cpp(CPP_SOURCE)
+        f64 = self._real == np.float64
+        cpp_lib = self.compiler.compile_cpp(_cpp_source(CPP_SOURCE, self._real),
+                                            "nexus_cpp_f64" if f64 else "nexus_cpp")
+        c_real = ctypes.c_double if f64 else ctypes.c_float
         
         cpp_lib.fusion_compress.argtypes = [
-            ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_int32),
-            ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_int32),
-            ctypes.c_int, ctypes.c_float
+            ctypes.POINTER(c_real), ctypes.POINTER(ctypes.c_int32),
+            ctypes.POINTER(c_real), ctypes.POINTER(ctypes.c_int32),
+            ctypes.c_int, c_real
         ]
+        self._context_type = _fusion_context_struct(c_real)
+        cpp_lib.fusion_compress_context.argtypes = [ctypes.POINTER(self._context_type)]
         
         self.cpp = cpp_lib
     
+    def _bind_scratch(self, n: int, dim: int):
+        """
+        Tampons de travail persistants (capacité doublée au besoin) et appel
+        natif sans argument lié à leur FusionContext: un compress ne convertit
+        aucun pointeur tant que la capacité suffit.
+        """
+        bound = self._context
+        if bound is None or len(bound[1]) < n * dim or len(bound[2]) < n:
+            capacity = max(16, 1 << max(0, n - 1).bit_length())
+            flat = np.empty(capacity * dim, dtype=self._real)
+            masses = np.empty(capacity, dtype=self._real)
+            ids = np.empty(capacity, dtype=np.int32)
+            ctx = self._context_type(_float_ptr(flat),
+                                     ids.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+                                     _float_ptr(masses), 0, 0, 0.0)
+            bound = self._context = (ctx, flat, masses, ids, np.arange(capacity, dtype=np.int32),
+                                     functools.partial(self.cpp.fusion_compress_context,
+                                                       ctypes.pointer(ctx)))
+        return bound
+    
     def compress(self, entities: List[Entity]) -> List[Entity]:
         if not entities:
             return []
         
-        dim = len(entities[0].state)
-        n = len(entities)
+        states, masses = self.compress_arrays([e.state for e in entities],
+                                              [e.mass for e in entities])
+        return [Entity(state.tolist(), mass=float(mass)) for state, mass in zip(states, masses)]
+    
+    def compress_arrays(self, states, masses=None):
+        """
+        Fusion sur tableaux: states (N,) ou (N, D), masses (N,) (1 par défaut).
+        Retourne (states K×D dans le dtype du moteur, masses K).
+        """
+        states = np.asarray(states)
+        if states.ndim == 1:
+            states = states.reshape(-1, 1)
+        n, dim = states.shape
         
-        states = np.array([e.state for e in entities], dtype=np.float32).flatten()
-        ids = np.array([e.id for e in entities], dtype=np.int32)
-        masses = np.array([e.mass for e in entities], dtype=np.float32)
-        n_nodes = np.array([n], dtype=np.int32)
-        
-        self.cpp.fusion_compress(
-            states.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
-            ids.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
-            masses.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
-            n_nodes.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
-            dim, self.threshold
-        )
+        with self._lock:
+            ctx, flat, weights, ids, arange, fuse = self._bind_scratch(n, dim)
+            flat[:n * dim].reshape(n, dim)[...] = states
+            weights[:n] = 1.0 if masses is None else masses
+            ids[:n] = arange[:n]
+            ctx.n_nodes, ctx.dim, ctx.threshold = n, dim, self.threshold
+            if n:
+                fuse()
+            final_n = ctx.n_nodes
+            return (flat[:final_n * dim].reshape(final_n, dim).astype(self.dtype),
+                    weights[:final_n].copy())
+    
+    def approximate_labels(self, states, tables: int = 8, bits: int = 8,
+                           width: float = None, window: int = 16, seed: int = 0) -> np.ndarray:
+        """
+        Fusion approchée pour la grande dimension (embeddings): LSH
+        p-stable (E2LSH). Chaque table hache les points sur `bits`
+        projections aléatoires quantifiées au pas `width` (4·threshold par
+        défaut); on ne compare que les points d'un même seau, à au plus
+        `window` rangs d'écart dans le seau trié. Les paires vérifiées à
+        distance exacte < threshold sont fusionnées par composantes connexes
+        (simple lien, comme `FusionDendrogram.labels(threshold)`, qui donne
+        la référence exacte). Aucune fusion erronée: seules des paires
+        proches peuvent manquer. Retourne l'étiquette de chaque point.
+        """
+        points = np.asarray(states, dtype=self._real)
+        points = points.reshape(len(points), -1)
+        n, dim = points.shape
+        width = 4.0 * self.threshold if width is None else width
+        rng = np.random.default_rng(seed)
+        projections = rng.normal(size=(dim, tables * bits)).astype(self._real)
+        offsets = rng.uniform(0, width, tables * bits).astype(self._real)
+        # Codes d'un seau -> clé int64 (débordement modulo 2^64 voulu)
+        multipliers = rng.integers(1, 2**62, (tables, bits), dtype=np.int64) | 1
         
-        final_n = n_nodes[0]
-        result = []
+        keys = np.empty((tables, n), dtype=np.int64)
+        ranks = np.empty((tables, n), dtype=self._real)  # ordre dans le seau
+        chunk = max(1, (1 << 24) // max(1, tables * bits))
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            proj = points[start:stop] @ projections + offsets
+            codes = np.floor(proj / width).astype(np.int64).reshape(-1, tables, bits)
+            with np.errstate(over='ignore'):
+                keys[:, start:stop] = (codes * multipliers).sum(axis=2).T
+            ranks[:, start:stop] = proj.reshape(-1, tables, bits)[:, :, 0].T
         
-        for i in range(final_n):
-            state = states[i * dim:(i + 1) * dim]
-            result.append(Entity(state.tolist(), mass=masses[i]))
+        rows, cols = [], []
+        for t in range(tables):
+            order = np.lexsort((ranks[t], keys[t]))
+            sorted_keys = keys[t][order]
+            for gap in range(1, min(window, n - 1) + 1):
+                same = np.flatnonzero(sorted_keys[:-gap] == sorted_keys[gap:])
+                if len(same) == 0:
+                    break  # tous les seaux ont moins de gap+1 points
+                i, j = order[same], order[same + gap]
+                close = self._close_pairs(points, i, j)
+                rows.append(i[close])
+                cols.append(j[close])
+        if not rows:
+            return np.arange(n)
+        return _connected_components(n, np.concatenate(rows), np.concatenate(cols))
+    
+    def _close_pairs(self, points: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Masque des paires (i, j) à distance < threshold, par blocs de ~16 M valeurs."""
+        close = np.empty(len(i), dtype=bool)
+        chunk = max(1, (1 << 24) // points.shape[1])
+        limit = self.threshold * self.threshold
+        for start in range(0, len(i), chunk):
+            diff = points[i[start:start + chunk]] - points[j[start:start + chunk]]
+            close[start:start + chunk] = np.einsum('ij,ij->i', diff, diff) < limit
+        return close
+    
+    def compress_approximate(self, states, masses=None, tables: int = 8, bits: int = 8,
+                             width: float = None, window: int = 16, seed: int = 0):
+        """
+        Fusion approchée (voir `approximate_labels`) pour dédupliquer des
+        millions d'embeddings: (states K×D barycentres pondérés par la masse,
+        dans le dtype du moteur, masses K).
+        """
+        labels = self.approximate_labels(states, tables, bits, width, window, seed)
+        points = np.asarray(states, dtype=np.float64)
+        points = points.reshape(len(points), -1)
+        masses = np.ones(len(points)) if masses is None else np.asarray(masses, dtype=np.float64)
         
-        return result
+        order = np.argsort(labels, kind='stable')
+        sorted_labels = labels[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_labels[1:] != sorted_labels[:-1])))
+        if len(order) == 0:
+            return np.empty((0, points.shape[1]), dtype=self.dtype), np.empty(0)
+        total = np.add.reduceat(masses[order], starts)
+        centroids = np.add.reduceat(points[order] * masses[order, None], starts, axis=0)
+        return (centroids / total[:, None]).astype(self.dtype), total
+    
+    def build_dendrogram(self, states, masses=None,
+                         max_threshold: float = None) -> 'FusionDendrogram':
+        """
+        Mode hiérarchique: arbre de fusion complet (simple lien sur l'arbre
+        couvrant minimal euclidien), construit une fois puis coupé à
+        n'importe quel seuil par `FusionDendrogram.cut()` en O(N).
+        
+        L'arbre exact (Prim sur le graphe complet) coûte O(N²·D): quelques
+        dizaines de milliers de points au plus. Avec max_threshold, seules
+        les paires à distance < max_threshold sont examinées (cell lists,
+        ~O(N) en dimension <= 3): coupes exactes jusqu'à ce seuil.
+        """
+        return FusionDendrogram(states, masses, dtype=self.dtype, max_threshold=max_threshold)
+
+class FusionDendrogram:
+    """
+    Dendrogramme de fusion à simple lien: à un seuil t, deux points sont
+    fusionnés s'ils sont reliés par une chaîne de sauts < t (comme
+    `compress`, mais sans dépendre de l'ordre de parcours). Les feuilles
+    sont rangées dans l'ordre du dendrogramme: chaque cluster, à tout seuil,
+    est un intervalle contigu de cet ordre, délimité par les hauteurs de
+    fusion entre feuilles adjacentes (`gaps`).
+    
+    Avec max_threshold, les fusions au-delà sont inconnues (hauteur inf) et
+    les seuils supérieurs lèvent ValueError.
+    """
+    
+    def __init__(self, states, masses=None, dtype=np.float32, max_threshold: float = None):
+        states = np.asarray(states)
+        self.states = _as_points(states)
+        self.n, self.dim = self.states.shape
+        self.masses = (np.ones(self.n) if masses is None
+                       else np.asarray(masses, dtype=np.float64).reshape(self.n))
+        self.dtype = np.dtype(dtype)
+        if max_threshold is not None and max_threshold <= 0:
+            raise ValueError("max_threshold doit être > 0")
+        self.max_threshold = np.inf if max_threshold is None else float(max_threshold)
+        
+        if max_threshold is None:
+            rows, cols, lengths = _euclidean_mst(self.states)
+        else:
+            rows, cols, lengths = _bounded_mst(self.states, self.max_threshold)
+        order = np.argsort(lengths, kind='stable')
+        # Fusions au format linkage: (cluster a, cluster b, hauteur, taille),
+        # les clusters >= n désignent la fusion n° (id - n)
+        self.merges = np.empty((len(order), 4))
+        
+        # Union-find avec listes chaînées de feuilles: fusionner A et B à la
+        # hauteur h enchaîne B après A, l'écart entre A.queue et B.tête vaut h
+        root = np.arange(self.n)
+        cluster = np.arange(self.n)
+        head, tail = np.arange(self.n), np.arange(self.n)
+        size = np.ones(self.n, dtype=np.int64)
+        following = np.full(self.n, -1, dtype=np.int64)
+        gap_after = np.full(self.n, np.inf)
+        
+        def find(i):
+            while root[i] != i:
+                root[i] = root[root[i]]
+                i = root[i]
+            return i
+        
+        for m, e in enumerate(order.tolist()):
+            a, b, h = find(rows[e]), find(cols[e]), float(lengths[e])
+            if size[a] < size[b]:
+                a, b = b, a
+            self.merges[m] = (cluster[a], cluster[b], h, size[a] + size[b])
+            following[tail[a]] = head[b]
+            gap_after[tail[a]] = h
+            tail[a] = tail[b]
+            size[a] += size[b]
+            root[b] = a
+            cluster[a] = self.n + m
+        
+        leaf = head[find(0)] if self.n else 0
+        self.order = np.empty(self.n, dtype=np.int64)
+        for i in range(self.n):
+            self.order[i] = leaf
+            leaf = following[leaf]
+        self.gaps = gap_after[self.order[:-1]]
+        self.heights = self.merges[:, 2]
+    
+    def _check(self, threshold: float):
+        if threshold > self.max_threshold:
+            raise ValueError(f"seuil {threshold} > max_threshold {self.max_threshold} "
+                             f"(fusions au-delà non calculées)")
+    
+    def n_clusters(self, threshold: float) -> int:
+        self._check(threshold)
+        return int(np.count_nonzero(self.gaps >= threshold)) + 1 if self.n else 0
+    
+    def labels(self, threshold: float) -> np.ndarray:
+        """Indice de cluster de chaque point (ordre d'origine) au seuil donné."""
+        self._check(threshold)
+        in_order = np.zeros(self.n, dtype=np.int64)
+        np.cumsum(self.gaps >= threshold, out=in_order[1:])
+        labels = np.empty(self.n, dtype=np.int64)
+        labels[self.order] = in_order
+        return labels
+    
+    def cut(self, threshold: float):
+        """
+        Fusion au seuil donné en O(N·D), sans recalcul: (states K×D
+        barycentres pondérés par la masse, dans le dtype du moteur, masses K).
+        """
+        self._check(threshold)
+        if self.n == 0:
+            return np.empty((0, self.dim), dtype=self.dtype), np.empty(0)
+        starts = np.concatenate(([0], np.flatnonzero(self.gaps >= threshold) + 1))
+        masses = self.masses[self.order]
+        weighted = self.states[self.order] * masses[:, None]
+        total = np.add.reduceat(masses, starts)
+        centroids = np.add.reduceat(weighted, starts, axis=0) / total[:, None]
+        return centroids.astype(self.dtype), total
 
 # ============================================================
 # OBSERVER
@@ -711,6 +4496,203 @@ class Observer:
     def get_history(self) -> List[Dict]:
         return self.history
 
+# ============================================================
+# TRAJECTORY RECORDER
+# ============================================================
+
+class TrajectoryRecorder(Observer):
+    """
+    Enregistre la trajectoire complète (states, velocities, frozen) dans des
+    fichiers .npy memory-mappés préalloués (max_frames × N × D).
+
+    Le dossier `path` contient states.npy, velocities.npy, frozen.npy et
+    steps.npy; il se relit sans copie via `TrajectoryRecorder.load(path)`.
+    """
+
+    def __init__(self, path: Union[str, Path], max_frames: int,
+                 frequency: int = 1, dtype=np.float32,
+                 record_velocities: bool = True, record_frozen: bool = True):
+        super().__init__(metrics=[], frequency=frequency)
+        self.path = Path(path)
+        self.max_frames = int(max_frames)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.dtype(np.float32), np.dtype(np.float16)):
+            raise ValueError("dtype doit être float32 ou float16")
+        self.record_velocities = record_velocities
+        self.record_frozen = record_frozen
+        self.n_frames = 0
+        self.states = None
+        self.velocities = None
+        self.frozen = None
+        self.steps = None
+        self._overflow_warned = False
+
+    def _allocate(self, n: int, dim: int):
+        from numpy.lib.format import open_memmap
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        shape = (self.max_frames, n, dim)
+        self.states = open_memmap(self.path / "states.npy", mode='w+',
+                                  dtype=self.dtype, shape=shape)
+        if self.record_velocities:
+            self.velocities = open_memmap(self.path / "velocities.npy", mode='w+',
+                                          dtype=self.dtype, shape=shape)
+        if self.record_frozen:
+            self.frozen = open_memmap(self.path / "frozen.npy", mode='w+',
+                                      dtype=np.uint8, shape=(self.max_frames, n))
+        self.steps = open_memmap(self.path / "steps.npy", mode='w+',
+                                 dtype=np.int64, shape=(self.max_frames,))
+        self.steps[:] = -1
+
+    def _record(self, system: System):
+        if system.step_count % self.frequency != 0:
+            return
+
+        if self.n_frames >= self.max_frames:
+            if not self._overflow_warned:
+                warnings.warn(f"TrajectoryRecorder plein ({self.max_frames} frames), "
+                              f"steps suivants ignorés")
+                self._overflow_warned = True
+            return
+
+        states, velocities, frozen = system._arrays()
+        if self.states is None:
+            self._allocate(states.shape[0], states.shape[1])
+        elif self.states.shape[1:] != states.shape:
+            raise ValueError(f"TrajectoryRecorder: forme {states.shape} différente de "
+                             f"{self.states.shape[1:]} (entités ajoutées/retirées)")
+
+        k = self.n_frames
+        self.states[k] = states
+        if self.velocities is not None:
+            self.velocities[k] = velocities
+        if self.frozen is not None:
+            self.frozen[k] = frozen
+        self.steps[k] = system.step_count
+        self.n_frames += 1
+
+    def flush(self):
+        for arr in (self.states, self.velocities, self.frozen, self.steps):
+            if arr is not None:
+                arr.flush()
+
+    def get_history(self) -> Dict[str, np.ndarray]:
+        """Vues (sans copie) sur les frames enregistrées."""
+        return {
+            'step': self.steps[:self.n_frames] if self.steps is not None else None,
+            'states': self.states[:self.n_frames] if self.states is not None else None,
+            'velocities': self.velocities[:self.n_frames] if self.velocities is not None else None,
+            'frozen': self.frozen[:self.n_frames] if self.frozen is not None else None,
+        }
+
+    @staticmethod
+    def load(path: Union[str, Path]) -> Dict[str, np.ndarray]:
+        """Relit une trajectoire en lecture seule (np.memmap, sans copie)."""
+        path = Path(path)
+        steps = np.load(path / "steps.npy", mmap_mode='r')
+        n_frames = int(np.count_nonzero(np.asarray(steps) >= 0))
+        result = {'step': steps[:n_frames]}
+        for name in ('states', 'velocities', 'frozen'):
+            f = path / f"{name}.npy"
+            result[name] = np.load(f, mmap_mode='r')[:n_frames] if f.exists() else None
+        return result
+
+# ============================================================
+# STEP PROFILER
+# ============================================================
+
+class StepProfiler:
+    """
+    Instrumentation optionnelle de System.step / System.run.
+
+    Mesure en nanosecondes, par phase, le temps cumulé et celui de chaque
+    enregistrement (un step, ou un appel natif pour un run sans observer):
+    neighbors (construction du voisinage), marshal (préparation des
+    arguments ctypes), kernel (appel natif, gel compris), freeze (gel
+    Python, gravité uniquement) et observers. Compte aussi les steps, les
+    octets alloués par le chemin de step, les arêtes traitées et les
+    entités actives. Sans profiler attaché, le step ne fait qu'un test.
+    """
+    PHASES = ('neighbors', 'marshal', 'kernel', 'freeze', 'observers')
+    COUNTERS = ('steps', 'records', 'bytes_allocated', 'edges_processed',
+                'active_entity_steps')
+    
+    def __init__(self, history: int = 1000, callback: Callable[[Dict], None] = None):
+        self.history = deque(maxlen=history)
+        self.callback = callback
+        self.reset()
+    
+    def reset(self):
+        self.totals = dict.fromkeys(self.PHASES, 0)
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.history.clear()
+        self._current = None
+    
+    def attach(self, system: System) -> 'StepProfiler':
+        system.profiler = self
+        return self
+    
+    def _begin(self, step: int):
+        self._current = {'step': step, 'steps': 0, 'active': 0, 'edges': 0, 'bytes': 0,
+                         **dict.fromkeys(self.PHASES, 0)}
+    
+    def _add(self, phase: str, ns: int):
+        self.totals[phase] += ns
+        if self._current is not None:
+            self._current[phase] += ns
+    
+    def _allocated(self, nbytes: int):
+        self.counters['bytes_allocated'] += nbytes
+        if self._current is not None:
+            self._current['bytes'] += nbytes
+    
+    def _processed(self, steps: int, active: int, edges: int):
+        self.counters['steps'] += steps
+        self.counters['active_entity_steps'] += active * steps
+        self.counters['edges_processed'] += edges * steps
+        if self._current is not None:
+            if self._current['steps'] == 0:
+                self._current['active'] = active
+            self._current['steps'] += steps
+            self._current['edges'] += edges * steps
+    
+    def _end(self):
+        record, self._current = self._current, None
+        self.counters['records'] += 1
+        self.history.append(record)
+        if self.callback is not None:
+            self.callback(record)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Totaux (ns), compteurs et historique par enregistrement."""
+        steps = self.counters['steps']
+        return {
+            'totals_ns': dict(self.totals),
+            'per_step_ns': {k: v / steps if steps else 0.0 for k, v in self.totals.items()},
+            'counters': dict(self.counters),
+            'history': list(self.history),
+        }
+    
+    def to_openmetrics(self, prefix: str = 'nexus_stellar') -> str:
+        """Exposition au format texte OpenMetrics (compteurs cumulés)."""
+        lines = [f"# TYPE {prefix}_phase_seconds counter",
+                 f"# UNIT {prefix}_phase_seconds seconds",
+                 f"# HELP {prefix}_phase_seconds Temps cumulé par phase du step."]
+        for phase, ns in self.totals.items():
+            lines.append(f'{prefix}_phase_seconds_total{{phase="{phase}"}} {ns / 1e9:.9f}')
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+    
+    def log(self, logger: logging.Logger = None, level: int = logging.INFO):
+        """Résumé sur une ligne (ms cumulées par phase + compteurs)."""
+        logger = logger or logging.getLogger('nexus_stellar')
+        phases = " ".join(f"{k}={v / 1e6:.3f}ms" for k, v in self.totals.items())
+        counters = " ".join(f"{k}={v}" for k, v in self.counters.items())
+        logger.log(level, "profil step: %s %s", phases, counters)
+
 # ============================================================
 # ATTRACTOR
 # ============================================================
@@ -745,5 +4727,14 @@ def demo():
     
     print("="*70)
 
+def main(argv: List[str] = None):
+    """Point d'entrée `nexus-stellar`: démo, ou `nexus-stellar bench ...`"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'bench':
+        from nexus_stellar_bench import main as bench_main
+        return bench_main(argv[1:])
+    demo()
+    return 0
+
 if __name__ == "__main__":
-    demo()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
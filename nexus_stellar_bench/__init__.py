@@ -0,0 +1,393 @@
+"""
+Benchmarks reproductibles Nexus-Stellar
+
+Balaye N, dimension, topologie, force, backend d'exécution et précision
+(dtype) du System en chronométrant séparément chaque phase (marshalling,
+construction du voisinage, noyau, observers, relecture), puis
+FusionEngine.compress sur plusieurs densités de clusters, et la fusion
+approchée LSH sur des embeddings (rappel contre la fusion exacte), et le
+surcoût Python par appel à petit N (step, compress). Chaque
+précision rapporte aussi son débit et son erreur par rapport à float64. Les résultats
+sont écrits en JSON et comparables d'un commit à l'autre:
+
+    nexus-stellar bench --output base.json
+    nexus-stellar bench --compare base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import nexus_stellar as ns
+
+RESULTS_VERSION = 1
+
+SIZES = (1_000, 10_000, 100_000)
+QUICK_SIZES = (1_000, 10_000)
+DIMS = (1, 3)
+TOPOLOGIES = ('ring', 'grid_2d', 'small_world', 'full')
+FORCES = ('attraction', 'gravity')
+BACKENDS = ('step', 'run', 'sharded')
+DTYPES = ('float32', 'float64', 'float16')
+FUSION_SPREADS = (0.05, 0.5, 5.0)
+LSH_TABLES = (4, 8)
+OVERHEAD_SIZES = (10, 100)
+
+FULL_MAX_N = 2_000      # Topology.full: N² arêtes
+SHARDED_MIN_N = 10_000  # en dessous, le démarrage des processus domine
+
+# ============================================================
+# CAS
+# ============================================================
+
+def _topology(name: str, n: int) -> ns.Topology:
+    if name == 'grid_2d':
+        return ns.Topology.grid_2d(int(np.ceil(np.sqrt(n))))
+    return getattr(ns.Topology, name)()
+
+def _force(name: str) -> ns.Force:
+    return ns.Force.gravity(1.0) if name == 'gravity' else ns.Force.attraction(0.5)
+
+def system_cases(sizes=SIZES, dims=DIMS, topologies=TOPOLOGIES,
+                 forces=FORCES, backends=BACKENDS, dtypes=DTYPES) -> List[Dict[str, Any]]:
+    """Combinaisons pertinentes du balayage (les cas redondants sont omis)."""
+    cases = []
+    for n in sizes:
+        for dim in dims:
+            for topology in topologies:
+                if topology == 'full' and n > FULL_MAX_N:
+                    continue
+                for force in forces:
+                    # Hors topologie full, la gravité passe par le même noyau
+                    if force == 'gravity' and (topology != 'full' or dim > 3):
+                        continue
+                    for backend in backends:
+                        if backend == 'sharded' and (n < SHARDED_MIN_N or topology == 'full'):
+                            continue
+                        for dtype in dtypes:
+                            # ShardedExecutor: float32 uniquement
+                            if backend == 'sharded' and dtype != 'float32':
+                                continue
+                            cases.append({'n': n, 'dim': dim, 'topology': topology,
+                                          'force': force, 'backend': backend, 'dtype': dtype})
+    return cases
+
+def case_key(case: Dict[str, Any]) -> str:
+    # float32 sans suffixe: clés stables par rapport aux résultats antérieurs
+    suffix = '' if case.get('dtype', 'float32') == 'float32' else f"/{case['dtype']}"
+    if case.get('kind') == 'overhead':
+        return f"overhead/n={case['n']}"
+    if 'tables' in case:
+        return f"fusion_lsh/n={case['n']}/d={case['dim']}/tables={case['tables']}/bits={case['bits']}"
+    if 'spread' in case:
+        return f"fusion/n={case['n']}/d={case['dim']}/spread={case['spread']}{suffix}"
+    return (f"system/{case['topology']}/n={case['n']}/d={case['dim']}"
+            f"/{case['force']}/{case['backend']}{suffix}")
+
+# ============================================================
+# MESURES
+# ============================================================
+
+def _timed(func, *args):
+    start = time.perf_counter_ns()
+    result = func(*args)
+    return (time.perf_counter_ns() - start) / 1e9, result
+
+def _initial_states(case: Dict[str, Any], seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, 100, (case['n'], case['dim'])).astype(np.float32)
+
+def _reference_states(case: Dict[str, Any], steps: int, seed: int) -> np.ndarray:
+    """États finaux du même cas calculé en float64 (référence d'erreur)."""
+    system = ns.System.from_arrays(_initial_states(case, seed), force=_force(case['force']),
+                                   topology=_topology(case['topology'], case['n']),
+                                   freeze_enabled=False, dtype=np.float64)
+    system.run(steps)
+    return system._store.states
+
+def _relative_error(states: np.ndarray, reference: np.ndarray) -> float:
+    reference = reference.astype(np.float64)
+    scale = np.linalg.norm(reference) or 1.0
+    return float(np.linalg.norm(states.astype(np.float64) - reference) / scale)
+
+def bench_system(case: Dict[str, Any], steps: int, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Durées (secondes) de chaque phase et métriques (débit, erreur) d'un cas System."""
+    n = case['n']
+    dtype = np.dtype(case.get('dtype', 'float32'))
+    states = _initial_states(case, seed)
+    entities = [ns.Entity(row.tolist()) for row in states]
+
+    phases = {}
+    # Marshalling: objets Entity -> stockage SoA
+    phases['marshal'], system = _timed(lambda: ns.System(
+        entities, _force(case['force']), _topology(case['topology'], n),
+        freeze_enabled=False, dtype=dtype))
+
+    if not system._uses_gravity():
+        phases['neighbors'], _ = _timed(system._neighbor_graph)
+    else:
+        phases['neighbors'] = 0.0
+
+    backend = case['backend']
+    if backend == 'step':
+        def advance():
+            for _ in range(steps):
+                system.step()
+    elif backend == 'run':
+        def advance():
+            system.run(steps)
+    else:
+        def advance():
+            system.run_sharded(steps, workers=2)
+    elapsed, _ = _timed(advance)
+    phases['kernel_per_step'] = elapsed / steps
+    metrics = {'throughput': n * steps / elapsed if elapsed else 0.0,
+               'error': 0.0 if dtype == np.float64 else
+               _relative_error(system._store.states, _reference_states(case, steps, seed))}
+
+    observer = ns.Observer(metrics=['variance', 'frozen_ratio'], frequency=1)
+    elapsed, _ = _timed(lambda: [observer._record(system) for _ in range(steps)])
+    phases['observer_per_step'] = elapsed / steps
+
+    phases['readback'], _ = _timed(system.get_states)
+    return {'phases': phases, 'metrics': metrics}
+
+def fusion_cases(spreads=FUSION_SPREADS, dtypes=DTYPES, n: int = 2_000,
+                 dim: int = 2) -> List[Dict[str, Any]]:
+    return [{'n': n, 'dim': dim, 'spread': spread, 'dtype': dtype}
+            for spread in spreads for dtype in dtypes]
+
+def bench_fusion(case: Dict[str, Any], seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    FusionEngine.compress sur 10 clusters gaussiens d'écart-type `spread`;
+    erreur = écart relatif du nombre d'entités restantes par rapport à float64.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, 100, (10, case['dim']))
+    points = centers[rng.integers(0, 10, case['n'])] + rng.normal(
+        0, case['spread'], (case['n'], case['dim']))
+    entities = [ns.Entity(row.tolist()) for row in points]
+    dtype = case.get('dtype', 'float32')
+    engine = ns.FusionEngine(threshold=1.0, dtype=dtype)
+    elapsed, compressed = _timed(engine.compress, entities)
+    metrics = {'throughput': case['n'] / elapsed if elapsed else 0.0, 'error': 0.0}
+    if dtype != 'float64':
+        reference = ns.FusionEngine(threshold=1.0, dtype=np.float64).compress(entities)
+        metrics['error'] = abs(len(compressed) - len(reference)) / len(reference)
+    return {'phases': {'compress': elapsed, 'ratio': len(compressed) / case['n']},
+            'metrics': metrics}
+
+def lsh_cases(tables=LSH_TABLES, n: int = 2_000, dim: int = 768,
+              bits: int = 8) -> List[Dict[str, Any]]:
+    return [{'n': n, 'dim': dim, 'tables': t, 'bits': bits} for t in tables]
+
+def pair_recall(exact: np.ndarray, approximate: np.ndarray) -> float:
+    """Part des paires fusionnées par la fusion exacte que l'approchée fusionne aussi."""
+    def fused_pairs(*labels):
+        _, counts = np.unique(np.stack(labels), axis=1, return_counts=True)
+        return int((counts * (counts - 1) // 2).sum())
+    expected = fused_pairs(exact)
+    return fused_pairs(exact, approximate) / expected if expected else 1.0
+
+def bench_lsh(case: Dict[str, Any], seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    FusionEngine.approximate_labels sur des embeddings quasi-dupliqués (groupes
+    de ~5 autour de directions aléatoires de norme 1); rappel par paires contre
+    la fusion exacte (composantes du graphe radius_query, même seuil).
+    """
+    rng = np.random.default_rng(seed)
+    n, dim = case['n'], case['dim']
+    base = rng.normal(size=(n // 5, dim))
+    base /= np.linalg.norm(base, axis=1, keepdims=True)
+    points = (base[rng.integers(0, len(base), n)]
+              + rng.normal(0, 0.02 / np.sqrt(dim), (n, dim))).astype(np.float32)
+    engine = ns.FusionEngine(threshold=0.05)
+
+    def exact():
+        neighbors, counts = ns.radius_query(points, engine.threshold)
+        rows = np.repeat(np.arange(n), counts)
+        return ns._connected_components(n, rows, neighbors.astype(np.int64))
+    exact_time, reference = _timed(exact)
+    elapsed, labels = _timed(lambda: engine.approximate_labels(
+        points, tables=case['tables'], bits=case['bits'], seed=seed))
+    recall = pair_recall(reference, labels)
+    return {'phases': {'exact': exact_time, 'approximate': elapsed,
+                       'ratio': len(np.unique(labels)) / n},
+            'metrics': {'throughput': n / elapsed if elapsed else 0.0,
+                        'recall': recall, 'error': 1.0 - recall}}
+
+def bench_overhead(case: Dict[str, Any], calls: int = 2_000,
+                   seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Surcoût par appel à petit N (secondes): System.step(), run(1), l'appel
+    natif lié seul (`native`: noyau sans Python) et FusionEngine.compress_arrays.
+    """
+    n = case['n']
+    rng = np.random.default_rng(seed)
+    system = ns.System.from_arrays(rng.uniform(0, 100, n), topology=ns.Topology.ring(),
+                                   freeze_enabled=False)
+    system.step()  # liaison du contexte natif
+    native = system._context[3]
+    engine = ns.FusionEngine(threshold=0.5)
+    points = rng.uniform(0, 10, (n, 2))
+
+    def per_call(func):
+        elapsed, _ = _timed(lambda: [func() for _ in range(calls)])
+        return elapsed / calls
+    phases = {'step': per_call(system.step), 'run1': per_call(lambda: system.run(1)),
+              'native': per_call(native),
+              'compress': per_call(lambda: engine.compress_arrays(points))}
+    return {'phases': phases,
+            'metrics': {'throughput': 1.0 / phases['step'] if phases['step'] else 0.0,
+                        'error': 0.0}}
+
+def _median(runs: List[Dict[str, Dict[str, float]]], part: str) -> Dict[str, float]:
+    return {name: float(np.median([r[part][name] for r in runs])) for name in runs[0][part]}
+
+# ============================================================
+# SUITE
+# ============================================================
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                             text=True, timeout=5, cwd=os.path.dirname(ns.__file__))
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def metadata() -> Dict[str, Any]:
+    return {
+        'version': RESULTS_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def run_suite(sizes=SIZES, dims=DIMS, topologies=TOPOLOGIES, forces=FORCES,
+              backends=BACKENDS, dtypes=DTYPES, spreads=FUSION_SPREADS,
+              lsh_tables=LSH_TABLES, overhead_sizes=OVERHEAD_SIZES, steps: int = 20,
+              repeat: int = 3, log=print) -> Dict[str, Any]:
+    """Exécute le balayage complet; médiane de `repeat` exécutions par cas."""
+    results = []
+    for case in system_cases(sizes, dims, topologies, forces, backends, dtypes):
+        runs = [bench_system(case, steps, seed) for seed in range(repeat)]
+        phases, metrics = _median(runs, 'phases'), _median(runs, 'metrics')
+        results.append({'key': case_key(case), 'kind': 'system', 'params': case,
+                        'steps': steps, 'phases': phases, 'metrics': metrics})
+        if log:
+            log(f"   {case_key(case):<63} {phases['kernel_per_step'] * 1e3:9.3f} ms/step"
+                f"  err={metrics['error']:.1e}")
+    for case in fusion_cases(spreads, dtypes):
+        runs = [bench_fusion(case, seed) for seed in range(repeat)]
+        phases, metrics = _median(runs, 'phases'), _median(runs, 'metrics')
+        results.append({'key': case_key(case), 'kind': 'fusion', 'params': case,
+                        'phases': phases, 'metrics': metrics})
+        if log:
+            log(f"   {case_key(case):<63} {phases['compress'] * 1e3:9.3f} ms"
+                f"  err={metrics['error']:.1e}")
+    for case in lsh_cases(lsh_tables):
+        runs = [bench_lsh(case, seed) for seed in range(repeat)]
+        phases, metrics = _median(runs, 'phases'), _median(runs, 'metrics')
+        results.append({'key': case_key(case), 'kind': 'fusion_lsh', 'params': case,
+                        'phases': phases, 'metrics': metrics})
+        if log:
+            log(f"   {case_key(case):<63} {phases['approximate'] * 1e3:9.3f} ms"
+                f"  recall={metrics['recall']:.4f}")
+    for n in overhead_sizes:
+        case = {'kind': 'overhead', 'n': n}
+        runs = [bench_overhead(case, seed=seed) for seed in range(repeat)]
+        phases, metrics = _median(runs, 'phases'), _median(runs, 'metrics')
+        results.append({'key': case_key(case), 'kind': 'overhead', 'params': case,
+                        'phases': phases, 'metrics': metrics})
+        if log:
+            log(f"   {case_key(case):<63} {phases['step'] * 1e6:9.3f} µs/step"
+                f"  native={phases['native'] * 1e6:.3f} µs")
+    return {'meta': metadata(), 'results': results}
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = 1.5, min_seconds: float = 1e-4) -> List[Dict[str, Any]]:
+    """
+    Phases ralenties d'un facteur > threshold par rapport à la référence
+    (clés communes uniquement; phases plus courtes que min_seconds ignorées;
+    les métriques débit/erreur sont informatives).
+    """
+    base = {r['key']: r['phases'] for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        previous = base.get(result['key'])
+        if previous is None:
+            continue
+        for phase, seconds in result['phases'].items():
+            if phase == 'ratio' or phase not in previous or previous[phase] < min_seconds:
+                continue
+            factor = seconds / previous[phase]
+            if factor > threshold:
+                regressions.append({'key': result['key'], 'phase': phase,
+                                    'baseline': previous[phase], 'current': seconds,
+                                    'factor': factor})
+    return regressions
+
+# ============================================================
+# CLI
+# ============================================================
+
+def _csv(cast):
+    return lambda text: tuple(cast(x) for x in text.split(','))
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='nexus-stellar bench',
+                                     description="Benchmarks Nexus-Stellar (résultats JSON)")
+    parser.add_argument('--quick', action='store_true', help="N réduits, une seule exécution")
+    parser.add_argument('--sizes', type=_csv(int))
+    parser.add_argument('--dims', type=_csv(int), default=DIMS)
+    parser.add_argument('--topologies', type=_csv(str), default=TOPOLOGIES)
+    parser.add_argument('--forces', type=_csv(str), default=FORCES)
+    parser.add_argument('--backends', type=_csv(str), default=BACKENDS)
+    parser.add_argument('--dtypes', type=_csv(str), default=DTYPES)
+    parser.add_argument('--lsh-tables', type=_csv(int), default=LSH_TABLES)
+    parser.add_argument('--steps', type=int, default=20)
+    parser.add_argument('--repeat', type=int)
+    parser.add_argument('--output', '-o', help="fichier JSON de sortie (défaut: stdout)")
+    parser.add_argument('--compare', help="JSON de référence: code de sortie 1 si régression")
+    parser.add_argument('--threshold', type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    repeat = args.repeat or (1 if args.quick else 3)
+    log = lambda msg: print(msg, file=sys.stderr)
+    log(f"⏱️  Benchmarks Nexus-Stellar (N={list(sizes)}, repeat={repeat})")
+
+    results = run_suite(sizes, args.dims, args.topologies, args.forces, args.backends,
+                        args.dtypes, lsh_tables=args.lsh_tables, steps=args.steps,
+                        repeat=repeat, log=log)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+        log(f"💾 Résultats: {args.output}")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            log(f"❌ {r['key']} [{r['phase']}] {r['baseline'] * 1e3:.3f} ms -> "
+                f"{r['current'] * 1e3:.3f} ms (×{r['factor']:.2f})")
+        if regressions:
+            return 1
+        log(f"✅ Aucune régression (seuil ×{args.threshold})")
+    return 0
@@ -0,0 +1,5 @@
+import sys
+
+from nexus_stellar_bench import main
+
+sys.exit(main())
@@ -12,7 +12,8 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/Tryboy869/nexus-stellar",
-    packages=find_packages(),
+    py_modules=["nexus_stellar"],
+    packages=find_packages(include=["nexus_stellar_bench"]),
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -34,7 +35,7 @@ setup(
     },
     entry_points={
         "console_scripts": [
-            "nexus-stellar=nexus_stellar:demo",
+            "nexus-stellar=nexus_stellar:main",
         ],
     },
 )
\ No newline at end of file
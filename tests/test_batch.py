@@ -0,0 +1,111 @@
+"""
+Tests pour SystemBatch
+"""
+
+import sys
+sys.path.append('..')
+
+from nexus_stellar import Entity, System, SystemBatch, Force, Topology, Attractor
+import numpy as np
+import warnings
+
+def _make_systems(seed):
+    rng = np.random.default_rng(seed)
+    systems = []
+    for k in range(20):
+        n = int(rng.integers(10, 60))
+        topology = [Topology.ring(), Topology.full(), Topology.grid_2d(5)][k % 3]
+        system = System.from_arrays(
+            rng.uniform(0, 100, n),
+            force=Force.attraction(float(rng.uniform(0.2, 0.8))),
+            topology=topology,
+            momentum=float(rng.uniform(0.5, 0.9)),
+        )
+        if k % 4 == 0:
+            system.add_attractor(Attractor(position=50.0, strength=0.1))
+        systems.append(system)
+    return systems
+
+def test_batch_matches_individual():
+    """Test batch identique aux systèmes pris un par un"""
+    individual = _make_systems(0)
+    batched = _make_systems(0)
+    
+    for system in individual:
+        system.run(steps=30)
+    batch = SystemBatch(batched)
+    batch.run(steps=30)
+    
+    for a, b in zip(individual, batched):
+        assert a.get_states() == b.get_states()
+        assert a.frozen_ratio() == b.frozen_ratio()
+        assert b.step_count == 30
+    print("✅ test_batch_matches_individual")
+
+def test_batch_variances():
+    """Test variances par système"""
+    systems = _make_systems(1)
+    batch = SystemBatch(systems)
+    batch.run(steps=3)
+    
+    expected = [system.variance() for system in systems]
+    assert np.allclose(batch.variances(), expected, rtol=1e-3)
+    assert np.allclose(batch.frozen_ratios(), [s.frozen_ratio() for s in systems])
+    print("✅ test_batch_variances")
+
+def test_batch_until_stable():
+    """Test convergence par système (systèmes convergés arrêtés)"""
+    systems = [System([Entity(float(i * k)) for i in range(10)], topology=Topology.full())
+               for k in range(1, 6)]
+    batch = SystemBatch(systems)
+    converged_at = batch.run_until_stable(max_steps=500, threshold=0.01)
+    
+    assert (converged_at > 0).all()
+    assert not batch.active.any()
+    for system, step in zip(systems, converged_at):
+        assert system.step_count == step
+        assert system.variance() < 0.01
+    print("✅ test_batch_until_stable")
+
+def test_batch_gravity():
+    """Test gravité Barnes-Hut: batch identique à System, mélangée au consensus"""
+    rng = np.random.default_rng(3)
+    positions = rng.normal(0, 10, (80, 2))
+    masses = rng.uniform(0.5, 2.0, 80)
+    make = lambda: [
+        System.from_arrays(positions, masses=masses, force=Force.gravity(2.0),
+                           topology=Topology.full()),
+        System.from_arrays(positions, topology=Topology.ring()),
+        System.from_arrays(positions, force=Force.gravity(), topology=Topology.ring()),
+    ]
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        individual, batched = make(), make()
+    assert len(caught) == 2  # gravité hors Topology.full(): noyau de consensus
+    
+    for system in individual:
+        system.run(steps=10)
+    SystemBatch(batched).run(steps=10)
+    
+    for a, b in zip(individual, batched):
+        assert np.array_equal(a._store.states, b._store.states)
+        assert np.array_equal(a._store.frozen, b._store.frozen)
+        assert a.step_count == b.step_count == 10
+    print("✅ test_batch_gravity")
+
+def main():
+    print("="*70)
+    print("Tests SystemBatch")
+    print("="*70 + "\n")
+    
+    test_batch_matches_individual()
+    test_batch_variances()
+    test_batch_until_stable()
+    test_batch_gravity()
+    
+    print("\n" + "="*70)
+    print("✅ Tous les tests SystemBatch passés")
+    print("="*70)
+
+if __name__ == "__main__":
+    main()
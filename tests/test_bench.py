@@ -0,0 +1,66 @@
+"""
+Tests pour la suite de benchmarks (nexus-stellar bench)
+"""
+
+import sys
+sys.path.append('..')
+
+import json
+import nexus_stellar_bench as bench
+
+def test_bench_cases():
+    """Test balayage: cas redondants ou trop coûteux omis"""
+    cases = bench.system_cases(sizes=(1_000, 100_000))
+    keys = {bench.case_key(c) for c in cases}
+
+    assert len(keys) == len(cases)
+    assert all(c['n'] <= bench.FULL_MAX_N for c in cases if c['topology'] == 'full')
+    assert all(c['topology'] == 'full' for c in cases if c['force'] == 'gravity')
+    assert all(c['n'] >= bench.SHARDED_MIN_N for c in cases if c['backend'] == 'sharded')
+    print("✅ test_bench_cases")
+
+def test_bench_run_and_compare():
+    """Test résultats JSON et détection de régression"""
+    results = bench.run_suite(sizes=(200,), dims=(2,), topologies=('ring', 'full'),
+                              backends=('step', 'run'), dtypes=('float32', 'float16'),
+                              spreads=(0.1,), lsh_tables=(8,), overhead_sizes=(10,),
+                              steps=3, repeat=1, log=None)
+    results = json.loads(json.dumps(results))  # sérialisable
+
+    assert results['meta']['version'] == bench.RESULTS_VERSION
+    phases = results['results'][0]['phases']
+    assert set(phases) == {'marshal', 'neighbors', 'kernel_per_step',
+                           'observer_per_step', 'readback'}
+    fusion = next(r for r in results['results'] if r['kind'] == 'fusion')
+    assert 0 < fusion['phases']['ratio'] <= 1
+    lsh = next(r for r in results['results'] if r['kind'] == 'fusion_lsh')
+    assert lsh['metrics']['recall'] > 0.9
+    overhead = results['results'][-1]
+    assert overhead['key'] == 'overhead/n=10'
+    assert 0 < overhead['phases']['native'] <= overhead['phases']['step']
+    half = next(r for r in results['results'] if r['params']['dtype'] == 'float16')
+    assert half['key'].endswith('/float16')
+    assert half['metrics']['throughput'] > 0 and 0 < half['metrics']['error'] < 1e-2
+
+    assert bench.compare(results, results) == []
+    slower = json.loads(json.dumps(results))
+    for r in slower['results']:
+        r['phases'] = {k: v * 3 + 1e-3 for k, v in r['phases'].items()}
+    regressions = bench.compare(slower, results, threshold=1.5)
+    assert regressions and all(r['phase'] != 'ratio' for r in regressions)
+    print("✅ test_bench_run_and_compare")
+
+def main():
+    print("="*70)
+    print("Tests Benchmarks")
+    print("="*70 + "\n")
+
+    test_bench_cases()
+    test_bench_run_and_compare()
+
+    print("\n" + "="*70)
+    print("✅ Tous les tests benchmarks passés")
+    print("="*70)
+
+if __name__ == "__main__":
+    main()
@@ -65,6 +65,36 @@ def test_entity_properties():
     assert e.properties['value'] == 42
     print("✅ test_entity_properties")
 
+def test_entity_slots():
+    """Test représentation compacte (__slots__)"""
+    e = Entity(1.0)
+    assert not hasattr(e, '__dict__')
+    try:
+        e.unknown_attribute = 1
+        assert False, "attribut arbitraire accepté"
+    except AttributeError:
+        pass
+    print("✅ test_entity_slots")
+
+def test_entity_bound_view():
+    """Test entité liée au stockage SoA d'un System"""
+    from nexus_stellar import System, Topology
+    
+    entities = [Entity([float(i), 0.0], mass=2.0) for i in range(4)]
+    system = System(entities, topology=Topology.ring())
+    
+    assert system.entities[2] is entities[2]
+    entities[2].state[0] = 42.0
+    assert system.get_states()[2] == 42.0
+    
+    entities[1].freeze()
+    assert system.frozen_ratio() == 0.25
+    
+    clone = entities[3].copy()
+    clone.state[0] = -1.0
+    assert entities[3].state[0] == 3.0
+    print("✅ test_entity_bound_view")
+
 def main():
     print("="*70)
     print("Tests Entity")
@@ -76,6 +106,8 @@ def main():
     test_entity_distance()
     test_entity_copy()
     test_entity_properties()
+    test_entity_slots()
+    test_entity_bound_view()
     
     print("\n" + "="*70)
     print("✅ Tous les tests Entity passés")
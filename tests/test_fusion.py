@@ -64,6 +64,75 @@ def test_fusion_no_fusion():
     assert len(compressed) == len(entities)
     print("✅ test_fusion_no_fusion (aucune fusion)")
 
+def test_fusion_dendrogram():
+    """Test dendrogramme: coupes à plusieurs seuils sans recalcul"""
+    rng = np.random.default_rng(0)
+    states = np.concatenate([rng.normal(c, 0.3, (60, 3)) for c in (0, 5, 10)])
+    masses = rng.uniform(0.5, 2.0, len(states))
+    dendrogram = FusionEngine().build_dendrogram(states, masses)
+    assert dendrogram.merges.shape == (len(states) - 1, 4)
+    assert dendrogram.merges[-1, 3] == len(states)
+    
+    dist = np.sqrt(np.square(states[:, None] - states[None]).sum(axis=2))
+    for threshold in (0.2, 0.5, 3.0, 100.0):
+        # Référence: composantes connexes du graphe des paires à distance < seuil
+        labels = np.arange(len(states))
+        for _ in range(len(states)):
+            linked = np.where(dist < threshold, labels[None, :], len(states)).min(axis=1)
+            if (linked == labels).all():
+                break
+            labels = linked
+        got = dendrogram.labels(threshold)
+        assert len(set(zip(labels.tolist(), got.tolist()))) == len(set(labels.tolist())) \
+            == dendrogram.n_clusters(threshold)
+    
+    centroids, cut_masses = dendrogram.cut(3.0)
+    assert len(centroids) == 3 and centroids.dtype == np.float32
+    assert abs(cut_masses.sum() - masses.sum()) < 1e-9
+    groups = np.split(np.arange(len(states)), 3)  # clusters générés, centres 0 < 5 < 10
+    expected = [(states[g] * masses[g, None]).sum(axis=0) / masses[g].sum() for g in groups]
+    assert np.allclose(centroids[np.argsort(centroids[:, 0])], expected, atol=1e-5)
+    
+    # Arbre borné (paires candidates < max_threshold): mêmes coupes jusqu'au seuil
+    wide = np.concatenate((states, rng.normal(0, 1, (len(states), 5))), axis=1)
+    for points in (states, wide):
+        exact = FusionEngine().build_dendrogram(points, masses)
+        bounded = FusionEngine().build_dendrogram(points, masses, max_threshold=1.0)
+        assert bounded.merges.shape == exact.merges.shape
+        for threshold in (0.2, 0.5, 1.0):
+            assert np.allclose(np.sort(bounded.gaps[bounded.gaps < threshold]),
+                               np.sort(exact.gaps[exact.gaps < threshold]))
+            assert len(set(zip(exact.labels(threshold).tolist(),
+                               bounded.labels(threshold).tolist()))) \
+                == exact.n_clusters(threshold) == bounded.n_clusters(threshold)
+    try:
+        bounded.cut(3.0)
+        assert False, "seuil au-delà de max_threshold accepté"
+    except ValueError:
+        pass
+    print(f"✅ test_fusion_dendrogram ({dendrogram.n_clusters(0.5)} clusters à 0.5)")
+
+def test_fusion_approximate():
+    """Test fusion approchée LSH en grande dimension contre la fusion exacte"""
+    rng = np.random.default_rng(1)
+    base = rng.normal(size=(80, 256))
+    base /= np.linalg.norm(base, axis=1, keepdims=True)
+    groups = rng.integers(0, 80, 400)
+    states = base[groups] + rng.normal(0, 0.001, (400, 256))
+    
+    engine = FusionEngine(threshold=0.05)
+    exact = engine.build_dendrogram(states).labels(0.05)
+    approx = engine.approximate_labels(states, tables=8, bits=8)
+    # Jamais de fusion erronée: chaque cluster approché est inclus dans un cluster exact
+    assert len(set(zip(approx.tolist(), exact.tolist()))) == len(set(approx.tolist()))
+    assert len(set(approx.tolist())) <= 1.05 * len(set(exact.tolist()))
+    
+    masses = rng.uniform(0.5, 2.0, len(states))
+    centroids, cut_masses = engine.compress_approximate(states, masses, tables=16, bits=4)
+    assert centroids.shape == (len(set(exact.tolist())), 256)
+    assert abs(cut_masses.sum() - masses.sum()) < 1e-9
+    print(f"✅ test_fusion_approximate ({len(states)} → {len(centroids)})")
+
 def main():
     print("="*70)
     print("Tests FusionEngine")
@@ -73,6 +142,8 @@ def main():
     test_fusion_clusters()
     test_fusion_mass()
     test_fusion_no_fusion()
+    test_fusion_dendrogram()
+    test_fusion_approximate()
     
     print("\n" + "="*70)
     print("✅ Tous les tests Fusion passés")
@@ -0,0 +1,82 @@
+"""
+Tests pour Observer et TrajectoryRecorder
+"""
+
+import sys
+sys.path.append('..')
+
+from nexus_stellar import Entity, System, Topology, Observer, TrajectoryRecorder
+import numpy as np
+import tempfile
+
+def test_observer_history():
+    """Test historique Observer"""
+    entities = [Entity(float(i)) for i in range(5)]
+    system = System(entities, topology=Topology.ring())
+    observer = Observer(metrics=['variance', 'frozen_ratio'], frequency=2)
+    system.attach_observer(observer)
+    system.run(steps=6)
+
+    history = observer.get_history()
+    assert [h['step'] for h in history] == [2, 4, 6]
+    assert 'frozen_ratio' in history[0]
+    print("✅ test_observer_history")
+
+def test_trajectory_recorder():
+    """Test enregistrement trajectoire memmap"""
+    with tempfile.TemporaryDirectory() as tmp:
+        entities = [Entity([float(i), 0.0]) for i in range(6)]
+        system = System(entities, topology=Topology.ring())
+        recorder = TrajectoryRecorder(tmp, max_frames=10, frequency=2)
+        system.attach_observer(recorder)
+        system.run(steps=8)
+        recorder.flush()
+
+        history = recorder.get_history()
+        assert history['states'].shape == (4, 6, 2)
+        assert list(history['step']) == [2, 4, 6, 8]
+        assert np.allclose(history['states'][-1][:, 0], system.get_states())
+
+        replay = TrajectoryRecorder.load(tmp)
+        assert isinstance(replay['states'], np.memmap)
+        assert replay['states'].shape == (4, 6, 2)
+        assert replay['frozen'].shape == (4, 6)
+        assert np.array_equal(replay['states'], history['states'])
+    print("✅ test_trajectory_recorder")
+
+def test_trajectory_recorder_float16_overflow():
+    """Test compression float16 et capacité max"""
+    with tempfile.TemporaryDirectory() as tmp:
+        entities = [Entity(float(i)) for i in range(4)]
+        system = System(entities, topology=Topology.ring())
+        recorder = TrajectoryRecorder(tmp, max_frames=3, dtype=np.float16,
+                                      record_velocities=False)
+        system.attach_observer(recorder)
+
+        import warnings
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            system.run(steps=5)
+
+        assert recorder.n_frames == 3
+        assert len(caught) == 1
+        replay = TrajectoryRecorder.load(tmp)
+        assert replay['states'].dtype == np.float16
+        assert replay['velocities'] is None
+    print("✅ test_trajectory_recorder_float16_overflow")
+
+def main():
+    print("="*70)
+    print("Tests Observer")
+    print("="*70 + "\n")
+
+    test_observer_history()
+    test_trajectory_recorder()
+    test_trajectory_recorder_float16_overflow()
+
+    print("\n" + "="*70)
+    print("✅ Tous les tests Observer passés")
+    print("="*70)
+
+if __name__ == "__main__":
+    main()
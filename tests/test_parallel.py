@@ -0,0 +1,156 @@
+"""
+Tests pour l'exécution parallèle (processus, threads, asyncio)
+"""
+
+import sys
+sys.path.append('..')
+
+from nexus_stellar import System, Force, Topology, Attractor, ShardedExecutor
+import numpy as np
+import asyncio
+
+def test_sharded_matches_sequential():
+    """Test exécution multi-processus identique à l'exécution séquentielle"""
+    rng = np.random.default_rng(0)
+    states = rng.uniform(0, 100, 3000)
+    
+    sequential = System.from_arrays(states, topology=Topology.small_world())
+    sequential.add_attractor(Attractor(position=50.0, strength=0.05))
+    sharded = System.from_arrays(states, topology=Topology.from_graph(*sequential._neighbor_graph()))
+    sharded.add_attractor(Attractor(position=50.0, strength=0.05))
+    
+    sequential.run(steps=40)
+    sharded.run_sharded(steps=40, workers=3)
+    
+    assert sharded.get_states() == sequential.get_states()
+    assert sharded.frozen_ratio() == sequential.frozen_ratio()
+    assert sharded.step_count == 40
+    assert sharded.update_count == sequential.update_count > 0
+    print("✅ test_sharded_matches_sequential")
+
+def test_sharded_executor_reuse():
+    """Test workers persistants sur plusieurs appels run()"""
+    states = np.arange(400, dtype=np.float32)
+    sequential = System.from_arrays(states, topology=Topology.grid_2d(20))
+    sharded = System.from_arrays(states, topology=Topology.grid_2d(20))
+    
+    with ShardedExecutor(sharded, workers=4) as executor:
+        executor.run(10)
+        sharded.entities[0].state[0] = -50.0  # modification entre deux appels
+        executor.run(10)
+    
+    sequential.run(steps=10)
+    sequential.entities[0].state[0] = -50.0
+    sequential.run(steps=10)
+    assert sharded.get_states() == sequential.get_states()
+    print("✅ test_sharded_executor_reuse")
+
+def test_sharded_rejects_gravity():
+    """Test gravité Barnes-Hut refusée par l'exécution multi-processus"""
+    system = System.from_arrays(np.linspace(0, 10, 50), force=Force.gravity(),
+                                topology=Topology.full())
+    try:
+        ShardedExecutor(system, workers=2)
+        assert False, "ValueError attendue"
+    except ValueError:
+        pass
+    print("✅ test_sharded_rejects_gravity")
+
+def test_native_run_matches_step():
+    """Test boucle native (run) identique à step() répété, gel compris"""
+    rng = np.random.default_rng(1)
+    states = rng.uniform(0, 100, 500)
+    graph = System.from_arrays(states, topology=Topology.small_world())._neighbor_graph()
+    
+    looped = System.from_arrays(states, topology=Topology.from_graph(*graph))
+    native = System.from_arrays(states, topology=Topology.from_graph(*graph))
+    for _ in range(60):
+        looped.step()
+    native.run(steps=60)
+    
+    assert native.step_count == looped.step_count == 60
+    assert np.array_equal(native._store.states, looped._store.states)
+    assert np.array_equal(native._store.frozen, looped._store.frozen)
+    assert np.array_equal(native._store.stability, looped._store.stability)
+    print("✅ test_native_run_matches_step")
+
+def test_run_async_threads():
+    """Test run_async: plusieurs Systems en parallèle (threads), résultats identiques"""
+    rng = np.random.default_rng(2)
+    batches = [rng.uniform(0, 100, 800) for _ in range(4)]
+    
+    expected = []
+    for states in batches:
+        system = System.from_arrays(states, topology=Topology.ring())
+        system.run(steps=50)
+        expected.append(system._store.states.copy())
+    
+    systems = [System.from_arrays(states, topology=Topology.ring()) for states in batches]
+    futures = [system.run_async(steps=50) for system in systems]
+    for future, system, ref in zip(futures, systems, expected):
+        assert future.result() is system
+        assert np.array_equal(system._store.states, ref)
+    
+    # Deux runs concurrents du même System sont sérialisés
+    system = System.from_arrays(batches[0], topology=Topology.ring())
+    first, second = system.run_async(steps=25), system.run_async(steps=25)
+    first.result(); second.result()
+    assert system.step_count == 50
+    assert np.array_equal(system._store.states, expected[0])
+    print("✅ test_run_async_threads")
+
+def test_astep_astream():
+    """Test API asyncio: astep, astream (vues lecture seule), annulation"""
+    states = np.linspace(0, 100, 300)
+    reference = System.from_arrays(states, topology=Topology.ring())
+    reference.run(steps=31)
+    
+    async def scenario():
+        system = System.from_arrays(states, topology=Topology.ring())
+        await system.astep()
+        steps = []
+        async for view in system.astream(30, every=8):
+            assert not view.flags.writeable
+            assert np.shares_memory(view, system._store.states)
+            steps.append(system.step_count)
+        assert steps == [9, 17, 25, 31]
+        assert np.array_equal(system._store.states, reference._store.states)
+        
+        # Annulation: le bloc en cours se termine, aucun autre ne démarre
+        slow = System.from_arrays(np.linspace(0, 100, 20000), topology=Topology.ring())
+        async def consume():
+            async for _ in slow.astream(10_000, every=10):
+                pass
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        count = slow.step_count
+        assert count % 10 == 0 and count < 10_000
+        await asyncio.sleep(0.01)
+        assert slow.step_count == count
+    
+    asyncio.run(scenario())
+    print("✅ test_astep_astream")
+
+def main():
+    print("="*70)
+    print("Tests Exécution Parallèle")
+    print("="*70 + "\n")
+    
+    test_sharded_matches_sequential()
+    test_sharded_executor_reuse()
+    test_sharded_rejects_gravity()
+    test_native_run_matches_step()
+    test_run_async_threads()
+    test_astep_astream()
+    
+    print("\n" + "="*70)
+    print("✅ Tous les tests parallèles passés")
+    print("="*70)
+
+if __name__ == "__main__":
+    main()
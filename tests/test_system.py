@@ -5,8 +5,11 @@ Tests pour la classe System
 import sys
 sys.path.append('..')
 
-from nexus_stellar import Entity, System, Force, Topology
+from nexus_stellar import Entity, System, Force, Topology, Attractor, Observer, FusionEngine
+from nexus_stellar import pairwise_distances, knn_query, radius_query
 import numpy as np
+import os
+import tempfile
 
 def test_system_creation():
     """Test création système"""
@@ -80,6 +83,703 @@ def test_system_states():
     assert states[4] == 4.0
     print("✅ test_system_states")
 
+def test_system_topology_cache():
+    """Test graphe de voisinage construit une seule fois"""
+    calls = []
+    
+    def ring(entity_id, entities):
+        calls.append(entity_id)
+        n = len(entities)
+        return [(entity_id - 1) % n, (entity_id + 1) % n]
+    
+    entities = [Entity(float(i)) for i in range(5)]
+    system = System(entities, topology=Topology.custom(ring))
+    system.run(steps=3)
+    assert len(calls) == 5
+    
+    system.rebuild_topology()
+    system.step()
+    assert len(calls) == 10
+    print("✅ test_system_topology_cache")
+
+def test_system_small_world_shortcuts():
+    """Test raccourcis small_world figés avec le graphe (dynamic=True: retirés à chaque step)"""
+    states = np.arange(200, dtype=np.float32)
+    frozen = System.from_arrays(states, topology=Topology.small_world(), freeze_enabled=False)
+    frozen.step()
+    graph = [g.copy() for g in frozen._neighbor_graph()]
+    frozen.run(steps=5)
+    assert all(np.array_equal(a, b) for a, b in zip(graph, frozen._neighbor_graph()))
+    frozen.rebuild_topology()
+    assert not np.array_equal(graph[0], frozen._neighbor_graph()[0])
+    
+    redrawn = System.from_arrays(states, topology=Topology.small_world(dynamic=True))
+    first = redrawn._neighbor_graph()[0].copy()
+    assert not np.array_equal(first, redrawn._neighbor_graph()[0])
+    print("✅ test_system_small_world_shortcuts")
+
+def test_system_checkpoint():
+    """Test checkpoint / restauration"""
+    entities = [Entity(float(i * 10), properties={'name': f's{i}'}) for i in range(8)]
+    system = System(entities, topology=Topology.small_world())
+    system.add_attractor(Attractor(position=25.0, strength=0.5))
+    system.add_attractors([5.0, 60.0], strengths=0.2)
+    system.run(steps=10)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "system.ckpt")
+        system.save_checkpoint(path)
+        restored = System.load_checkpoint(path)
+        
+        assert restored.step_count == 10
+        assert restored.get_states() == system.get_states()
+        assert [e.is_frozen for e in restored.entities] == [e.is_frozen for e in system.entities]
+        assert restored.entities[3].properties['name'] == 's3'
+        assert [(a.position, a.strength) for a in restored.attractors] == [(25.0, 0.5)]
+        
+        system.step()
+        restored.step()
+        assert restored.get_states() == system.get_states()
+        
+        system.run(steps=9)
+        restored.run(steps=9)
+        assert restored.get_states() == system.get_states()
+        assert restored.step_count == 20
+    print("✅ test_system_checkpoint")
+
+def test_system_empty():
+    """Test System sans entité: stockage vide de dimension 1"""
+    system = System([])
+    assert system.get_states() == [] and len(system.entities) == 0
+    system.run(steps=3)
+    assert system.step_count == 3
+    
+    system.add_entities(states=[1.0, 2.0])
+    system.run(steps=2)
+    assert len(system.get_states()) == 2
+    print("✅ test_system_empty")
+
+def test_system_from_arrays():
+    """Test construction vectorisée sans objets Entity"""
+    states = np.arange(1000, dtype=np.float32) * 0.1
+    masses = np.full(1000, 2.0)
+    system = System.from_arrays(states, masses=masses, topology=Topology.ring())
+    
+    assert len(system.entities) == 1000
+    assert 500 not in system._store.objects  # rien matérialisé
+    
+    e = system.entities[500]
+    assert abs(e.state[0] - 50.0) < 1e-4
+    assert e.mass == 2.0
+    assert system.entities[500] is e
+    assert system.entities[-1].state[0] == states[-1]
+    
+    system.run(steps=5)
+    assert system.step_count == 5
+    assert states[0] == 0.0  # tableau source copié
+    print("✅ test_system_from_arrays")
+
+def test_system_local_indexing():
+    """Test indices locaux indépendants de Entity.id"""
+    first = System([Entity(float(i)) for i in range(10)], topology=Topology.full())
+    entities = [Entity(float(i * 10)) for i in range(10)]
+    second = System(entities, topology=Topology.full())
+    assert entities[0].id >= 10
+    
+    neighbors, counts = second._neighbor_graph()
+    assert counts.tolist() == [9] * 10
+    assert neighbors.max() == 9
+    
+    initial_var = second.variance()
+    second.run(steps=20)
+    assert second.variance() < initial_var
+    
+    assert second.index_of(entities[7].id) == 7
+    try:
+        second.index_of(first.entities[0].id)
+        assert False, "id étranger accepté"
+    except KeyError:
+        pass
+    print("✅ test_system_local_indexing")
+
+def test_topology_builders():
+    """Test graphes vectorisés identiques aux fonctions par entité"""
+    states = np.zeros((11, 1), dtype=np.float32)
+    entities = [Entity(0.0) for _ in range(11)]
+    
+    for topo in [Topology.ring(), Topology.full(), Topology.grid_2d(4, 3)]:
+        neighbors, counts = topo.build(states)
+        expected = [topo.get_neighbors(i, entities) for i in range(11)]
+        assert counts.tolist() == [len(x) for x in expected]
+        assert neighbors.tolist() == [j for x in expected for j in x]
+    
+    bad = Topology.custom(lambda i, ents: [i + 100])
+    try:
+        bad.build(states, entities)
+        assert False, "voisin hors limites accepté"
+    except ValueError:
+        pass
+    print("✅ test_topology_builders")
+
+def _graph_rows(graph):
+    neighbors, counts = graph
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    return [sorted(neighbors[offsets[i]:offsets[i + 1]].tolist()) for i in range(len(counts))]
+
+def test_topology_radius_knn():
+    """Test Topology.radius/knn (cell lists + Verlet) contre la force brute"""
+    rng = np.random.default_rng(3)
+    points = rng.uniform(0, 10, (400, 2)).astype(np.float32)
+    entities = [Entity(p.tolist()) for p in points]
+    
+    radius, knn = Topology.radius(0.8), Topology.knn(5)
+    assert radius.dynamic and knn.dynamic
+    for moved in [points, points + rng.normal(0, 0.01, points.shape).astype(np.float32)]:
+        for topo in (radius, knn):
+            rows = _graph_rows(topo.build(moved))
+            for e, p in zip(entities, moved):
+                e.state = p
+            assert rows == [sorted(topo.get_neighbors(i, entities)) for i in range(len(points))]
+    
+    # Petit déplacement (< skin/2): candidats réutilisés, pas de reconstruction
+    candidates = radius.builder.rows
+    radius.build(points + 0.01)
+    assert radius.builder.rows is candidates
+    radius.build(points + 1.0)
+    assert radius.builder.rows is not candidates
+    
+    system = System.from_arrays(rng.uniform(0, 50, 300), topology=Topology.radius(2.0))
+    system.run(steps=30)
+    assert system.step_count == 30
+    print("✅ test_topology_radius_knn")
+
+def test_distance_queries():
+    """Test distances par blocs BLAS et requêtes kNN/rayon contre la force brute"""
+    rng = np.random.default_rng(5)
+    points = rng.normal(1000, 5, (700, 3))  # loin de l'origine: centrage
+    queries = rng.normal(1000, 5, (90, 3))
+    exact = np.sqrt(np.square(queries[:, None] - points[None]).sum(axis=2))
+    assert np.allclose(pairwise_distances(queries, points), exact, atol=1e-9)
+    self_exact = np.sqrt(np.square(points[:, None] - points[None]).sum(axis=2))
+    assert np.allclose(pairwise_distances(points, tile_bytes=4096), self_exact, atol=1e-9)
+    np.fill_diagonal(self_exact, np.inf)
+    
+    for tile_bytes in (4096, 1 << 20):  # tuiles minuscules: fusion top-k multi-tuiles
+        indices, distances = knn_query(points, 6, tile_bytes=tile_bytes)
+        expected = np.argsort(self_exact, axis=1, kind='stable')[:, :6]
+        assert (indices == expected).all()
+        assert np.allclose(distances, np.take_along_axis(self_exact, expected, axis=1))
+        assert (knn_query(points, 4, queries, tile_bytes)[0] == np.argsort(exact, axis=1)[:, :4]).all()
+        
+        neighbors, counts, dist = radius_query(points, 1.5, return_distances=True,
+                                               tile_bytes=tile_bytes)
+        rows, cols = np.nonzero(self_exact <= 1.5)
+        assert neighbors.tolist() == cols.tolist()
+        assert counts.tolist() == np.bincount(rows, minlength=len(points)).tolist()
+        assert np.allclose(dist, self_exact[rows, cols])
+    
+    system = System.from_arrays(points[:, :2], topology=Topology.radius(1.0))
+    assert _graph_rows(system.radius_query(1.0)) == _graph_rows(system.topology.build(system._store.states))
+    assert system.knn_query(3)[0].shape == (700, 3)
+    assert system.pairwise_distances([0, 1]).shape == (2, 2)
+    print("✅ test_distance_queries")
+
+def test_system_gravity_barnes_hut():
+    """Test gravité Barnes-Hut: erreur relative contre la somme exacte O(N²)"""
+    rng = np.random.default_rng(4)
+    positions = rng.normal(0, 10, (600, 2))
+    masses = rng.uniform(0.5, 2.0, 600)
+    system = System.from_arrays(positions, masses=masses, force=Force.gravity(2.0, theta=0.5),
+                                topology=Topology.full(), freeze_enabled=False)
+    
+    p = system._store.states.astype(np.float64)
+    m = system._store.masses.astype(np.float64)
+    diff = p[None, :, :] - p[:, None, :]
+    dist = np.maximum(np.sqrt(np.square(diff).sum(axis=2)), 0.01)
+    exact = 2.0 * (m[None, :, None] * diff / dist[:, :, None] ** 3).sum(axis=1)
+    
+    errors = {}
+    for theta in (0.0, 0.3, 0.5, 1.0):
+        approx = system.gravity_field(theta=theta)
+        errors[theta] = (np.linalg.norm(approx - exact, axis=1).mean()
+                         / np.linalg.norm(exact, axis=1).mean())
+    print("   erreur relative:", {t: f"{e:.2e}" for t, e in errors.items()})
+    assert errors[0.0] < 1e-5
+    assert errors[0.3] <= errors[0.5] <= errors[1.0] < 0.05
+    assert errors[0.5] < 0.01
+    
+    before = system._store.states.copy()
+    system.run(steps=3)
+    assert system.step_count == 3
+    assert not np.allclose(system._store.states[:, 1], before[:, 1])
+    print("✅ test_system_gravity_barnes_hut")
+
+def test_system_weighted_edges():
+    """Test arêtes pondérées: noyau natif, poids unitaires, checkpoint, batch"""
+    from nexus_stellar import SystemBatch
+    rng = np.random.default_rng(5)
+    states = rng.uniform(0, 100, 50)
+    latency = lambda st, rows, cols: 1.0 / (1.0 + np.abs(st[rows, 0] - st[cols, 0]))
+    
+    plain = System.from_arrays(states, topology=Topology.ring(), freeze_enabled=False)
+    ones = System.from_arrays(states, topology=Topology.ring().with_weights(
+        lambda st, rows, cols: np.ones(len(rows))), freeze_enabled=False)
+    plain.run(steps=10)
+    ones.run(steps=10)
+    assert np.array_equal(plain._store.states, ones._store.states)
+    
+    weighted = System.from_arrays(states, topology=Topology.ring().with_weights(latency),
+                                  momentum=0.0, freeze_enabled=False)
+    neighbors, counts = weighted._neighbor_graph()
+    w = weighted._weights
+    assert w.dtype == np.float32 and w.shape == neighbors.shape
+    s0 = weighted._store.states[:, 0].astype(np.float64)
+    rows = np.repeat(np.arange(50), counts)
+    expected = s0 + np.bincount(rows, w * (s0[neighbors] - s0[rows]) * 0.5, minlength=50) / counts
+    weighted.step()
+    assert np.allclose(weighted._store.states[:, 0], expected, atol=1e-4)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'weighted.nxs')
+        weighted.save_checkpoint(path)
+        restored = System.load_checkpoint(path)
+        assert np.array_equal(restored._weights, weighted._weights)
+        restored.run(steps=5)
+    
+    solo = System.from_arrays(states, topology=Topology.from_graph(neighbors, counts, w),
+                              freeze_enabled=False)
+    batched = System.from_arrays(states, topology=Topology.from_graph(neighbors, counts, w),
+                                 freeze_enabled=False)
+    SystemBatch([batched, System.from_arrays(states[:10])]).run(steps=5)
+    solo.run(steps=5)
+    assert np.array_equal(solo._store.states, batched._store.states)
+    
+    solo.remove_entities([0])
+    assert len(solo._weights) == len(solo._graph[0])
+    solo.run(steps=2)
+    print("✅ test_system_weighted_edges")
+
+def test_system_reorder():
+    """Test reorder RCM/Morton: bande réduite, résultats et ordre d'origine conservés"""
+    from nexus_stellar import _csr_from_edges
+    rng = np.random.default_rng(6)
+    width, n = 30, 900
+    neighbors, counts = Topology.grid_2d(width).build(np.zeros((n, 1), dtype=np.float32))
+    perm = rng.permutation(n)
+    inverse = np.argsort(perm)
+    scrambled = _csr_from_edges(inverse[np.repeat(np.arange(n), counts)], inverse[neighbors], n)
+    states = rng.uniform(0, 100, n)
+    
+    reference = System.from_arrays(states, topology=Topology.from_graph(*scrambled))
+    reordered = System.from_arrays(states, topology=Topology.from_graph(*scrambled))
+    tracked = reordered.entities[7]
+    report = reordered.reorder('rcm')
+    assert report['bandwidth_after'] <= 2 * width < report['bandwidth_before']
+    assert report['mean_span_after'] < report['mean_span_before']
+    assert reordered.get_states() == reference.get_states()
+    
+    reference.run(steps=20)
+    reordered.run(steps=20)
+    assert reordered.get_states() == reference.get_states()
+    assert tracked.state[0] == np.float32(reference.get_states()[7])
+    
+    reordered.remove_entities([0])
+    assert sorted(reordered._order.tolist()) == list(range(n - 1))
+    
+    points = rng.uniform(0, 10, (400, 2))
+    spatial = System.from_arrays(points, topology=Topology.knn(4))
+    spatial.topology = Topology.from_graph(*spatial._neighbor_graph())
+    report = spatial.reorder('morton')
+    assert report['mean_span_after'] < report['mean_span_before']
+    assert spatial.get_states() == points[:, 0].astype(np.float32).tolist()
+    print("✅ test_system_reorder")
+
+def test_system_reorder_add_remove():
+    """Test reorder puis ajout/retrait: topologie d'origine conservée, résultats identiques"""
+    rng = np.random.default_rng(11)
+    states = rng.uniform(0, 100, 10)
+    close = lambda i, entities: [j for j in range(len(entities)) if j != i and
+                                 abs(entities[j].state[0] - entities[i].state[0]) < 30]
+    for make in (Topology.ring, lambda: Topology.grid_2d(4), lambda: Topology.custom(close)):
+        plain = System.from_arrays(states, topology=make(), freeze_enabled=False)
+        reordered = System.from_arrays(states, topology=make(), freeze_enabled=False)
+        original = reordered.topology
+        reordered.reorder('rcm')
+        assert reordered.topology is original
+        
+        for system in (plain, reordered):
+            system.run(steps=3)
+            system.add_entities(states=[50.0, 60.0])
+            system.run(steps=5)
+            system.remove_entities([11])
+            system.run(steps=5)
+            system.rebuild_topology()
+            system.run(steps=2)
+        assert reordered.get_states() == plain.get_states()
+    print("✅ test_system_reorder_add_remove")
+
+def test_system_solve_consensus():
+    """Test solveur Laplacien: même point fixe que la dynamique, en moins de sweeps"""
+    rng = np.random.default_rng(7)
+    states = rng.uniform(0, 100, 100)
+    
+    def grid_system():
+        system = System.from_arrays(states, topology=Topology.grid_2d(10), freeze_enabled=False)
+        system._store.frozen[[0, 55, 99]] = 1
+        system.add_attractor(Attractor(position=30.0, strength=0.02))
+        return system
+    iterated, solved = grid_system(), grid_system()
+    iterated.run(steps=3000)
+    info = solved.solve_consensus()
+    assert info['method'] == 'cg' and info['iterations'] < 300
+    assert np.allclose(solved.get_states(), iterated.get_states(), atol=1e-3)
+    assert solved.get_states()[55] == np.float32(states[55])
+    
+    # Composante flottante (aucune entité gelée): valeur conservée par la dynamique
+    ring = System.from_arrays(states, topology=Topology.ring())
+    ring.solve_consensus()
+    assert np.allclose(ring.get_states(), np.float32(states).mean(), atol=1e-3)
+    
+    # Graphe orienté (raccourcis small-world): BiCGSTAB, équations du point fixe
+    graph = System.from_arrays(states, topology=Topology.small_world())._neighbor_graph()
+    directed = System.from_arrays(states, topology=Topology.from_graph(*graph))
+    directed._store.frozen[[0, 50]] = 1
+    assert directed.solve_consensus(tol=1e-9)['method'] == 'bicgstab'
+    x = np.array(directed.get_states(), dtype=np.float64)
+    rows = np.repeat(np.arange(100), graph[1])
+    residual = np.bincount(rows, x[graph[0]] - x[rows], minlength=100)
+    residual[[0, 50]] = 0.0
+    assert np.abs(residual).max() < 1e-3
+    
+    floating = System.from_arrays(states, topology=Topology.from_graph(*graph))
+    try:
+        floating.solve_consensus()
+        assert False, "composante flottante orientée acceptée"
+    except ValueError:
+        pass
+    print("✅ test_system_solve_consensus")
+
+def test_system_profile():
+    """Test profiler par phase: totaux, compteurs, historique, export"""
+    system = System.from_arrays(np.arange(100, dtype=np.float32), topology=Topology.ring(),
+                                freeze_enabled=False)
+    records = []
+    
+    with system.profile(callback=records.append) as prof:
+        system.run(10)  # un seul appel natif
+        system.attach_observer(Observer())
+        system.run(2)   # un enregistrement par step
+    
+    assert system.profiler is None
+    report = prof.to_dict()
+    assert report['counters']['steps'] == 12
+    assert report['counters']['records'] == 3 == len(records)
+    assert report['counters']['edges_processed'] == 12 * 200
+    assert report['counters']['bytes_allocated'] > 0  # graphe construit au premier step
+    assert report['totals_ns']['kernel'] > 0 and report['totals_ns']['observers'] > 0
+    assert records[0]['steps'] == 10 and records[0]['active'] == 100
+    assert records[1]['observers'] > 0 and records[1]['bytes'] == 0
+    
+    text = prof.to_openmetrics()
+    assert 'nexus_stellar_phase_seconds_total{phase="kernel"}' in text
+    assert 'nexus_stellar_steps_total 12' in text and text.endswith("# EOF\n")
+    print("✅ test_system_profile")
+
+def test_system_dtype():
+    """Test précision float64 (noyaux f64) et stockage float16 (calcul float32)"""
+    rng = np.random.default_rng(0)
+    states = rng.uniform(0, 100, 500) + 1e7  # grandes magnitudes: float32 dérive
+    
+    runs = {}
+    for dtype in (np.float64, np.float32):
+        system = System.from_arrays(states, topology=Topology.ring(), dtype=dtype,
+                                    freeze_enabled=False)
+        system.add_attractors([1e7 + 50], 0.01)
+        system.run(100)
+        assert system.dtype == dtype and system._store.states.dtype == dtype
+        runs[dtype] = np.array(system.get_states())
+    
+    # Référence float64 calculée en Python (même schéma de Jacobi)
+    x, v = states.copy(), np.zeros_like(states)
+    for _ in range(100):
+        force = 0.5 * ((np.roll(x, 1) + np.roll(x, -1)) / 2 - x) + 0.01 * (1e7 + 50 - x)
+        v = 0.8 * v + 0.2 * force
+        x = x + v
+    assert np.allclose(runs[np.float64], x, rtol=0, atol=1e-6)
+    assert np.abs(runs[np.float32] - x).max() > 1e-3
+    
+    half = System.from_arrays(states - 1e7, topology=Topology.ring(), dtype=np.float16)
+    half.run(50)
+    context = half._context[0]
+    half.step()
+    assert half._context[0] is context  # copies float32 persistantes: pas de reliaison
+    assert half._store.states.dtype == np.float16 and half.step_count == 51
+    assert abs(half.variance() - np.var(half._store.states.astype(np.float64))) < 1e-2
+    
+    engine = FusionEngine(threshold=1.0, dtype=np.float64)
+    merged, masses = engine.compress_arrays(np.array([0.0, 0.5, 10.0]))
+    assert merged.dtype == np.float64 and masses.tolist() == [2.0, 1.0]
+    print("✅ test_system_dtype")
+
+def test_system_fork():
+    """Test fork copy-on-write: buffers partagés jusqu'à la première écriture"""
+    states = np.arange(200, dtype=np.float32)
+    system = System.from_arrays(states, topology=Topology.ring())
+    system.run(3)
+    
+    fork = system.fork()
+    assert fork._store.states.base is system._store.states.base  # aucune copie
+    assert fork._graph is system._graph
+    
+    fork.entities[0].state = -100.0
+    fork.run(10)
+    assert system.get_states() != fork.get_states()
+    reference = System.from_arrays(states, topology=Topology.ring())
+    reference.run(3)
+    assert system.get_states() == reference.get_states()  # original intact
+    
+    system.run(10)
+    reference.run(10)
+    assert system.get_states() == reference.get_states()
+    assert fork.entities[0].state[0] != system.entities[0].state[0]
+    
+    # Fork d'un fork, retrait d'entités indépendant
+    grandchild = fork.fork()
+    grandchild.remove_entities([0, 1])
+    assert len(grandchild.entities) == 198 and len(fork.entities) == 200
+    print("✅ test_system_fork")
+
+def test_system_fork_views():
+    """Test fork: vues prises avant le fork et écritures en place des deux côtés"""
+    system = System.from_arrays(np.arange(10.), topology=Topology.ring())
+    view = system.entities[0].state
+    fork = system.fork()
+    view[0] = 99.0
+    assert system.get_states()[0] == 99.0 and fork.get_states()[0] == 0.0
+    
+    system.entities[1].state[0] = -1.0
+    fork.entities[2].state[0] = -2.0
+    fork.entities[3].velocity[0] = 0.5
+    assert system.get_states()[1:4] == [-1.0, 2.0, 3.0]
+    assert fork.get_states()[1:4] == [1.0, -2.0, 3.0]
+    assert fork.entities[3].velocity[0] == 0.5 and system.entities[3].velocity[0] == 0.0
+    
+    # Fork d'un fork sans vue remise: buffers toujours partagés
+    grandchild = fork.fork()
+    assert grandchild._store.masses.base is fork._store.masses.base
+    print("✅ test_system_fork_views")
+
+def test_system_update_states():
+    """Test injection de mesures: dégel des entités écrites et de leurs k-hop voisins"""
+    system = System.from_arrays(np.full(100, 50.0), topology=Topology.ring())
+    system.run(20)
+    assert system.frozen_ratio() == 1.0
+    
+    reactivated = system.update_states([10], [80.0], hops=2)
+    assert reactivated.tolist() == [8, 9, 10, 11, 12]
+    assert system.entities[10].state[0] == 80.0 and not system.entities[10].is_frozen
+    assert system.entities[13].is_frozen
+    
+    system.step()
+    states = system.get_states()
+    assert states[10] < 80.0 and states[9] > 50.0  # reconvergence locale
+    assert states[7] == 50.0 and states[13] == 50.0  # hors voisinage: intact
+    
+    # Graphe orienté: seules les entités qui dépendent de l'entité écrite
+    directed = Topology.from_graph(np.array([1, 2, 0], dtype=np.int32),
+                                   np.array([1, 1, 1], dtype=np.int32))
+    system = System.from_arrays([1.0, 2.0, 3.0], topology=directed)
+    system._store.frozen[:] = 1
+    assert system.update_states([2], [9.0], hops=1).tolist() == [1, 2]
+    print("✅ test_system_update_states")
+
+def test_system_relax():
+    """Test ordonnanceur asynchrone: même point fixe en moins de mises à jour"""
+    rng = np.random.default_rng(0)
+    states = rng.uniform(0, 100, 2000)
+    synchronous = System.from_arrays(states, topology=Topology.small_world())
+    graph = synchronous._neighbor_graph()
+    synchronous.run(500)
+    
+    for schedule in ('priority', 'worklist'):
+        system = System.from_arrays(states, topology=Topology.from_graph(*graph))
+        info = system.relax(tol=1e-3, schedule=schedule)
+        assert info['converged'] and info['residual'] <= 1e-3
+        assert system.update_count == info['updates'] < synchronous.update_count
+        assert system.variance() < synchronous.variance()
+    
+    # Entités gelées: conditions aux limites fixes
+    system = System.from_arrays([0.0, 5.0, 5.0, 10.0], topology=Topology.ring())
+    system._store.frozen[[0, 3]] = 1
+    system._store.frozen[[1, 2]] = 0
+    system.relax(tol=1e-6)
+    assert np.allclose(system.get_states(), [0.0, 10 / 3, 20 / 3, 10.0], atol=1e-3)
+    print("✅ test_system_relax")
+
+def test_system_bound_context():
+    """Test contexte natif lié: réutilisé entre steps, relié si un tampon ou paramètre change"""
+    states = np.linspace(0, 100, 10)
+    system = System.from_arrays(states, topology=Topology.ring(), freeze_enabled=False)
+    reference = System.from_arrays(states, topology=Topology.ring(), freeze_enabled=False)
+    
+    system.step()
+    context = system._context[0]
+    system.run(5)
+    assert system._context[0] is context and context.steps == 5
+    
+    system.momentum = 0.5
+    system.step()
+    assert system._context[0] is not context
+    
+    fork = system.fork()  # copy-on-write: chacun se relie à ses propres tampons
+    system.step()
+    fork.step()
+    assert np.allclose(system.get_states(), fork.get_states())
+    system.add_entities(states=[50.0])
+    system.step()
+    assert system._context[0].n_entities == 11
+    
+    # Même trajectoire qu'un contexte relié à chaque step
+    for step in range(8):
+        reference.momentum = 0.8 if step < 6 else 0.5
+        reference._context = None
+        reference.step()
+    assert reference.get_states() == fork.get_states()
+    print("✅ test_system_bound_context")
+
+def test_system_add_remove_entities():
+    """Test ajout/retrait dynamique avec patch du graphe"""
+    servers = [Entity(float(i * 10)) for i in range(6)]
+    system = System(servers, topology=Topology.full())
+    system.step()
+    
+    added = system.add_entities([Entity(100.0), Entity(200.0)])
+    assert added.tolist() == [6, 7]
+    assert len(system.entities) == 8
+    assert _graph_rows(system._graph) == _graph_rows(Topology.full().build(system._store.states))
+    
+    drained = servers[1]
+    last_state = float(drained.state[0])
+    remap = system.remove_entities([drained, 3])
+    assert remap[1] == -1 and remap[3] == -1
+    assert len(system.entities) == 6
+    assert drained.state[0] == last_state  # redevenue autonome
+    assert drained._store is None
+    assert _graph_rows(system._graph) == _graph_rows(Topology.full().build(system._store.states))
+    
+    # Les entités déplacées suivent leur nouvel indice
+    assert system.entities[remap[7]].state[0] == 200.0
+    assert system.index_of(servers[5].id) == 5
+    
+    system.run(steps=5)
+    assert system.step_count == 6
+    print("✅ test_system_add_remove_entities")
+
+def test_system_add_entities_growth():
+    """Test croissance amortie du stockage"""
+    system = System.from_arrays(np.zeros(10), topology=Topology.ring())
+    capacities = set()
+    for _ in range(100):
+        system.add_entities(states=np.ones(1))
+        capacities.add(system._store.capacity)
+    assert len(system.entities) == 110
+    assert len(capacities) <= 5  # doublements successifs
+    assert system.get_states()[-1] == 1.0
+    print("✅ test_system_add_entities_growth")
+
+def test_system_add_entities_graph():
+    """Test graphe après add_entities identique à une reconstruction (topologies intégrées)"""
+    import random
+    rng = np.random.default_rng(12)
+    states = rng.uniform(0, 10, (12, 2))
+    added = rng.uniform(0, 10, (3, 2))
+    base = Topology.ring().build(states)
+    topologies = {
+        'ring': Topology.ring,
+        'full': Topology.full,
+        'grid_2d': lambda: Topology.grid_2d(4),
+        'small_world': Topology.small_world,
+        'graph': lambda: Topology.from_graph(*base),
+        'radius': lambda: Topology.radius(3.0),
+        'knn': lambda: Topology.knn(3),
+    }
+    for name, make in topologies.items():
+        random.seed(0)
+        patched = System.from_arrays(states, topology=make())
+        patched._neighbor_graph()
+        random.seed(0)
+        patched.add_entities(states=added)
+        graph = patched._neighbor_graph()
+        random.seed(0)
+        rebuilt = System.from_arrays(np.concatenate((states, added)), topology=make())
+        for a, b in zip(graph, rebuilt._neighbor_graph()):
+            assert np.array_equal(a, b), name
+    print("✅ test_system_add_entities_graph")
+
+def test_system_attractors():
+    """Test attracteur le plus proche appliqué dans le noyau"""
+    isolated = Topology.custom(lambda i, entities: [])
+    system = System([Entity(2.4), Entity(4.0)], topology=isolated,
+                    momentum=0.8, freeze_enabled=False)
+    for pos in [5.0, 0.0, 2.0]:
+        system.add_attractor(Attractor(position=pos, strength=1.0))
+    
+    assert system._attractor_positions.tolist() == [0.0, 2.0, 5.0]
+    system.step()
+    states = system.get_states()
+    assert abs(states[0] - (2.4 + 0.2 * (2.0 - 2.4))) < 1e-5
+    assert abs(states[1] - (4.0 + 0.2 * (5.0 - 4.0))) < 1e-5
+    print("✅ test_system_attractors")
+
+def test_system_many_attractors():
+    """Test champ de 100K attracteurs (recherche binaire)"""
+    rng = np.random.default_rng(0)
+    states = rng.uniform(0, 1000, 100_000).astype(np.float32)
+    positions = rng.uniform(0, 1000, 100_000).astype(np.float32)
+    
+    isolated = Topology.from_graph(np.empty(0), np.empty(0))
+    system = System.from_arrays(states, topology=isolated, freeze_enabled=False)
+    system.add_attractors(positions, strengths=0.5)
+    system.step()
+    
+    sorted_pos = np.sort(positions)
+    idx = np.clip(np.searchsorted(sorted_pos, states), 1, len(sorted_pos) - 1)
+    left, right = sorted_pos[idx - 1], sorted_pos[idx]
+    nearest = np.where(states - left <= right - states, left, right)
+    expected = states + 0.2 * 0.5 * (nearest - states)
+    assert np.allclose(system.get_states(), expected, atol=1e-3)
+    print("✅ test_system_many_attractors")
+
+def test_system_force_strength():
+    """Test intensité de Force.attraction transmise au noyau"""
+    one_way = Topology.custom(lambda i, entities: [1] if i == 0 else [])
+    for strength in (0.2, 0.9):
+        system = System([Entity(0.0), Entity(10.0)], force=Force.attraction(strength),
+                        topology=one_way, momentum=0.8, freeze_enabled=False)
+        system.step()
+        states = system.get_states()
+        assert abs(states[0] - 0.2 * 10.0 * strength) < 1e-5
+        assert states[1] == 10.0
+    print("✅ test_system_force_strength")
+
+def test_system_jacobi_step():
+    """Test step synchrone: toutes les forces calculées sur l'état précédent"""
+    x = np.array([0.0, 10.0, 3.0, 7.0, 1.0, 5.0])
+    system = System([Entity(v) for v in x], force=Force.attraction(0.5),
+                    topology=Topology.ring(), momentum=0.8, freeze_enabled=False)
+    system.step()
+    
+    force = 0.5 * ((np.roll(x, 1) - x) + (np.roll(x, -1) - x)) / 2
+    assert np.allclose(system.get_states(), x + 0.2 * force, atol=1e-5)
+    print("✅ test_system_jacobi_step")
+
+def test_system_shared_library():
+    """Test bibliothèque native chargée une seule fois par processus"""
+    first = System([Entity(0.0), Entity(1.0)])
+    second = System([Entity(2.0), Entity(3.0)])
+    assert first.rust is second.rust
+    print("✅ test_system_shared_library")
+
 def main():
     print("="*70)
     print("Tests System")
@@ -91,6 +791,35 @@ def main():
     test_system_freeze()
     test_system_variance()
     test_system_states()
+    test_system_topology_cache()
+    test_system_small_world_shortcuts()
+    test_system_checkpoint()
+    test_system_empty()
+    test_system_from_arrays()
+    test_system_local_indexing()
+    test_topology_builders()
+    test_topology_radius_knn()
+    test_distance_queries()
+    test_system_gravity_barnes_hut()
+    test_system_weighted_edges()
+    test_system_reorder()
+    test_system_reorder_add_remove()
+    test_system_solve_consensus()
+    test_system_profile()
+    test_system_dtype()
+    test_system_fork()
+    test_system_fork_views()
+    test_system_update_states()
+    test_system_relax()
+    test_system_bound_context()
+    test_system_add_remove_entities()
+    test_system_add_entities_growth()
+    test_system_add_entities_graph()
+    test_system_attractors()
+    test_system_many_attractors()
+    test_system_force_strength()
+    test_system_jacobi_step()
+    test_system_shared_library()
     
     print("\n" + "="*70)
     print("✅ Tous les tests System passés")